@@ -10,6 +10,15 @@ module.exports = {
     "parserOptions": {
         "ecmaVersion": 12
     },
+    "overrides": [
+        {
+            // Generated by scripts/css-theme-tokens.py and loaded with <script type="module">
+            "files": ["public/js/theme-tokens.js"],
+            "parserOptions": {
+                "sourceType": "module"
+            }
+        }
+    ],
     "rules": {
         "indent":["error",2,{"SwitchCase":1}],
         "quotes":["error","double"],
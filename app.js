@@ -1,6 +1,7 @@
 require("dotenv").config();
 require("./scripts/check-env");
 const crypto = require("crypto");
+const fs = require("fs");
 const appcongfig = require("./config/application.config.js");
 const dbconfig = require("./config/mysql.config.js");
 const path = require("path");
@@ -46,6 +47,23 @@ app.use(helmet({
 
 // favicon設定と静的ファイル
 app.use(favicon(path.join(__dirname, "/public/favicon.ico")));
+// ビルド済みCSS（ファイル名にハッシュ付き）は内容が変わらないので長期キャッシュ
+// .br / .gz があればブラウザの対応に合わせて圧縮済みファイルを返す
+const buildDir = path.join(__dirname, "/public/build");
+app.use("/public/build", (req, res, next) => {
+  if (!req.path.endsWith(".css")) return next();
+  const accepted = req.headers["accept-encoding"] || "";
+  for (const [encoding, suffix] of [["br", ".br"], ["gzip", ".gz"]]) {
+    const file = path.join(buildDir, path.normalize(req.path) + suffix);
+    if (file.startsWith(buildDir) && accepted.includes(encoding) && fs.existsSync(file)) {
+      req.url = req.path + suffix;
+      res.set({ "Content-Encoding": encoding, "Content-Type": "text/css; charset=utf-8", Vary: "Accept-Encoding" });
+      break;
+    }
+  }
+  next();
+});
+app.use("/public/build", express.static(buildDir, { immutable: true, maxAge: "1y" }));
 app.use("/public", express.static(path.join(__dirname, "/public")));
 app.use(express.json());
 
@@ -182,7 +182,7 @@ function renderActivityChart(labels, answerData, accuracyData) {
           data: answerData,
           type: 'bar',
           backgroundColor: 'rgba(139, 108, 207, 0.5)',
-          borderColor: '#8b6ccf',
+          borderColor: themeColor('brand', '#8b6ccf'),
           borderWidth: 1,
           borderRadius: 3,
           yAxisID: 'y',
@@ -192,13 +192,13 @@ function renderActivityChart(labels, answerData, accuracyData) {
           label: '正答率',
           data: accuracyData,
           type: 'line',
-          borderColor: '#28a745',
+          borderColor: themeColor('success', '#28a745'),
           backgroundColor: 'rgba(40, 167, 69, 0.1)',
           borderWidth: 2,
           fill: false,
           tension: 0.3,
-          pointBackgroundColor: '#28a745',
-          pointBorderColor: '#fff',
+          pointBackgroundColor: themeColor('success', '#28a745'),
+          pointBorderColor: themeColor('bgContainer', '#fff'),
           pointBorderWidth: 2,
           pointRadius: 4,
           pointHoverRadius: 6,
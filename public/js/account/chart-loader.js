@@ -33,3 +33,9 @@ function loadChartJs() {
     document.head.appendChild(script);
   });
 }
+
+// テーマのカラートークン（/public/js/theme-tokens.js）。モジュール未読み込み時は fallback
+function themeColor(token, fallback) {
+  var themeTokens = window.ThemeTokens;
+  return themeTokens ? themeTokens.tokens[token] : fallback;
+}
@@ -111,7 +111,7 @@ async function loadRadarData(testlevel) {
                 borderWidth: 1.5,
                 borderDash: [6, 3],
                 pointBackgroundColor: '#e8943e',
-                pointBorderColor: '#fff',
+                pointBorderColor: themeColor('bgContainer', '#fff'),
                 pointBorderWidth: 1.5,
                 pointRadius: 3,
                 pointHoverRadius: 5
@@ -124,7 +124,7 @@ async function loadRadarData(testlevel) {
                 borderWidth: 1.5,
                 borderDash: [4, 2],
                 pointBackgroundColor: '#3b9ddd',
-                pointBorderColor: '#fff',
+                pointBorderColor: themeColor('bgContainer', '#fff'),
                 pointBorderWidth: 1.5,
                 pointRadius: 3,
                 pointHoverRadius: 5
@@ -133,10 +133,10 @@ async function loadRadarData(testlevel) {
                 label: '現在',
                 data: item.values,
                 backgroundColor: 'rgba(139, 108, 207, 0.2)',
-                borderColor: '#8b6ccf',
+                borderColor: themeColor('brand', '#8b6ccf'),
                 borderWidth: 2,
-                pointBackgroundColor: '#8b6ccf',
-                pointBorderColor: '#fff',
+                pointBackgroundColor: themeColor('brand', '#8b6ccf'),
+                pointBorderColor: themeColor('bgContainer', '#fff'),
                 pointBorderWidth: 2,
                 pointRadius: 4,
                 pointHoverRadius: 6
@@ -159,7 +159,7 @@ async function loadRadarData(testlevel) {
                 },
                 pointLabels: {
                   font: { size: 11 },
-                  color: '#333'
+                  color: themeColor('textPrimary', '#333')
                 },
                 grid: {
                   color: 'rgba(0, 0, 0, 0.08)'
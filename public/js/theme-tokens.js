@@ -0,0 +1,366 @@
+// Generated by scripts/css-theme-tokens.py from scripts/palette.json (palette 16e0ee0a5da56a743ff1e6c7dcd957e0).
+// Do not edit; rerun the script after changing the palette.
+
+export const THEMES = Object.freeze({
+  light: Object.freeze({
+    bgBody: "#fafafa",
+    bgContainer: "#fff",
+    bgContainerAlt: "#f9f9f9",
+    bgSection: "#f8f8f8",
+    bgModal: "#fff",
+    bgPurpleTint: "#f8f8fc",
+    textPrimary: "#333",
+    textSecondary: "#555",
+    textTertiary: "#666",
+    textMuted: "#888",
+    textLight: "#999",
+    textInverse: "#fff",
+    brand: "#8b6ccf",
+    brandLight: "#a48cef",
+    brandLighter: "#b49cf5",
+    brandDark: "#7a5bb8",
+    brandDarker: "#6b4cc0",
+    brandBright: "#9c80ff",
+    brandPale: "#f5f0ff",
+    brandPaleAlt: "#f8f6ff",
+    brandPaleLighter: "#ece4ff",
+    brandBorder: "#d4c4f5",
+    brandBorderAlt: "#d0c8e0",
+    brandBg: "#e0d8f0",
+    purpleDark: "#5a4a8a",
+    purpleDarker: "#3a2a6a",
+    purplePale: "#f0e6ff",
+    border: "#ddd",
+    borderLight: "#eee",
+    borderLighter: "#e8e8e8",
+    borderDark: "#ccc",
+    borderDarker: "#aaa",
+    navBg: "#2f2f2f",
+    navText: "#f2f2f2",
+    navBorder: "#444",
+    navLink: "#e0e0e0",
+    navDivider: "#555",
+    footerBg: "#2b2b2b",
+    footerText: "#d0d0d0",
+    success: "#28a745",
+    successBright: "#22c55e",
+    successDark: "#16a34a",
+    successDarker: "#2e7d32",
+    successDarkest: "#155724",
+    successMedium: "#4ca34b",
+    successLight: "#6abf69",
+    successLighter: "#81d880",
+    successPale: "#f0fdf4",
+    successPaleAlt: "#e8f5e9",
+    successPaleDarker: "#a5d6a7",
+    error: "#dc3545",
+    errorBright: "#ef4444",
+    errorDark: "#dc2626",
+    errorDarker: "#c82333",
+    errorDarkest: "#6e1a1a",
+    errorMedium: "#c45050",
+    errorLight: "#e07070",
+    errorLighter: "#f08a8a",
+    errorPale: "#fef2f2",
+    errorPaleAlt: "#fee2e2",
+    errorPaleLighter: "#fff0f0",
+    warning: "#e65100",
+    warningBright: "#f59e0b",
+    warningDark: "#d97706",
+    warningDarkest: "#856404",
+    warningMedium: "#ff9800",
+    warningLight: "#f5a623",
+    warningLighter: "#fcd34d",
+    warningPale: "#fff3cd",
+    warningPaleAlt: "#fff3e0",
+    warningPaleDarker: "#ffe0b2",
+    yellow: "#d4b13a",
+    yellowDark: "#5a5030",
+    yellowMedium: "#7a6a1a",
+    yellowLight: "#e6c84a",
+    yellowLighter: "#e0c860",
+    yellowPale: "#d0c8a8",
+    yellowPaleAlt: "#e8e0c8",
+    yellowPaleLighter: "#f0ede4",
+    yellowPaleLightest: "#fffbf0",
+    info: "#2196F3",
+    infoDark: "#1976d2",
+    infoDarker: "#01579b",
+    infoDarkest: "#004085",
+    infoMedium: "#2b6cb0",
+    infoLight: "#5b8def",
+    infoLighter: "#b3e5fc",
+    infoPale: "#e1f5fe",
+    infoPaleAlt: "#cce5ff",
+    infoPaleLighter: "#f0f4f8",
+    dark: "#1a1a2e",
+    black: "#000",
+    gray50: "#f5f5f5",
+    gray100: "#f0f0f0",
+    gray200: "#e8e8e8",
+    gray300: "#e0e0e0",
+    gray400: "#d0d0d0",
+    gray500: "#ccc",
+    gray600: "#bbb",
+    gray700: "#777",
+    gray800: "#666",
+    gray850: "#5a6268",
+    gray900: "#444",
+  }),
+  dark: Object.freeze({
+    bgBody: "#1a1a1a",
+    bgContainer: "#242424",
+    bgContainerAlt: "#2a2a2a",
+    bgSection: "#202020",
+    bgModal: "#2a2a2a",
+    bgPurpleTint: "#2a243a",
+    textPrimary: "#e0e0e0",
+    textSecondary: "#b8b8b8",
+    textTertiary: "#a0a0a0",
+    textMuted: "#888",
+    textLight: "#707070",
+    textInverse: "#000",
+    brand: "#a48cef",
+    brandLight: "#b49cf5",
+    brandLighter: "#c8b4f0",
+    brandDark: "#8b6ccf",
+    brandDarker: "#7a5bb8",
+    brandBright: "#b49cf5",
+    brandPale: "#2a243a",
+    brandPaleAlt: "#30283f",
+    brandPaleLighter: "#35304a",
+    brandBorder: "#4a3a6a",
+    brandBorderAlt: "#3a3050",
+    brandBg: "#3a2a5a",
+    purpleDark: "#8b6ccf",
+    purpleDarker: "#7a5bb8",
+    purplePale: "#30283f",
+    border: "#3a3a3a",
+    borderLight: "#303030",
+    borderLighter: "#2c2c2c",
+    borderDark: "#444",
+    borderDarker: "#555",
+    navBg: "#1a1a1a",
+    navText: "#e0e0e0",
+    navBorder: "#303030",
+    navLink: "#b8b8b8",
+    navDivider: "#3a3a3a",
+    footerBg: "#1a1a1a",
+    footerText: "#a0a0a0",
+    success: "#22c55e",
+    successBright: "#4ade80",
+    successDark: "#16a34a",
+    successDarker: "#15803d",
+    successDarkest: "#14532d",
+    successMedium: "#22c55e",
+    successLight: "#4ade80",
+    successLighter: "#86efac",
+    successPale: "#1a3a2a",
+    successPaleAlt: "#1e4a30",
+    successPaleDarker: "#2a5a40",
+    error: "#ef4444",
+    errorBright: "#f87171",
+    errorDark: "#dc2626",
+    errorDarker: "#b91c1c",
+    errorDarkest: "#7f1d1d",
+    errorMedium: "#ef4444",
+    errorLight: "#f87171",
+    errorLighter: "#fca5a5",
+    errorPale: "#3a1a1a",
+    errorPaleAlt: "#4a2020",
+    errorPaleLighter: "#5a2828",
+    warning: "#f59e0b",
+    warningBright: "#fbbf24",
+    warningDark: "#d97706",
+    warningDarkest: "#78350f",
+    warningMedium: "#f59e0b",
+    warningLight: "#fbbf24",
+    warningLighter: "#fcd34d",
+    warningPale: "#3a2a1a",
+    warningPaleAlt: "#4a3520",
+    warningPaleDarker: "#5a4530",
+    yellow: "#fbbf24",
+    yellowDark: "#a16207",
+    yellowMedium: "#d97706",
+    yellowLight: "#fbbf24",
+    yellowLighter: "#fcd34d",
+    yellowPale: "#3a3020",
+    yellowPaleAlt: "#4a3a28",
+    yellowPaleLighter: "#5a4530",
+    yellowPaleLightest: "#6a5540",
+    info: "#3b82f6",
+    infoDark: "#2563eb",
+    infoDarker: "#1e40af",
+    infoDarkest: "#1e3a8a",
+    infoMedium: "#3b82f6",
+    infoLight: "#60a5fa",
+    infoLighter: "#93c5fd",
+    infoPale: "#1a2a4a",
+    infoPaleAlt: "#1e3555",
+    infoPaleLighter: "#254060",
+    dark: "#e0e0e0",
+    black: "#fff",
+    gray50: "#303030",
+    gray100: "#363636",
+    gray200: "#3c3c3c",
+    gray300: "#424242",
+    gray400: "#4a4a4a",
+    gray500: "#555",
+    gray600: "#666",
+    gray700: "#888",
+    gray800: "#a0a0a0",
+    gray850: "#b0b0b0",
+    gray900: "#c0c0c0",
+  }),
+});
+
+// Token -> CSS custom property
+export const VARIABLES = Object.freeze({
+  bgBody: "--color-bg-body",
+  bgContainer: "--color-bg-container",
+  bgContainerAlt: "--color-bg-container-alt",
+  bgSection: "--color-bg-section",
+  bgModal: "--color-bg-modal",
+  bgPurpleTint: "--color-bg-purple-tint",
+  textPrimary: "--color-text-primary",
+  textSecondary: "--color-text-secondary",
+  textTertiary: "--color-text-tertiary",
+  textMuted: "--color-text-muted",
+  textLight: "--color-text-light",
+  textInverse: "--color-text-inverse",
+  brand: "--color-brand",
+  brandLight: "--color-brand-light",
+  brandLighter: "--color-brand-lighter",
+  brandDark: "--color-brand-dark",
+  brandDarker: "--color-brand-darker",
+  brandBright: "--color-brand-bright",
+  brandPale: "--color-brand-pale",
+  brandPaleAlt: "--color-brand-pale-alt",
+  brandPaleLighter: "--color-brand-pale-lighter",
+  brandBorder: "--color-brand-border",
+  brandBorderAlt: "--color-brand-border-alt",
+  brandBg: "--color-brand-bg",
+  purpleDark: "--color-purple-dark",
+  purpleDarker: "--color-purple-darker",
+  purplePale: "--color-purple-pale",
+  border: "--color-border",
+  borderLight: "--color-border-light",
+  borderLighter: "--color-border-lighter",
+  borderDark: "--color-border-dark",
+  borderDarker: "--color-border-darker",
+  navBg: "--color-nav-bg",
+  navText: "--color-nav-text",
+  navBorder: "--color-nav-border",
+  navLink: "--color-nav-link",
+  navDivider: "--color-nav-divider",
+  footerBg: "--color-footer-bg",
+  footerText: "--color-footer-text",
+  success: "--color-success",
+  successBright: "--color-success-bright",
+  successDark: "--color-success-dark",
+  successDarker: "--color-success-darker",
+  successDarkest: "--color-success-darkest",
+  successMedium: "--color-success-medium",
+  successLight: "--color-success-light",
+  successLighter: "--color-success-lighter",
+  successPale: "--color-success-pale",
+  successPaleAlt: "--color-success-pale-alt",
+  successPaleDarker: "--color-success-pale-darker",
+  error: "--color-error",
+  errorBright: "--color-error-bright",
+  errorDark: "--color-error-dark",
+  errorDarker: "--color-error-darker",
+  errorDarkest: "--color-error-darkest",
+  errorMedium: "--color-error-medium",
+  errorLight: "--color-error-light",
+  errorLighter: "--color-error-lighter",
+  errorPale: "--color-error-pale",
+  errorPaleAlt: "--color-error-pale-alt",
+  errorPaleLighter: "--color-error-pale-lighter",
+  warning: "--color-warning",
+  warningBright: "--color-warning-bright",
+  warningDark: "--color-warning-dark",
+  warningDarkest: "--color-warning-darkest",
+  warningMedium: "--color-warning-medium",
+  warningLight: "--color-warning-light",
+  warningLighter: "--color-warning-lighter",
+  warningPale: "--color-warning-pale",
+  warningPaleAlt: "--color-warning-pale-alt",
+  warningPaleDarker: "--color-warning-pale-darker",
+  yellow: "--color-yellow",
+  yellowDark: "--color-yellow-dark",
+  yellowMedium: "--color-yellow-medium",
+  yellowLight: "--color-yellow-light",
+  yellowLighter: "--color-yellow-lighter",
+  yellowPale: "--color-yellow-pale",
+  yellowPaleAlt: "--color-yellow-pale-alt",
+  yellowPaleLighter: "--color-yellow-pale-lighter",
+  yellowPaleLightest: "--color-yellow-pale-lightest",
+  info: "--color-info",
+  infoDark: "--color-info-dark",
+  infoDarker: "--color-info-darker",
+  infoDarkest: "--color-info-darkest",
+  infoMedium: "--color-info-medium",
+  infoLight: "--color-info-light",
+  infoLighter: "--color-info-lighter",
+  infoPale: "--color-info-pale",
+  infoPaleAlt: "--color-info-pale-alt",
+  infoPaleLighter: "--color-info-pale-lighter",
+  dark: "--color-dark",
+  black: "--color-black",
+  gray50: "--color-gray-50",
+  gray100: "--color-gray-100",
+  gray200: "--color-gray-200",
+  gray300: "--color-gray-300",
+  gray400: "--color-gray-400",
+  gray500: "--color-gray-500",
+  gray600: "--color-gray-600",
+  gray700: "--color-gray-700",
+  gray800: "--color-gray-800",
+  gray850: "--color-gray-850",
+  gray900: "--color-gray-900",
+});
+
+const DEFAULT_THEME = "light";
+const listeners = new Set();
+
+export function themeName(root = document.documentElement) {
+  const theme = root.getAttribute("data-theme");
+  return Object.prototype.hasOwnProperty.call(THEMES, theme) ? theme : DEFAULT_THEME;
+}
+
+export let theme = typeof document === "undefined" ? DEFAULT_THEME : themeName();
+// The table of the active theme; importers see it swapped in place
+export let tokens = THEMES[theme];
+
+function update() {
+  const next = themeName();
+  if (next === theme) return;
+  theme = next;
+  tokens = THEMES[theme];
+  listeners.forEach((listener) => listener(tokens, theme));
+}
+
+// Calls listener(tokens, theme) after each theme switch; returns an unsubscribe function
+export function onThemeChange(listener) {
+  listeners.add(listener);
+  return () => listeners.delete(listener);
+}
+
+if (typeof document !== "undefined") {
+  new MutationObserver(update).observe(document.documentElement, {
+    attributes: true,
+    attributeFilter: ["data-theme"],
+  });
+}
+
+if (typeof window !== "undefined") {
+  window.ThemeTokens = Object.freeze({
+    THEMES,
+    VARIABLES,
+    onThemeChange,
+    themeName,
+    get theme() { return theme; },
+    get tokens() { return tokens; },
+  });
+}
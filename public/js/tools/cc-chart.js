@@ -29,9 +29,26 @@ var CCChart = (function () {
     grid: "#eee",
     text: "#333",
     label: "#888",
+    pointBorder: "#fff",
     zoneLabelBg: "rgba(255,255,255,0.85)"
   };
 
+  // COLORS entries taken from the active theme (public/js/theme-tokens.js) on each draw
+  var THEMED = {
+    cl: "brand",
+    ucl: "error",
+    lcl: "error",
+    point: "textPrimary",
+    pointAnomaly: "error",
+    pointBorder: "bgContainer",
+    line: "gray600",
+    grid: "borderLight",
+    text: "textPrimary",
+    label: "textMuted"
+  };
+
+  var watchingTheme = false;
+
   var POINT_RADIUS = 4;
   var POINT_RADIUS_ANOMALY = 6;
 
@@ -52,6 +69,18 @@ var CCChart = (function () {
     active = registry[canvasId] || null;
   }
 
+  function applyTheme() {
+    var themeTokens = window.ThemeTokens;
+    if (!themeTokens) return;
+    if (!watchingTheme) {
+      watchingTheme = true;
+      themeTokens.onThemeChange(redrawAll);
+    }
+    Object.keys(THEMED).forEach(function (key) {
+      COLORS[key] = themeTokens.tokens[THEMED[key]];
+    });
+  }
+
   function canvas() { return active ? active.canvas : null; }
   function ctx()    { return active ? active.ctx    : null; }
 
@@ -89,6 +118,8 @@ var CCChart = (function () {
   function draw(canvasId, data, config) {
     use(canvasId);
     if (!canvas() || !ctx()) return;
+    active.last = { data: data, config: config };
+    applyTheme();
     resize();
     ctx().clearRect(0, 0, canvas().width / DPR, canvas().height / DPR);
 
@@ -254,7 +285,7 @@ var CCChart = (function () {
         c.arc(px, py, POINT_RADIUS_ANOMALY, 0, 2 * Math.PI);
         c.fillStyle = COLORS.pointAnomaly;
         c.fill();
-        c.strokeStyle = "#fff";
+        c.strokeStyle = COLORS.pointBorder;
         c.lineWidth = 2;
         c.stroke();
       } else {
@@ -363,6 +394,8 @@ var CCChart = (function () {
   function drawPlaceholder(canvasId, message) {
     use(canvasId);
     if (!canvas() || !ctx()) return;
+    active.last = { message: message };
+    applyTheme();
     resize();
     var c = ctx();
     c.clearRect(0, 0, canvas().width / DPR, canvas().height / DPR);
@@ -376,6 +409,7 @@ var CCChart = (function () {
   function clear(canvasId) {
     use(canvasId);
     if (!canvas() || !ctx()) return;
+    active.last = null;
     ctx().clearRect(0, 0, canvas().width / DPR, canvas().height / DPR);
   }
 
@@ -388,6 +422,18 @@ var CCChart = (function () {
     active = prev;
   }
 
+  // Repaints every canvas with its last chart or placeholder after a theme switch
+  function redrawAll() {
+    var prev = active;
+    Object.keys(registry).forEach(function (id) {
+      var last = registry[id].last;
+      if (!last) return;
+      if (last.data) draw(id, last.data, last.config);
+      else drawPlaceholder(id, last.message);
+    });
+    active = prev;
+  }
+
   return {
     init: init,
     draw: draw,
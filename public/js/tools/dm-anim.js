@@ -46,6 +46,22 @@ var DMAnim = (function () {
     pos:  "rgba(230, 126, 34, 0.25)"
   };
 
+  // COLORS entries taken from the active theme (public/js/theme-tokens.js) on each frame
+  var THEMED = {
+    bg:   "bgContainer",
+    axis: "textTertiary",
+    grid: "gray100",
+    text: "textPrimary"
+  };
+
+  function applyTheme() {
+    var themeTokens = window.ThemeTokens;
+    if (!themeTokens) return;
+    Object.keys(THEMED).forEach(function (key) {
+      COLORS[key] = themeTokens.tokens[THEMED[key]];
+    });
+  }
+
   /* -------------------------------------------------------
    * Animation definitions
    * ------------------------------------------------------- */
@@ -286,6 +302,7 @@ var DMAnim = (function () {
     var phaseIdx = Math.min(Math.floor(t * currentAnim.phases.length), currentAnim.phases.length - 1);
     updateFormula(currentAnim.phases[phaseIdx].katex);
 
+    applyTheme();
     ctxRef.clearRect(0, 0, cW, cH);
     currentAnim.render(ctxRef, eased, cW, cH, MARGIN);
 
@@ -322,6 +339,7 @@ var DMAnim = (function () {
     var phaseIdx = Math.min(Math.floor(stepProgress * currentAnim.phases.length), currentAnim.phases.length - 1);
     updateFormula(currentAnim.phases[phaseIdx].katex);
 
+    applyTheme();
     ctxRef.clearRect(0, 0, cW, cH);
     currentAnim.render(ctxRef, eased, cW, cH, MARGIN);
     drawPhaseIndicator(ctxRef, stepProgress, currentAnim.phases);
@@ -12,6 +12,27 @@ var DMCanvas = (function () {
 
   var DEFAULT_MARGIN = { top: 30, right: 30, bottom: 50, left: 50 };
 
+  var COLORS = {
+    curve: "#333",
+    axis: "#666",
+    label: "#888"
+  };
+
+  // COLORS entries taken from the active theme (public/js/theme-tokens.js) when drawing
+  var THEMED = {
+    curve: "textPrimary",
+    axis: "textTertiary",
+    label: "textMuted"
+  };
+
+  function applyTheme() {
+    var themeTokens = window.ThemeTokens;
+    if (!themeTokens) return;
+    Object.keys(THEMED).forEach(function (key) {
+      COLORS[key] = themeTokens.tokens[THEMED[key]];
+    });
+  }
+
   /* -------------------------------------------------------
    * Registry management
    * ------------------------------------------------------- */
@@ -86,7 +107,8 @@ var DMCanvas = (function () {
   function drawCurve(c, pdf, xMin, xMax, yMax, w, h, margin, color, lineWidth) {
     var m = margin || DEFAULT_MARGIN;
     c.beginPath();
-    c.strokeStyle = color || "#333";
+    applyTheme();
+    c.strokeStyle = color || COLORS.curve;
     c.lineWidth = lineWidth || 2;
     var steps = 300;
     var dx = (xMax - xMin) / steps;
@@ -122,7 +144,8 @@ var DMCanvas = (function () {
 
   function drawAxes(c, xMin, xMax, yMax, w, h, margin) {
     var m = margin || DEFAULT_MARGIN;
-    c.strokeStyle = "#666";
+    applyTheme();
+    c.strokeStyle = COLORS.axis;
     c.lineWidth = 1;
 
     // X axis
@@ -133,7 +156,7 @@ var DMCanvas = (function () {
     c.stroke();
 
     // Tick marks
-    c.fillStyle = "#888";
+    c.fillStyle = COLORS.label;
     c.font = "11px sans-serif";
     c.textAlign = "center";
     var range = xMax - xMin;
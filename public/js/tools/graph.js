@@ -23,6 +23,21 @@ var SimGraph = (function () {
     label: "#555"
   };
 
+  // COLORS entries taken from the active theme (public/js/theme-tokens.js) on each draw
+  var THEMED = {
+    curve: "textPrimary",
+    critical: "error",
+    statReject: "error",
+    statAccept: "success",
+    axis: "textTertiary",
+    grid: "borderLight",
+    text: "textPrimary",
+    label: "textSecondary"
+  };
+
+  var lastResult = null;
+  var watchingTheme = false;
+
   /* -------------------------------------------------------
    * Init
    * ------------------------------------------------------- */
@@ -34,6 +49,20 @@ var SimGraph = (function () {
     window.addEventListener("resize", resize);
   }
 
+  function applyTheme() {
+    var themeTokens = window.ThemeTokens;
+    if (!themeTokens) return;
+    if (!watchingTheme) {
+      watchingTheme = true;
+      themeTokens.onThemeChange(function () {
+        if (lastResult) draw(lastResult);
+      });
+    }
+    Object.keys(THEMED).forEach(function (key) {
+      COLORS[key] = themeTokens.tokens[THEMED[key]];
+    });
+  }
+
   function resize() {
     if (!canvas) return;
     var parent = canvas.parentElement;
@@ -146,6 +175,8 @@ var SimGraph = (function () {
 
   function draw(result) {
     if (!canvas || !ctx) return;
+    lastResult = result;
+    applyTheme();
 
     // Exact tests (binom, poisson) — draw bar chart
     if (result.test_type === "binom" || result.test_type === "poisson") {
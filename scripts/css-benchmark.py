@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+CSS Conversion Benchmark
+Times the converter phases on synthetic stylesheets (100 KB to 10 MB by default)
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from csstools.benchmark import compare, format_results, measure_model, parse_size, run_size, slower_than_legacy
+from csstools.cache import DEFAULT_CACHE_DIR
+from csstools.cli import DEFAULT_STYLESHEET, write_json
+from csstools.engine import ENGINE_VERSION
+from csstools.palette import DEFAULT_PALETTE, load_palette
+
+# A few seconds per size up to 10M; pass --sizes 100M for the large input
+DEFAULT_SIZES = '100K,1M,10M'
+# The legacy engine makes one pass per palette spelling, so it stops at 1M by default
+DEFAULT_LEGACY_MAX = '1M'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the color conversion pipeline')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='comma-separated input sizes (default: %(default)s)')
+    parser.add_argument('--model', default=DEFAULT_STYLESHEET, metavar='FILE',
+                        help='stylesheet whose shape the inputs follow (default: public/index.css)')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE, metavar='FILE',
+                        help='palette source (default: scripts/palette.json)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per size, the fastest is kept (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the generated inputs')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc runs')
+    parser.add_argument('--no-legacy', action='store_true',
+                        help='skip the per-color legacy engine and the equivalence check')
+    parser.add_argument('--legacy-max', default=DEFAULT_LEGACY_MAX, metavar='SIZE',
+                        help='largest size run through the legacy engine (default: %(default)s)')
+    parser.add_argument('-o', '--output', metavar='FILE', help="write the results as JSON ('-' for stdout)")
+    parser.add_argument('--baseline', metavar='FILE', help='compare with the JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown counted as a regression (default: %(default)s = 10%%)')
+    args = parser.parse_args()
+
+    out = sys.stderr if args.output == '-' else sys.stdout
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+        legacy_max = parse_size(args.legacy_max)
+        palette = load_palette(args.palette, DEFAULT_CACHE_DIR)
+        with open(args.model, 'r', encoding='utf-8') as f:
+            model = measure_model(f.read())
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Model: {model.declarations_per_rule} declarations/rule, {model.color_share:.0%} colors "
+          f"({model.unmapped_share:.0%} unmapped), {model.media_share:.0%} in @media", file=out)
+    start = time.perf_counter()
+    results = []
+    for size in sizes:
+        results.append(run_size(size, palette.replacer, palette.prelude, model, args.repeat, args.seed,
+                                memory=not args.no_memory, legacy=not args.no_legacy and size <= legacy_max))
+        # Rows are printed as they finish, the header with the first one
+        lines = format_results(results[-1:])
+        print('\n'.join(lines if len(results) == 1 else lines[1:]), file=out, flush=True)
+    print(f"Benchmarked in {time.perf_counter() - start:.1f} s", file=out)
+
+    report = {
+        'python': platform.python_version(),
+        'engine': ENGINE_VERSION,
+        'palette': palette.digest,
+        'model': model._asdict(),
+        'results': results,
+    }
+    if args.output:
+        write_json(args.output, report)
+
+    failed = [entry['label'] for entry in results if not entry.get('legacy', {}).get('equivalent', True)]
+    if failed:
+        print(f"Output differs from the legacy engine at: {', '.join(failed)}", file=sys.stderr)
+    regressions = slower_than_legacy(results)
+    if regressions:
+        print(f"Slower than the legacy engine at: {', '.join(regressions)}", file=sys.stderr)
+    if baseline is not None:
+        lines, slower = compare(results, baseline, args.threshold)
+        regressions += slower
+        print(f"Compared with {args.baseline}:", file=out)
+        print('\n'.join(lines), file=out)
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+CSS Route Bundler
+Splits the stylesheet into a shared core plus per-route bundles with a manifest
+
+Include the generated partial in place of the index.css <link>, e.g.
+    <%- include("./_bundles/index.ejs") %>
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from csstools.bundles import (DEFAULT_BUNDLES, Partition, render_links, scan_bundles, split_bundles,
+                              view_bundles, write_bundles, write_manifest)
+from csstools.cli import DEFAULT_STYLESHEET, REPO_ROOT
+from csstools.stream import open_output
+from csstools.tokenizer import tokenize
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partition the stylesheet into route-scoped bundles')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to split (default: public/index.css)')
+    parser.add_argument('--config', help='JSON file of bundles, e.g. {"tools": {"sources": [...]}}')
+    parser.add_argument('--views', default=os.path.join(REPO_ROOT, 'views'),
+                        help='views directory (default: views)')
+    parser.add_argument('--out-dir', default=os.path.join(REPO_ROOT, 'public', 'bundles'),
+                        help='where to write the bundles and manifest.json (default: public/bundles)')
+    parser.add_argument('--partials-dir', default=os.path.join(REPO_ROOT, 'views', '_bundles'),
+                        help='where to write the per-view <link> partials (default: views/_bundles)')
+    parser.add_argument('--url-prefix', default='/public/bundles/',
+                        help='URL of the bundles directory (default: %(default)s)')
+    args = parser.parse_args()
+
+    try:
+        bundles = DEFAULT_BUNDLES
+        if args.config:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                bundles = json.load(f)
+
+        start = time.perf_counter()
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            tokens = list(tokenize(f))
+        core_usage, usages, paths = scan_bundles(bundles, REPO_ROOT)
+        texts = split_bundles(tokens, Partition(core_usage, usages))
+        written = write_bundles(texts, args.out_dir, bundles)
+        views = view_bundles(args.views, paths)
+        write_manifest(os.path.join(args.out_dir, 'manifest.json'), written, views, args.url_prefix)
+
+        os.makedirs(args.partials_dir, exist_ok=True)
+        for view, names in views.items():
+            with open_output(os.path.join(args.partials_dir, view + '.ejs')) as f:
+                f.write(render_links(names, written, args.url_prefix))
+        elapsed = (time.perf_counter() - start) * 1000
+
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for bundle in written.values():
+        print(f"  {bundle.file}: {bundle.bytes:,} bytes" + (' (lazy)' if bundle.lazy else ''))
+    print(f"Wrote {len(written)} bundles for {len(views)} views in {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
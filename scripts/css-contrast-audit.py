@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+CSS Contrast Audit
+Checks every foreground/background pair of the stylesheet against WCAG AA in every theme
+"""
+
+import argparse
+import sys
+import time
+
+from csstools.cli import DEFAULT_STYLESHEET, write_json
+from csstools.contrast import AA_LARGE, AA_NORMAL, audit, failures, format_results, results_to_json
+from csstools.tokenizer import tokenize
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit WCAG contrast ratios of every theme')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to audit (default: public/index.css)')
+    parser.add_argument('--theme', action='append', help='only audit this theme (repeatable, e.g. light, dark)')
+    parser.add_argument('--min-ratio', type=float, default=AA_NORMAL,
+                        help='required ratio for normal text (default: %(default)s)')
+    parser.add_argument('--large-ratio', type=float, default=AA_LARGE,
+                        help='required ratio for large text (default: %(default)s)')
+    parser.add_argument('--assume-defaults', action='store_true',
+                        help='pair rules that set only one side with the page text/background colors')
+    parser.add_argument('--limit', type=int, default=50, help='failures to print (default: %(default)s)')
+    parser.add_argument('--json', metavar='FILE', help="write the failures as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            results, skipped = audit(tokenize(f), args.min_ratio, args.large_ratio,
+                                     args.assume_defaults, args.theme)
+        elapsed = (time.perf_counter() - start) * 1000
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        write_json(args.json, results_to_json(results, skipped))
+    out = sys.stderr if args.json == '-' else sys.stdout
+    for line in format_results(results, skipped, args.limit):
+        print(line, file=out)
+    print(f"Audited in {elapsed:.1f} ms", file=out)
+
+    sys.exit(1 if failures(results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+CSS Critical Path Extractor
+Writes an inline critical-CSS partial for every top-level EJS view
+
+The partial inlines the page's first-screen rules and loads the shared
+stylesheet without blocking. Include it in place of the index.css <link>, e.g.
+    <%- include("./_critical/index.ejs") %>
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from csstools.cli import DEFAULT_STYLESHEET, REPO_ROOT
+from csstools.critical import (DEFAULT_FOLD, Page, critical_css, hidden_by_default, page_name,
+                               page_templates, render_partial, render_template)
+from csstools.stream import open_output
+from csstools.tokenizer import tokenize
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract per-page critical CSS for the EJS views')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to split (default: public/index.css)')
+    parser.add_argument('--views', default=os.path.join(REPO_ROOT, 'views'),
+                        help='views directory (default: views)')
+    parser.add_argument('--page', action='append', metavar='TEMPLATE',
+                        help='only process this template (repeatable, default: every top-level view)')
+    parser.add_argument('--fold', type=int, default=DEFAULT_FOLD,
+                        help='visible elements that make up the first screen (default: %(default)s)')
+    parser.add_argument('--partials-dir', default=os.path.join(REPO_ROOT, 'views', '_critical'),
+                        help='where to write the <style> partials (default: views/_critical)')
+    parser.add_argument('--href', default='/public/index.css',
+                        help='URL of the shared stylesheet every partial loads (default: %(default)s)')
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        tokens = list(tokenize(content))
+        hidden = hidden_by_default(tokens)
+        os.makedirs(args.partials_dir, exist_ok=True)
+
+        total = len(content.encode('utf-8'))
+        for template in args.page or page_templates(args.views):
+            name = page_name(template, args.views)
+            page = Page(render_template(template), args.fold, hidden)
+            if not page.elements:
+                print(f"  {name}: no markup, skipped")
+                continue
+            critical = critical_css(tokens, page)
+            with open_output(os.path.join(args.partials_dir, name + '.ejs')) as f:
+                f.write(render_partial(critical, args.href))
+            size = len(critical.encode('utf-8'))
+            print(f"  {name}: {size:,} bytes critical ({100 * size / total:.1f}%)")
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Extracted critical CSS in {elapsed:.1f} ms")
+
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
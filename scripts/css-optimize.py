@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+CSS Optimizer
+Merges identical rules, collapses shorthands and drops overridden declarations
+"""
+
+import argparse
+import sys
+import time
+
+from csstools.cli import DEFAULT_STYLESHEET, write_json
+from csstools.optimize import format_report, optimize_css
+from csstools.stream import open_output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Optimize the structure of a stylesheet')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to optimize (default: public/index.css)')
+    parser.add_argument('-o', '--output', help="write the optimized stylesheet here ('-' for stdout)")
+    parser.add_argument('--in-place', action='store_true', help='overwrite the input stylesheet')
+    parser.add_argument('--report', metavar='FILE', help="write the byte-savings report as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        optimized, report = optimize_css(content)
+
+        output = args.input if args.in_place else args.output
+        if output:
+            with open_output(output) as f:
+                f.write(optimized)
+        elapsed = (time.perf_counter() - start) * 1000
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.report:
+        write_json(args.report, report._asdict())
+    out = sys.stderr if '-' in (args.output, args.report) else sys.stdout
+    for line in format_report(report):
+        print(line, file=out)
+    print(f"Optimized in {elapsed:.1f} ms" + ('' if output else ' (dry run)'), file=out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+CSS Pruner
+Drops the rules and --color-* variables that the views and client scripts never use
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from csstools.cli import DEFAULT_STYLESHEET, source_paths, write_json
+from csstools.prune import format_report, prune_css
+from csstools.stream import open_output
+from csstools.usage import DEFAULT_SOURCES, scan_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove unused rules and theme variables')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to prune (default: public/index.css)')
+    parser.add_argument('--source', action='append', metavar='PATTERN',
+                        help="views/scripts to scan for usage (repeatable, default: "
+                             f"{' '.join(DEFAULT_SOURCES)})")
+    parser.add_argument('--keep', action='append', metavar='REGEX',
+                        help='always keep selectors matching REGEX, e.g. for markup stored in the database')
+    parser.add_argument('--tags', action='store_true',
+                        help='also drop selectors whose tag never appears in the sources')
+    parser.add_argument('--keep-variables', action='store_true', help='do not drop unused variables')
+    parser.add_argument('-o', '--output', help="write the pruned stylesheet here ('-' for stdout)")
+    parser.add_argument('--in-place', action='store_true', help='overwrite the input stylesheet')
+    parser.add_argument('--report', metavar='FILE', help="write the byte-savings report as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        paths = source_paths(args.source, DEFAULT_SOURCES)
+        usage = scan_files(paths)
+        keep = re.compile('|'.join(f'(?:{pattern})' for pattern in args.keep)) if args.keep else None
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        pruned, report = prune_css(content, usage, keep, args.tags, not args.keep_variables)
+
+        output = args.input if args.in_place else args.output
+        if output:
+            with open_output(output) as f:
+                f.write(pruned)
+        elapsed = (time.perf_counter() - start) * 1000
+    except (OSError, re.error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.report:
+        write_json(args.report, dict(report._asdict(), sources=len(paths)))
+    out = sys.stderr if '-' in (args.output, args.report) else sys.stdout
+    for line in format_report(report):
+        print(line, file=out)
+    print(f"Scanned {len(paths)} sources in {elapsed:.1f} ms" + ('' if output else ' (dry run)'), file=out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+CSS Theme Generator
+Derives the dark theme values of scripts/palette.json from its light values
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from csstools.palette import DEFAULT_PALETTE
+from csstools.stream import open_output
+from csstools.themes import DEFAULT_THEMES, check_themes, generate_theme, theme_changes, update_palette
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate theme values of palette.json from its light values')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE,
+                        help='palette source (default: scripts/palette.json)')
+    parser.add_argument('--config', help='JSON file of themes, e.g. {"dark": {"lightness": ..., ...}}; '
+                             'only the palette\'s themes (dark) can be configured')
+    parser.add_argument('--theme', action='append', help='only generate this theme (repeatable)')
+    parser.add_argument('-o', '--output', help='write the updated palette to this file')
+    parser.add_argument('--write', action='store_true',
+                        help='write the generated values back into the palette')
+    args = parser.parse_args()
+
+    try:
+        themes = DEFAULT_THEMES
+        if args.config:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                themes = json.load(f)
+            check_themes(themes)
+        if args.theme:
+            missing = [name for name in args.theme if name not in themes]
+            if missing:
+                raise ValueError(f"No theme named {', '.join(missing)}; themes are {', '.join(themes)}")
+            themes = {name: themes[name] for name in args.theme}
+
+        start = time.perf_counter()
+        with open(args.palette, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        source = json.loads(text)
+        changed = 0
+        for name, theme in themes.items():
+            values = generate_theme(source, theme)
+            changes = theme_changes(source, name, values)
+            for variable, current, value in changes:
+                print(f"  {name} {variable}: {current} -> {value}")
+            changed += len(changes)
+            text = update_palette(text, name, values)
+
+        destination = args.palette if args.write else args.output
+        if destination:
+            with open_output(destination) as f:
+                f.write(text)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Generated {', '.join(themes)} in {elapsed:.1f} ms: {changed} value(s) changed", file=sys.stderr)
+        if destination:
+            print(f"Wrote {destination}; rerun the converters and css-theme-tokens.py to apply it",
+                  file=sys.stderr)
+
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
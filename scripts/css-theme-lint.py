@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+CSS Theme Lint
+Checks the theme blocks, var() references and leftover color literals in one pass
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from csstools.cache import DEFAULT_CACHE_DIR
+from csstools.cli import DEFAULT_STYLESHEET
+from csstools.lint import format_lint, lint_css, lint_report
+from csstools.palette import DEFAULT_PALETTE, load_palette
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lint the theme variables and colors of a stylesheet')
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help='stylesheet to lint (default: public/index.css)')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE, metavar='FILE',
+                        help='palette whose colors must be converted (default: scripts/palette.json)')
+    parser.add_argument('--format', choices=('json', 'text'), default='json',
+                        help='report format on stdout (default: %(default)s)')
+    parser.add_argument('--limit', type=int, default=50, help='issues to print in text format (default: %(default)s)')
+    parser.add_argument('--strict', action='store_true', help='fail on warnings too')
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        replacer = load_palette(args.palette, DEFAULT_CACHE_DIR).replacer
+        with open(args.input, 'r', encoding='utf-8', newline='') as f:
+            issues, summary = lint_css(f.read(), replacer)
+        elapsed = (time.perf_counter() - start) * 1000
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    report = lint_report(args.input, issues, summary, elapsed)
+    if args.format == 'json':
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+    else:
+        print('\n'.join(format_lint(report, args.limit)))
+
+    failed = report['errors'] or (args.strict and report['warnings'])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+CSS Theme Tokens
+Writes the palette's light and dark values as an ES module for canvas code
+"""
+
+import argparse
+import os
+import sys
+
+from csstools.cache import DEFAULT_CACHE_DIR
+from csstools.cli import REPO_ROOT
+from csstools.palette import DEFAULT_PALETTE, load_palette
+from csstools.stream import STDIO, open_output
+from csstools.tokens import render_tokens
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'public', 'js', 'theme-tokens.js')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the JS theme-token module from the palette')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE, metavar='FILE',
+                        help='palette source (default: scripts/palette.json)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help="module to write, '-' for stdout (default: public/js/theme-tokens.js)")
+    parser.add_argument('--check', action='store_true',
+                        help='write nothing; exit 1 when the module is missing or out of date')
+    args = parser.parse_args()
+
+    try:
+        palette = load_palette(args.palette, DEFAULT_CACHE_DIR)
+        source = os.path.relpath(os.path.abspath(args.palette), REPO_ROOT).replace(os.sep, '/')
+        module = render_tokens(palette, source)
+
+        if args.check:
+            try:
+                with open(args.output, 'r', encoding='utf-8', newline='') as f:
+                    current = f.read()
+            except FileNotFoundError:
+                current = None
+            if current != module:
+                print(f"{args.output} is out of date; run scripts/css-theme-tokens.py", file=sys.stderr)
+                sys.exit(1)
+            print(f"{args.output} is up to date")
+            return
+
+        if args.output == STDIO:
+            sys.stdout.write(module)
+            return
+        with open_output(args.output) as f:
+            f.write(module)
+        print(f"Wrote {len(palette.themes['light'])} tokens per theme to {args.output}")
+
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
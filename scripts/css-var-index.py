@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+CSS Variable Index
+Answers which selectors, files and lines depend on a custom property or a color
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+from csstools.cache import DEFAULT_CACHE_DIR
+from csstools.cli import REPO_ROOT, source_paths
+from csstools.palette import DEFAULT_PALETTE, load_palette
+from csstools.varindex import (DEFAULT_INDEX, DEFAULT_SOURCES, affected, color_uses, format_affected,
+                               index_summary, open_index, update_index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the custom property usage index')
+    parser.add_argument('--var', action='append', metavar='NAME',
+                        help="what a variable affects, e.g. --var color-border (repeatable; "
+                             "write '--var=--color-border' to keep the dashes)")
+    parser.add_argument('--color', action='append', metavar='LITERAL',
+                        help="where a color literal is still written, e.g. --color '#ddd' (repeatable)")
+    parser.add_argument('--summary', action='store_true',
+                        help='row counts, variables used but never defined and defined but never used')
+    parser.add_argument('--sources', action='append', metavar='PATTERN',
+                        help='files to index (repeatable; default: public/*.css, views/**/*.ejs, public/js/**/*.js)')
+    parser.add_argument('--db', default=DEFAULT_INDEX, help='index database (default: .cache/csstools/usage.sqlite)')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE, metavar='FILE',
+                        help='palette used for the converted colors (default: scripts/palette.json)')
+    parser.add_argument('--no-update', action='store_true', help='query the index as it is, without rescanning')
+    parser.add_argument('--json', action='store_true', help='print the answers as JSON')
+    args = parser.parse_args()
+
+    try:
+        connection = open_index(args.db)
+        out = sys.stderr if args.json else sys.stdout
+        if not args.no_update:
+            palette = load_palette(args.palette, DEFAULT_CACHE_DIR)
+            result = update_index(connection, source_paths(args.sources, DEFAULT_SOURCES), palette.replacer,
+                                  palette.digest, REPO_ROOT)
+            print(f"Index: {result['indexed']} files scanned, {result['unchanged']} unchanged, "
+                  f"{result['removed']} removed in {result['seconds'] * 1000:.1f} ms", file=out)
+
+        start = time.perf_counter()
+        answers = {}
+        for name in args.var or []:
+            answers.setdefault('variables', []).append(affected(connection, name))
+        for literal in args.color or []:
+            answers.setdefault('colors', {})[literal] = color_uses(connection, literal)
+        if args.summary or not answers:
+            answers['summary'] = index_summary(connection)
+        elapsed = (time.perf_counter() - start) * 1000
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        sys.stdout.write(json.dumps(answers, ensure_ascii=False, indent=2) + '\n')
+    else:
+        for report in answers.get('variables', []):
+            print('\n'.join(format_affected(report)))
+        for literal, rows in answers.get('colors', {}).items():
+            print(f"{literal}: {len(rows)} literals")
+            for row in rows:
+                converted = f" -> {row['replacement']}" if row['replacement'] else ' (not in the palette)'
+                where = ' '.join(part for part in (row['selector'], row['property']) if part) or row['source']
+                print(f"  {row['path']}:{row['line']}  {where}: {row['literal']}{converted}")
+        if 'summary' in answers:
+            summary = answers['summary']
+            print(f"{summary['files']} files, {summary['variables']} variables, {summary['definitions']} "
+                  f"definitions, {summary['uses']} uses, {summary['colors']} color literals")
+            if summary['undefined']:
+                print(f"Used but never defined: {', '.join(summary['undefined'])}")
+            if summary['unused']:
+                print(f"Defined but never used: {len(summary['unused'])}")
+    print(f"Answered in {elapsed:.1f} ms", file=out)
+
+
+if __name__ == '__main__':
+    main()
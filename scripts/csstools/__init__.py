@@ -0,0 +1,16 @@
+"""
+CSS tooling shared by the color converter scripts in scripts/
+"""
+
+from .convert import convert_css, convert_tokens
+from .engine import ColorReplacer
+from .tokenizer import Tokenizer, iter_rules, tokenize
+
+__all__ = [
+    'ColorReplacer',
+    'Tokenizer',
+    'convert_css',
+    'convert_tokens',
+    'iter_rules',
+    'tokenize',
+]
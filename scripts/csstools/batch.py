@@ -0,0 +1,149 @@
+"""
+Multi-file batch conversion with a process pool
+
+Files matched by the given globs are fanned out to a ProcessPoolExecutor.
+Each worker compiles the palette once, converts its files in place and
+returns a FileResult; results come back in input order so reports are
+deterministic whatever the scheduling.
+
+- .css           whole stylesheet
+- .ejs / .html   <style> elements and style="..." attributes, EJS tags
+                 and <script> bodies left alone (see markup.py)
+- .js            report only: canvas code cannot use var(), so hex
+                 literals are counted but never rewritten
+"""
+
+import glob
+import os
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .convert import convert_css
+from .colors import parse_color
+from .markup import convert_markup
+from .stream import open_output
+
+FileResult = namedtuple('FileResult', 'path kind status counts unmapped error')
+
+_replacer = None
+
+
+def expand_globs(patterns, root='.'):
+    """Return the sorted, de-duplicated files matched by patterns"""
+    paths = set()
+    for pattern in patterns:
+        if not os.path.isabs(pattern):
+            pattern = os.path.join(root, pattern)
+        paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(os.path.normpath(path) for path in paths)
+
+
+def scan_literals(content, replacer, counts=None):
+    """Count mapped color literals without rewriting anything"""
+    unmapped = Counter()
+    for match in replacer.pattern.finditer(content):
+        token = match.group(0)
+        key = parse_color(token)
+        if key not in replacer.values:
+            unmapped[token.lower()] += 1
+        elif counts is not None:
+            counts[replacer.names[key]] += 1
+    return unmapped
+
+
+def file_kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.css':
+        return 'css'
+    if extension in ('.ejs', '.html', '.htm'):
+        return 'markup'
+    if extension in ('.js', '.mjs'):
+        return 'script'
+    return None
+
+
+def convert_file(path, replacer, write=True):
+    """Convert one file in place and return its FileResult"""
+    kind = file_kind(path)
+    counts = Counter()
+    if kind is None:
+        return FileResult(path, kind, 'skipped', {}, {}, 'unsupported file type')
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+
+        unmapped = {}
+        if kind == 'css':
+            converted = convert_css(content, replacer, counts)
+        elif kind == 'markup':
+            converted = convert_markup(content, replacer, counts)
+        else:
+            unmapped = dict(scan_literals(content, replacer, counts))
+            converted = content
+
+        if converted == content:
+            status = 'reported' if kind == 'script' and counts else 'unchanged'
+        else:
+            status = 'converted'
+            if write:
+                with open_output(path) as f:
+                    f.write(converted)
+        return FileResult(path, kind, status, dict(counts), unmapped, None)
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, kind, 'error', dict(counts), {}, str(e))
+
+
+def _init_worker(replacer):
+    # The palette is compiled once per worker process, not once per file
+    global _replacer
+    _replacer = replacer
+
+
+def _convert_in_worker(path, write):
+    return convert_file(path, _replacer, write)
+
+
+def run_batch(paths, replacer, jobs=None, write=True):
+    """Convert paths across a process pool and return FileResults in input order"""
+    paths = list(paths)
+    if jobs == 1 or len(paths) <= 1:
+        return [convert_file(path, replacer, write) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(replacer,)) as pool:
+        return list(pool.map(_convert_in_worker, paths, [write] * len(paths), chunksize=4))
+
+
+def summarize(results):
+    """Aggregate FileResults into one report dict"""
+    totals = Counter()
+    literals = Counter()
+    unmapped = Counter()
+    statuses = Counter()
+    for result in results:
+        # Script literals are only reported, never replaced
+        (literals if result.kind == 'script' else totals).update(result.counts)
+        unmapped.update(result.unmapped)
+        statuses[result.status] += 1
+    return {
+        'files': [result._asdict() for result in results],
+        'statuses': dict(sorted(statuses.items())),
+        'replacements': sum(totals.values()),
+        'colors': dict(sorted(totals.items(), key=lambda item: (-item[1], item[0]))),
+        'script_literals': dict(sorted(literals.items(), key=lambda item: (-item[1], item[0]))),
+        'unmapped': dict(sorted(unmapped.items(), key=lambda item: (-item[1], item[0]))),
+    }
+
+
+def format_report(report):
+    """Human-readable lines for a summarize() report"""
+    lines = []
+    for result in report['files']:
+        hits = sum(result['counts'].values())
+        noun = 'mapped literals' if result['kind'] == 'script' else 'replacements'
+        detail = result['error'] or f"{hits} {noun}"
+        if result['unmapped']:
+            detail += f", {sum(result['unmapped'].values())} unmapped literals"
+        lines.append(f"  {result['status']:<9} {result['path']} ({detail})")
+    statuses = ', '.join(f"{count} {status}" for status, count in report['statuses'].items())
+    lines.append(f"{len(report['files'])} files: {statuses}; {report['replacements']} replacements")
+    return lines
@@ -0,0 +1,313 @@
+"""
+Benchmarks for the conversion pipeline on synthetic stylesheets
+
+generate_css() writes a stylesheet of a requested size whose shape
+(declarations per rule, share of color declarations, unmapped colors,
+@media blocks, comments) is measured from a real stylesheet with
+measure_model(). run_size() then times each phase of the in-memory
+converter path, records tracemalloc peaks of the in-memory and the
+streaming path, and checks the single-pass engine against
+legacy_replace(), the per-color substitutions the converters made
+before it, reproduced as they were (see legacy_color_map()). The old
+passes rewrote any text starting with a palette spelling, so the
+generated unmapped colors never start with one ('#333abc' would become
+'var(--color-text-primary)abc'); on such input both engines must agree.
+
+Phase times are the best of several repeats. 'scan' is the pass that
+finds the literals to rewrite (convert.changing_hits()), 'convert' the
+rest of convert_css(): finding and rewriting the statements holding them.
+"""
+
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from .colors import parse_color
+from .convert import changing_hits, convert_css
+from .stream import convert_stream, open_input, open_output
+from .tokenizer import COMMENT, DECLARATION, SELECTOR, iter_rules, tokenize
+
+Model = namedtuple('Model', 'declarations_per_rule color_share unmapped_share media_share comment_share')
+
+# Shape of public/index.css at the time of writing, used when no stylesheet is given
+DEFAULT_MODEL = Model(3.51, 0.222, 0.219, 0.165, 0.214)
+
+PHASES = ('read', 'scan', 'convert', 'prelude', 'write')
+
+_COLOR_VALUE = re.compile(r'#[0-9a-fA-F]{3,8}\b|\b(?:rgba?|hsla?)\(|var\(--color-')
+_SIZE = re.compile(r'^(\d+(?:\.\d+)?)([KMG]?)B?$', re.IGNORECASE)
+_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+_PROPERTIES = ('display: flex', 'padding: 12px 16px', 'margin: 0 auto', 'font-size: 14px',
+               'line-height: 1.6', 'border-radius: 8px', 'gap: 8px', 'position: relative',
+               'transition: all 0.2s ease', 'width: 100%', 'font-weight: 600', 'cursor: pointer')
+_COLOR_PROPERTIES = ('color: {}', 'background: {}', 'background-color: {}', 'border: 1px solid {}',
+                     'border-bottom: 2px solid {}', 'box-shadow: 0 2px 8px {}', 'outline-color: {}')
+_SELECTOR_PARTS = ('card', 'btn', 'nav', 'modal', 'question', 'tool', 'form', 'list', 'header', 'item')
+_MEDIA = ('@media (max-width: 768px)', '@media (max-width: 480px)', '@media (prefers-reduced-motion: reduce)')
+
+
+def parse_size(text):
+    """'100K' -> 102400, '1.5M' -> 1572864"""
+    match = _SIZE.match(text.strip())
+    if match is None:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f'{size // _UNITS[unit]}{unit}'
+    return str(size)
+
+
+def measure_model(content):
+    """Measure the Model of a stylesheet"""
+    rules = declarations = colors = unmapped = in_media = comments = 0
+    for context, token in iter_rules(tokenize(content)):
+        if token.kind == SELECTOR:
+            rules += 1
+            in_media += any(entry.startswith('@media') for entry in context)
+        elif token.kind == COMMENT:
+            comments += 1
+        elif token.kind == DECLARATION and not token.name.startswith('--'):
+            declarations += 1
+            if _COLOR_VALUE.search(token.value):
+                colors += 1
+                unmapped += 'var(' not in token.value
+    if not rules or not declarations:
+        return DEFAULT_MODEL
+    return Model(round(declarations / rules, 2), round(colors / declarations, 3),
+                 round(unmapped / colors, 3) if colors else 0.0,
+                 round(in_media / rules, 3), round(comments / rules, 3))
+
+
+def generate_css(size, replacer, model=DEFAULT_MODEL, seed=0):
+    """
+    A synthetic stylesheet of about size bytes shaped like model.
+    Mapped colors use the palette spellings of replacer (in random case);
+    unmapped ones are random hex colors outside the palette.
+    """
+    rng = random.Random(seed)
+    spellings = sorted(replacer.names.values())
+    # Unmapped colors the legacy passes would cut into are not generated
+    prefixes = tuple(spelling for spelling in legacy_color_map(replacer) if spelling.startswith('#'))
+    parts = []
+    total = 0
+    index = 0
+    while total < size:
+        index += 1
+        text = _rule(rng, index, spellings, replacer, model, prefixes)
+        if rng.random() < model.comment_share:
+            text = f'/* Section {index} */\n' + text
+        if rng.random() < model.media_share:
+            text = rng.choice(_MEDIA) + ' {\n' + text.replace('\n', '\n  ').rstrip(' ') + '}\n'
+        parts.append(text + '\n')
+        total += len(parts[-1])
+    return ''.join(parts)
+
+
+def _rule(rng, index, spellings, replacer, model, prefixes):
+    selector = f'.{rng.choice(_SELECTOR_PARTS)}-{index}'
+    if rng.random() < 0.5:
+        selector += f' .{rng.choice(_SELECTOR_PARTS)}-{rng.randrange(100)}'
+    count = max(1, round(rng.expovariate(1 / model.declarations_per_rule)))
+    lines = [selector + ' {']
+    for _ in range(count):
+        if rng.random() < model.color_share:
+            color = _unmapped(rng, replacer, prefixes) if rng.random() < model.unmapped_share else rng.choice(spellings)
+            if color.startswith('#') and rng.random() < 0.2:
+                color = color.upper()
+            lines.append(f'  {rng.choice(_COLOR_PROPERTIES).format(color)};')
+        else:
+            lines.append(f'  {rng.choice(_PROPERTIES)};')
+    return '\n'.join(lines) + '\n}\n'
+
+
+def _unmapped(rng, replacer, prefixes):
+    while True:
+        color = f'#{rng.randrange(1 << 24):06x}'
+        if parse_color(color) not in replacer.values and not color.startswith(prefixes):
+            return color
+
+
+def legacy_color_map(replacer):
+    """
+    The COLOR_MAP of the converters before the palette: every mapped
+    color under its palette spelling, hex colors also in their long and
+    (when there is one) short form, like '#fff' and '#ffffff'. rgba()
+    colors were left alone.
+    """
+    color_map = {}
+    for spelling, value in replacer.color_map.items():
+        color_map[spelling] = value
+        if spelling.startswith('#') and len(spelling) in (4, 7):
+            long = spelling if len(spelling) == 7 else '#' + ''.join(2 * digit for digit in spelling[1:])
+            color_map.setdefault(long, value)
+            if long[1::2] == long[2::2]:
+                color_map.setdefault('#' + long[1::2], value)
+    return color_map
+
+
+def legacy_replace(content, replacer):
+    """
+    replace_colors_in_content() as it was before the single-pass engine:
+    one case-insensitive substitution per spelling over the whole text,
+    longest spelling first, with no token boundaries.
+    """
+    sorted_colors = sorted(legacy_color_map(replacer).items(), key=lambda x: len(x[0]), reverse=True)
+    for hex_color, var_name in sorted_colors:
+        pattern = re.compile(re.escape(hex_color), re.IGNORECASE)
+        content = pattern.sub(var_name, content)
+    return content
+
+
+def first_difference(a, b):
+    """Offset of the first differing character, or None when equal"""
+    if a == b:
+        return None
+    for index, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return index
+    return min(len(a), len(b))
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def _write(path, text):
+    with open_output(path) as f:
+        f.write(text)
+
+
+def _convert_in_memory(input_path, output_path, replacer, prelude):
+    content = _read(input_path)
+    _write(output_path, prelude + convert_css(content, replacer))
+
+
+def _convert_streaming(input_path, output_path, replacer, prelude):
+    with open_input(input_path) as source, open_output(output_path) as target:
+        convert_stream(source, target, replacer, prelude)
+
+
+def _peak(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_size(size, replacer, prelude, model=DEFAULT_MODEL, repeat=3, seed=0, memory=True, legacy=True):
+    """Benchmark one input size; returns a JSON-ready dict"""
+    content = generate_css(size, replacer, model, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'input.css')
+        output_path = os.path.join(directory, 'output.css')
+        _write(input_path, content)
+        del content
+
+        phases = {phase: float('inf') for phase in PHASES}
+        for _ in range(max(1, repeat)):
+            content, elapsed = _timed(_read, input_path)
+            phases['read'] = min(phases['read'], elapsed)
+            _, scan_time = _timed(changing_hits, content, replacer)
+            converted, convert_time = _timed(convert_css, content, replacer)
+            phases['scan'] = min(phases['scan'], scan_time)
+            phases['convert'] = min(phases['convert'], max(0.0, convert_time - scan_time))
+            final, elapsed = _timed(str.__add__, prelude, converted)
+            phases['prelude'] = min(phases['prelude'], elapsed)
+            del converted
+            _, elapsed = _timed(_write, output_path, final)
+            phases['write'] = min(phases['write'], elapsed)
+            del final
+
+        result = {
+            'size': len(content.encode('utf-8')),
+            'label': format_size(size),
+            'phases': {phase: round(seconds, 6) for phase, seconds in phases.items()},
+            'total': round(sum(phases.values()), 6),
+        }
+        result['throughput_mb_s'] = round(result['size'] / (1 << 20) / result['total'], 2) if result['total'] else None
+
+        if memory:
+            del content
+            result['peak_memory'] = _peak(_convert_in_memory, input_path, output_path, replacer, prelude)
+            result['stream_peak_memory'] = _peak(_convert_streaming, input_path, output_path, replacer, prelude)
+            content = _read(input_path)
+
+        if legacy:
+            expected, elapsed = _timed(legacy_replace, content, replacer)
+            offset = first_difference(convert_css(content, replacer), expected)
+            result['legacy'] = {'seconds': round(elapsed, 6), 'equivalent': offset is None,
+                                'first_difference': offset}
+    return result
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare results with a baseline run. Returns (lines, regressions) where
+    a regression is a size whose total or phase time grew by more than threshold.
+    """
+    previous = {entry['label']: entry for entry in baseline.get('results', [])}
+    lines = []
+    regressions = []
+    for entry in results:
+        old = previous.get(entry['label'])
+        if old is None:
+            lines.append(f"  {entry['label']:>6}: not in baseline")
+            continue
+        slower = []
+        for phase in ('total',) + PHASES:
+            new_time = entry['total'] if phase == 'total' else entry['phases'].get(phase, 0)
+            old_time = old['total'] if phase == 'total' else old['phases'].get(phase, 0)
+            # Sub-millisecond phases are too noisy to compare
+            if old_time and new_time > old_time * (1 + threshold) and new_time - old_time > 0.001:
+                slower.append(f"{phase} {new_time / old_time - 1:+.0%}")
+        change = entry['total'] / old['total'] - 1 if old['total'] else 0.0
+        lines.append(f"  {entry['label']:>6}: total {change:+.1%}" + (f" (slower: {', '.join(slower)})" if slower else ''))
+        if slower:
+            regressions.append(entry['label'])
+    return lines, regressions
+
+
+def slower_than_legacy(results):
+    """Labels of the sizes where the pipeline took longer than the legacy engine"""
+    return [entry['label'] for entry in results
+            if 'legacy' in entry and entry['total'] > entry['legacy']['seconds']]
+
+
+def format_results(results):
+    lines = [f"  {'size':>6}  " + '  '.join(f'{phase:>8}' for phase in PHASES) + f"  {'total':>8}  {'MB/s':>7}"
+             + f"  {'peak':>9}  {'stream':>9}  {'legacy':>8}  equal"]
+    for entry in results:
+        row = f"  {entry['label']:>6}  " + '  '.join(f"{entry['phases'][phase] * 1000:>6.1f}ms" for phase in PHASES)
+        row += f"  {entry['total'] * 1000:>6.1f}ms  {entry['throughput_mb_s'] or 0:>7.1f}"
+        if 'peak_memory' in entry:
+            row += f"  {entry['peak_memory'] / (1 << 20):>7.1f}MB  {entry['stream_peak_memory'] / (1 << 20):>7.1f}MB"
+        else:
+            row += f"  {'-':>9}  {'-':>9}"
+        if 'legacy' in entry:
+            legacy = entry['legacy']
+            row += f"  {legacy['seconds']:>7.2f}s  " + ('yes' if legacy['equivalent'] else
+                                                        f"NO (offset {legacy['first_difference']})")
+            if entry['total'] > legacy['seconds']:
+                row += f"  SLOWER than legacy ({entry['total'] / legacy['seconds']:.1f}x)"
+        else:
+            row += f"  {'-':>8}  -"
+        lines.append(row)
+    return lines
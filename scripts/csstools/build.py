@@ -0,0 +1,89 @@
+"""
+Minified, content-hashed and precompressed build output
+
+build_css() writes name.<hash>.css next to .gz (and .br when the brotli
+module is installed) siblings, and records the logical name in the
+directory's manifest.json, e.g. {"index.css": "index.1a2b3c4d.css"}.
+Hashed files never change, so they can be served with far-future
+immutable cache headers; older builds of the same name are removed.
+"""
+
+import gzip
+import json
+import os
+import re
+
+from .cache import content_hash
+from .minify import minify_css
+from .stream import open_output
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+DEFAULT_BUILD_DIR = os.path.join('public', 'build')
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 8
+
+
+def _write_bytes(path, data):
+    with open_output(path, binary=True) as f:
+        f.write(data)
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def build_css(content, out_dir, name='index.css', minify=True):
+    """
+    Write the build of one stylesheet and update the manifest.
+    Returns {'file', 'bytes', 'gzip', 'brotli'} sizes keyed by variant.
+    """
+    if minify:
+        content = minify_css(content)
+    data = content.encode('utf-8')
+    stem, extension = os.path.splitext(name)
+    file_name = f'{stem}.{content_hash(data)[:HASH_LENGTH]}{extension}'
+    path = os.path.join(out_dir, file_name)
+    os.makedirs(out_dir, exist_ok=True)
+
+    result = {'file': file_name, 'bytes': len(data), 'gzip': None, 'brotli': None}
+    variants = [('', data), ('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, payload in variants:
+        if not os.path.exists(path + suffix):
+            _write_bytes(path + suffix, payload)
+        if suffix:
+            result['gzip' if suffix == '.gz' else 'brotli'] = len(payload)
+
+    stale = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(extension) + r'(?:\.gz|\.br)?$')
+    for existing in os.listdir(out_dir):
+        if stale.match(existing) and not existing.startswith(file_name):
+            os.remove(os.path.join(out_dir, existing))
+
+    manifest = read_manifest(out_dir)
+    manifest[name] = file_name
+    with open_output(os.path.join(out_dir, MANIFEST)) as f:
+        f.write(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + '\n')
+    return result
+
+
+def build_file(path, out_dir, name=None, minify=True):
+    """build_css() for a stylesheet on disk, named after its file by default"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return build_css(content, out_dir, name or os.path.basename(path), minify)
+
+
+def format_build(result):
+    line = f"Built {result['file']}: {result['bytes']:,} bytes, gzip {result['gzip']:,}"
+    if result['brotli'] is not None:
+        line += f", brotli {result['brotli']:,}"
+    return line
@@ -0,0 +1,142 @@
+"""
+Route-scoped stylesheet bundles
+
+Every bundle owns a set of views and scripts. A selector used by exactly
+one bundle's sources moves into that bundle; selectors used by several
+bundles, by the shared sources (top-level views, navbar, footer...) or
+by nothing that was scanned stay in the core bundle, together with the
+theme blocks, @keyframes and @font-face. Selector lists are split, so
+the bundles together hold the whole stylesheet once, in the original
+order within each file. Route bundles load after the core, which only
+changes the cascade for equal-specificity rules that match the same
+element from two bundles; exclusive usage makes that rare.
+
+Files are named after their content hash, so editing one section only
+invalidates that section's bundle. manifest.json lists the files and,
+for every top-level view, the bundles it needs; a <link> partial is
+written per view as well.
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+from .batch import expand_globs
+from .cache import content_hash
+from .critical import included_templates, page_name, page_templates
+from .prune import filter_rules
+from .stream import open_output
+from .usage import DEFAULT_SOURCES, scan_files
+
+CORE = 'core'
+
+# name -> source globs (relative to the repo root); lazy bundles style
+# sections opened on demand and are linked without blocking rendering
+DEFAULT_BUNDLES = {
+    'tools': {'sources': ['views/tools/**/*.ejs', 'public/js/tools/**/*.js']},
+    'questions': {'sources': ['views/questions/**/*.ejs']},
+    'articles': {'sources': ['views/articles/**/*.ejs', 'content/**/*.md']},
+    'contact': {'sources': ['views/contact/**/*.ejs']},
+    'account': {'sources': ['views/_share/account_modal.ejs', 'views/_share/account/**/*.ejs',
+                            'public/js/account/**/*.js'], 'lazy': True},
+}
+
+Bundle = namedtuple('Bundle', 'name file bytes lazy')
+
+_BUNDLE_FILE = re.compile(r'^[\w-]+\.[0-9a-f]{8}\.css$')
+
+
+class Partition:
+    """Assigns each selector to the core or to the single bundle that uses it"""
+
+    def __init__(self, core_usage, usages):
+        self.core_usage = core_usage
+        self.usages = usages
+        self._cache = {}
+
+    def owner(self, selector):
+        selector = selector.strip()
+        if selector not in self._cache:
+            owner = CORE
+            if not self.core_usage.selector_matches(selector):
+                users = [name for name, usage in self.usages.items() if usage.selector_matches(selector)]
+                if len(users) == 1:
+                    owner = users[0]
+            self._cache[selector] = owner
+        return self._cache[selector]
+
+
+def scan_bundles(bundles, root='.'):
+    """Return (core usage, {bundle: usage}, {bundle: set of paths}) for globs relative to root"""
+    paths = {name: set(expand_globs(bundle['sources'], root)) for name, bundle in bundles.items()}
+    owned = set().union(*paths.values()) if paths else set()
+    core_paths = [path for path in expand_globs(DEFAULT_SOURCES, root) if path not in owned]
+    return scan_files(core_paths), {name: scan_files(sorted(files)) for name, files in paths.items()}, paths
+
+
+def split_bundles(tokens, partition):
+    """Split a token list into {bundle: stylesheet text}, core first"""
+    texts = {CORE: filter_rules(tokens, lambda selector: partition.owner(selector) == CORE)[0]}
+    for name in partition.usages:
+        text = filter_rules(tokens, lambda selector: partition.owner(selector) == name, extras=False)[0]
+        texts[name] = text.strip() + '\n' if text.strip() else ''
+    return texts
+
+
+def view_bundles(views, paths):
+    """{view name: bundle names} from the templates each view includes"""
+    result = {}
+    for template in page_templates(views):
+        included = included_templates(template)
+        result[page_name(template, views)] = [CORE] + [
+            name for name, files in paths.items() if included & {os.path.normpath(path) for path in files}]
+    return result
+
+
+def write_bundles(texts, out_dir, bundles):
+    """Write the hashed bundle files, remove stale ones and return {name: Bundle}"""
+    os.makedirs(out_dir, exist_ok=True)
+    written = {}
+    for name, text in texts.items():
+        if not text:
+            continue
+        file_name = f'{name}.{content_hash(text)[:8]}.css'
+        path = os.path.join(out_dir, file_name)
+        if not os.path.exists(path):
+            with open_output(path) as f:
+                f.write(text)
+        written[name] = Bundle(name, file_name, len(text.encode('utf-8')),
+                               bool(bundles.get(name, {}).get('lazy')))
+    current = {bundle.file for bundle in written.values()}
+    for file_name in os.listdir(out_dir):
+        if _BUNDLE_FILE.match(file_name) and file_name not in current:
+            os.remove(os.path.join(out_dir, file_name))
+    return written
+
+
+def render_links(names, written, url_prefix):
+    """<link> tags of a view's bundles; lazy ones do not block rendering"""
+    lines = []
+    for name in names:
+        bundle = written.get(name)
+        if bundle is None:
+            continue
+        href = url_prefix + bundle.file
+        if bundle.lazy:
+            lines.append(f'<link rel="preload" href="{href}" as="style" '
+                         f'onload="this.onload=null;this.rel=\'stylesheet\'">')
+        else:
+            lines.append(f'<link rel="stylesheet" href="{href}" />')
+    return '\n'.join(lines) + '\n'
+
+
+def write_manifest(path, written, views, url_prefix):
+    manifest = {
+        'bundles': {name: {'file': url_prefix + bundle.file, 'bytes': bundle.bytes, 'lazy': bundle.lazy}
+                    for name, bundle in written.items()},
+        'views': {view: [name for name in names if name in written] for view, names in views.items()},
+    }
+    with open_output(path) as f:
+        f.write(json.dumps(manifest, ensure_ascii=False, indent=2) + '\n')
+    return manifest
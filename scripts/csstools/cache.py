@@ -0,0 +1,137 @@
+"""
+Content-hash incremental cache for converter runs
+
+Every top-level rule is keyed by a hash of its text and the palette
+fingerprint. On a re-run only rules whose key is missing are converted;
+everything else is spliced in from the cache. A manifest records the
+input, prelude and output hashes so that a run on unchanged input is
+answered without tokenizing anything.
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+
+from .convert import convert_css, prelude_length
+from .stream import open_output
+from .tokenizer import split_top_level
+
+DEFAULT_CACHE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '.cache', 'csstools'))
+
+CACHE_FORMAT = 1
+
+
+def content_hash(data):
+    """Short stable hash of a str or bytes value"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _file_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
+
+
+class RuleCache:
+    """On-disk cache of converted top-level rules for one input file"""
+
+    def __init__(self, input_path, cache_dir=DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, content_hash(os.path.abspath(input_path)) + '.json')
+        self.manifest = {}
+        self.rules = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('format') == CACHE_FORMAT:
+            self.manifest = data.get('manifest', {})
+            self.rules = data.get('rules', {})
+
+    def save(self, manifest, rules):
+        """Replace the stored manifest and rules; only rules of the last run are kept"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': CACHE_FORMAT, 'manifest': manifest, 'rules': rules}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+        self.manifest = manifest
+        self.rules = rules
+
+
+def convert_incremental(input_path, output_path, replacer, prelude='', counts=None,
+                        cache_dir=DEFAULT_CACHE_DIR, cache=None):
+    """
+    Convert input_path into output_path reusing cached rules.
+    A long-running caller can pass its own RuleCache to keep it in memory.
+    Returns a dict with 'status' ('up-to-date' or 'converted') and the
+    number of cache 'hits' and 'misses'.
+    """
+    input_path = os.path.abspath(input_path)
+    output_path = os.path.abspath(output_path)
+    if cache is None:
+        cache = RuleCache(input_path, cache_dir)
+    palette = replacer.fingerprint()
+    prelude_hash = content_hash(prelude)
+
+    with open(input_path, 'rb') as f:
+        raw = f.read()
+    input_hash = content_hash(raw)
+
+    manifest = cache.manifest
+    if (manifest.get('palette') == palette and manifest.get('prelude') == prelude_hash
+            and manifest.get('output_path') == output_path):
+        output_hash = input_hash if output_path == input_path else _file_hash(output_path)
+        # In-place runs see their own previous output as the new input
+        if output_hash == manifest.get('output') and (
+                input_hash == manifest.get('input') or output_path == input_path):
+            if counts is not None:
+                counts.update(manifest.get('counts', {}))
+            return {'status': 'up-to-date', 'hits': 0, 'misses': 0}
+
+    content = raw.decode('utf-8')
+    content = content[prelude_length(content, prelude):]
+    rules = {}
+    run_counts = Counter()
+    parts = [prelude]
+    hits = misses = 0
+    for source in split_top_level(content):
+        key = content_hash(palette + source)
+        entry = cache.rules.get(key) or rules.get(key)
+        if entry is None:
+            misses += 1
+            rule_counts = Counter()
+            entry = [convert_css(source, replacer, rule_counts), dict(rule_counts)]
+        else:
+            hits += 1
+        rules[key] = entry
+        # Converting a converted rule is a no-op, so after an in-place run
+        # the output text is a valid key as well
+        if entry[0] != source:
+            rules.setdefault(content_hash(palette + entry[0]), [entry[0], {}])
+        parts.append(entry[0])
+        run_counts.update(entry[1])
+
+    output = ''.join(parts)
+    encoded = output.encode('utf-8')
+    with open_output(output_path, binary=True) as f:
+        f.write(encoded)
+
+    cache.save({
+        'palette': palette,
+        'prelude': prelude_hash,
+        'input': input_hash,
+        'output': content_hash(encoded),
+        'output_path': output_path,
+        'counts': dict(run_counts),
+    }, rules)
+    if counts is not None:
+        counts.update(run_counts)
+    return {'status': 'converted', 'hits': hits, 'misses': misses}
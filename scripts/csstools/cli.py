@@ -0,0 +1,400 @@
+"""
+Command line helpers shared by the converter scripts
+
+converter_main() parses the shared arguments, checks their combinations
+and dispatches to the conversion mode; the scripts only differ in the
+wording of their progress lines (a ConverterMessages subclass).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from .batch import expand_globs, file_kind, format_report, run_batch, summarize
+from .build import build_file, format_build
+from .cache import DEFAULT_CACHE_DIR, convert_incremental
+from .convert import prelude_length
+from .diff import dry_run
+from .mapped import convert_mapped
+from .markup import HOIST_MIN_COUNT, KEEP_INLINE, hoist_files
+from .nearest import extend_from_files, format_matches
+from .palette import DEFAULT_PALETTE, load_palette
+from .parallel import convert_parallel, format_speedup, time_serial
+from .stats import RunStats, format_stats, profiled
+from .varindex import DEFAULT_SOURCES as INDEX_SOURCES, open_index, update_index
+from .stream import STDIO, convert_stream, open_input, open_output
+from .watch import DEFAULT_INTERVAL, watch_file, watch_globs
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+PUBLIC_DIR = os.path.join(REPO_ROOT, 'public')
+DEFAULT_STYLESHEET = os.path.join(PUBLIC_DIR, 'index.css')
+
+
+def add_io_arguments(parser):
+    """Add the input/output arguments common to every converter"""
+    parser.add_argument('input', nargs='?', default=DEFAULT_STYLESHEET,
+                        help="stylesheet to convert, '-' for stdin (default: public/index.css)")
+    parser.add_argument('-o', '--output',
+                        help="output file, '-' for stdout (default: overwrite the input)")
+    parser.add_argument('--stream', action='store_true',
+                        help='convert chunk by chunk with constant memory')
+    parser.add_argument('--mmap', action='store_true',
+                        help='map the input and only decode the rules that hold palette colors '
+                             '(for large inputs)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='split the input between top-level rules and convert the pieces in '
+                             'worker processes (for large inputs, see --jobs)')
+    parser.add_argument('--compare-serial', action='store_true',
+                        help='with --parallel: also run the serial path, check the output is identical '
+                             'and report the measured speedup')
+    parser.add_argument('--incremental', action='store_true',
+                        help='reuse cached output for unchanged top-level rules')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='directory of the incremental cache (default: .cache/csstools)')
+    parser.add_argument('--glob', action='append', metavar='PATTERN',
+                        help="batch mode: convert every file matching PATTERN in place "
+                             "(repeatable, e.g. 'views/**/*.ejs')")
+    parser.add_argument('--jobs', type=int,
+                        help='worker processes for batch mode and --parallel (default: one per core)')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write the aggregated batch report as JSON')
+    parser.add_argument('--hoist-styles', metavar='CSS_FILE',
+                        help='batch mode: move inline styles repeated across the matched templates '
+                             'into utility classes written to CSS_FILE (under public/), linked after '
+                             'the main stylesheet')
+    parser.add_argument('--hoist-min', type=int, default=HOIST_MIN_COUNT, metavar='N',
+                        help='uses needed before a style is hoisted (default: %(default)s)')
+    parser.add_argument('--hoist-keep', default='', metavar='PROPERTIES',
+                        help='comma-separated properties whose styles also stay inline because scripts '
+                             f"read them back ({', '.join(KEEP_INLINE)} always do)")
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild whenever an input changes')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help='watch mode polling interval in seconds (default: %(default)s)')
+    parser.add_argument('--nearest', type=float, metavar='DELTA_E',
+                        help='auto-map unmapped colors to the nearest palette color within DELTA_E')
+    parser.add_argument('--color-space', choices=('oklab', 'lab'), default='oklab',
+                        help='color space for --nearest distances (default: %(default)s)')
+    parser.add_argument('--palette', default=DEFAULT_PALETTE, metavar='FILE',
+                        help='palette source, compiled once and cached (default: scripts/palette.json)')
+    parser.add_argument('--no-prelude', action='store_true',
+                        help='do not prepend the theme variable blocks')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print a unified diff of the changes instead of writing anything')
+    parser.add_argument('--stats', choices=('text', 'json'),
+                        help='report phase times, hits per palette color, never-matched palette colors '
+                             'and unconverted literals (json: one document on stdout)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='profile the run with cProfile and write the pstats dump to FILE')
+    parser.add_argument('--update-index', action='store_true',
+                        help='afterwards, rescan the changed stylesheets, views and scripts into the '
+                             'variable usage index (see css-var-index.py)')
+    parser.add_argument('--build', metavar='DIR',
+                        help='also write a minified, content-hashed, precompressed copy and '
+                             'manifest.json to DIR (e.g. public/build)')
+    return parser
+
+
+def write_json(path, data):
+    """Write data as pretty JSON ('-' is stdout)"""
+    text = json.dumps(data, ensure_ascii=False, indent=2) + '\n'
+    if path == STDIO:
+        sys.stdout.write(text)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def resolve_io(args):
+    """Return (input, output, streaming) for parsed arguments"""
+    output = args.output or args.input
+    streaming = args.stream or STDIO in (args.input, output)
+    return args.input, output, streaming
+
+
+def source_paths(patterns, defaults):
+    """Files matched by patterns (relative to the cwd), or by defaults (relative to the repo)"""
+    if patterns:
+        return expand_globs(patterns)
+    return expand_globs(defaults, REPO_ROOT)
+
+
+def run_build(args, output):
+    """Run the --build output stage for a converted file, if requested"""
+    if not args.build:
+        return
+    if output == STDIO:
+        print('--build needs an output file, not stdout', file=sys.stderr)
+        return
+    result = build_file(output, args.build)
+    print(format_build(result), file=sys.stderr if STDIO == args.input else sys.stdout)
+
+
+def report_stats(args, stats, replacer, output, text=None):
+    """Print the --stats report of a single-file run; text is the converted CSS when in memory"""
+    if not args.stats:
+        return
+    if text is None and output != STDIO:
+        with open(output, 'r', encoding='utf-8') as f:
+            text = f.read()
+    report = stats.report(replacer, text)
+    # The CSS may be on stdout already
+    out = sys.stderr if output == STDIO else sys.stdout
+    if args.stats == 'json':
+        out.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+    else:
+        print('\n'.join(format_stats(report)), file=out)
+
+
+def public_url(path):
+    """The URL app.js serves a file under public/ at, or None for a file outside it"""
+    relative = os.path.relpath(os.path.abspath(path), PUBLIC_DIR)
+    if relative == os.curdir or relative.split(os.sep)[0] == os.pardir:
+        return None
+    return '/public/' + relative.replace(os.sep, '/')
+
+
+def run_hoist(args, paths):
+    """Run the --hoist-styles stage of a batch over the templates among paths, if requested"""
+    if not args.hoist_styles:
+        return None
+    templates = [path for path in paths if file_kind(path) == 'markup']
+    # The rules an inline style must not be moved below: the main stylesheet and the batch's CSS
+    sources = [DEFAULT_STYLESHEET] + [path for path in paths if file_kind(path) == 'css']
+    output = os.path.abspath(args.hoist_styles)
+    stylesheets = [path for path in dict.fromkeys(sources)
+                   if os.path.abspath(path) != output and os.path.exists(path)]
+    # Scripts toggle these through element.style, so they are never optional
+    keep = KEEP_INLINE + tuple(name.strip().lower() for name in args.hoist_keep.split(',') if name.strip())
+    result = hoist_files(templates, args.hoist_styles, public_url(args.hoist_styles),
+                         public_url(DEFAULT_STYLESHEET), stylesheets, args.hoist_min, keep=keep)
+    if result['classes']:
+        print(f"Hoisted {result['hoisted']} inline styles from {len(result['files'])} templates into "
+              f"{len(result['classes'])} utility classes in {args.hoist_styles}, "
+              f"(newly linked from {len(result['linked'])} templates)")
+    else:
+        print(f"No inline style is used {args.hoist_min} times or more where neither a stylesheet rule "
+              f"nor a script needs it inline; nothing hoisted")
+    return result
+
+
+def run_index(args, palette, out=sys.stdout):
+    """Run the --update-index stage after a conversion, if requested"""
+    if not args.update_index:
+        return
+    connection = open_index()
+    try:
+        result = update_index(connection, source_paths(None, INDEX_SOURCES), palette.replacer,
+                              palette.digest, REPO_ROOT)
+    finally:
+        connection.close()
+    print(f"Usage index: {result['indexed']} files rescanned, {result['unchanged']} unchanged, "
+          f"{result['removed']} removed", file=out)
+
+
+def run_dry(args, input_file, output_file, replacer, prelude):
+    """Print the --dry-run diff of a single-file run; nothing is written"""
+    start = time.perf_counter()
+    counts = Counter()
+    with open_input(input_file) as f:
+        content = f.read()
+    added = 0
+    for line in dry_run(content, replacer, prelude, input_file, output_file, counts):
+        sys.stdout.write(line)
+        added += line.startswith('+') and not line.startswith('+++')
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Dry run: {sum(counts.values())} replacements, {added} lines added or rewritten "
+          f"in {elapsed:.1f} ms; nothing written", file=sys.stderr)
+
+
+class ConverterMessages:
+    """
+    Progress lines of a converter run. out is stdout, or stderr when
+    stdout carries the CSS or a JSON document.
+    """
+    error_prefix = 'Error:'
+
+    def replacements(self, count, out):
+        print(f"Total replacements made: {count}", file=out)
+
+    def mapped(self, output_file, result, replacements, out):
+        print(f"{output_file}: {result['written']:,} bytes written, {result['decoded']:,} of "
+              f"{result['read']:,} input bytes decoded ({result['statements']} rules converted)", file=out)
+
+    def streamed(self, read, written, replacements, out):
+        print(f"Original file size: {read} characters", file=out)
+        print(f"Converted file size: {written} characters", file=out)
+
+    def incremental(self, output_file, result, replacements, out):
+        print(f"{output_file}: {result['status']} "
+              f"({result['hits']} cached rules, {result['misses']} converted)", file=out)
+
+    def reading(self, input_file, out):
+        pass
+
+    def read(self, content, out):
+        print(f"Original file size: {len(content)} characters", file=out)
+
+    def converted(self, content, replacements, out):
+        print(f"Converted file size: {len(content)} characters", file=out)
+
+    def written(self, input_file, output_file, out):
+        print(f"Successfully converted {input_file} to use CSS variables", file=out)
+        print(f"Output written to {output_file}", file=out)
+
+
+def check_arguments(parser, args):
+    """Reject the argument combinations the converters cannot run"""
+    if args.stats and (args.glob or args.watch):
+        parser.error('--stats applies to single-file runs; use --report for batches')
+    if args.dry_run and (args.glob or args.watch):
+        parser.error('--dry-run previews single-file runs')
+    if args.update_index and args.dry_run:
+        parser.error('--dry-run writes nothing, so there is nothing to index')
+    if args.compare_serial and not args.parallel:
+        parser.error('--compare-serial needs --parallel')
+    if args.parallel and (args.glob or args.watch or args.mmap or args.incremental):
+        parser.error('--parallel converts one file in memory; it cannot be combined with '
+                     '--glob, --watch, --mmap or --incremental')
+    if args.hoist_styles and (not args.glob or args.watch):
+        parser.error('--hoist-styles works on the templates of a --glob batch')
+    if args.hoist_styles and public_url(args.hoist_styles) is None:
+        parser.error('--hoist-styles must write under public/, or the linked stylesheet would not be served')
+
+
+def converter_main(description, messages):
+    """Entry point of the converter scripts"""
+    parser = argparse.ArgumentParser(description=description)
+    add_io_arguments(parser)
+    args = parser.parse_args()
+    input_file, output_file, streaming = resolve_io(args)
+    check_arguments(parser, args)
+    # A JSON document on stdout leaves no room for progress lines
+    out = sys.stderr if args.stats == 'json' else sys.stdout
+
+    try:
+        with profiled(args.profile):
+            run_converter(parser, args, messages, input_file, output_file, streaming, out)
+            run_index(args, load_palette(args.palette, args.cache_dir),
+                      sys.stderr if STDIO in (input_file, output_file) else out)
+    except Exception as e:
+        print(f"{messages.error_prefix} {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_converter(parser, args, messages, input_file, output_file, streaming, out):
+    """Run the conversion mode the arguments select"""
+    # Every mode below shares the one compiled palette
+    palette = load_palette(args.palette, args.cache_dir)
+    prelude = '' if args.no_prelude else palette.prelude
+    replacer = palette.replacer
+    if args.nearest is not None:
+        if STDIO in (input_file, output_file) and not args.glob:
+            parser.error('--nearest needs file paths, not stdin/stdout')
+        paths = expand_globs(args.glob) if args.glob else [input_file]
+        replacer, matches, misses = extend_from_files(palette.replacer, paths, args.nearest, args.color_space)
+        print('\n'.join(format_matches(matches, misses, args.nearest)), file=sys.stderr)
+
+    if args.dry_run:
+        run_dry(args, input_file, output_file, replacer, prelude)
+        return
+
+    if args.watch:
+        if args.glob:
+            watch_globs(args.glob, replacer, args.interval)
+        elif STDIO in (input_file, output_file):
+            parser.error('--watch needs file paths, not stdin/stdout')
+        else:
+            watch_file(input_file, output_file, replacer, prelude, args.cache_dir, args.interval)
+        return
+
+    if args.glob:
+        # The theme blocks are only written by single-file runs
+        paths = expand_globs(args.glob)
+        results = run_batch(paths, replacer, args.jobs)
+        report = summarize(results)
+        print('\n'.join(format_report(report)))
+        # Hoisted after conversion, so the utility classes hold converted colors
+        hoisted = run_hoist(args, paths)
+        if hoisted is not None:
+            report['hoist'] = hoisted
+        if args.report:
+            write_json(args.report, report)
+        return
+
+    if args.mmap:
+        if STDIO in (input_file, output_file):
+            parser.error('--mmap needs file paths, not stdin/stdout')
+        stats = RunStats('mmap')
+        with stats.phase('convert'):
+            result = convert_mapped(input_file, output_file, replacer, prelude, stats.counts)
+        messages.mapped(output_file, result, sum(stats.counts.values()), out)
+        report_stats(args, stats, replacer, output_file)
+        run_build(args, output_file)
+        return
+
+    if args.parallel:
+        stats = RunStats('parallel')
+        with stats.phase('read'), open_input(input_file) as f:
+            content = f.read()
+        content = content[prelude_length(content, prelude):]
+        with stats.phase('convert'):
+            converted, timings = convert_parallel(content, replacer, args.jobs, counts=stats.counts)
+        serial = None
+        if args.compare_serial:
+            serial, offset = time_serial(content, replacer, converted)
+            if offset is not None:
+                raise RuntimeError(f"parallel output differs from the serial path at offset {offset}")
+        with stats.phase('write'), open_output(output_file) as f:
+            f.write(prelude + converted)
+        # stdout may carry the CSS
+        progress = sys.stderr if STDIO in (input_file, output_file) else out
+        messages.replacements(sum(stats.counts.values()), progress)
+        print(format_speedup(timings, serial), file=progress)
+        report_stats(args, stats, replacer, output_file, converted)
+        run_build(args, output_file)
+        return
+
+    if streaming:
+        # stdout may carry the CSS, so progress goes to stderr
+        stats = RunStats('stream')
+        with stats.phase('convert'), open_input(input_file) as source, open_output(output_file) as target:
+            read, written = convert_stream(source, target, replacer, prelude, stats.counts)
+        messages.streamed(read, written, sum(stats.counts.values()), sys.stderr)
+        report_stats(args, stats, replacer, output_file)
+        run_build(args, output_file)
+        return
+
+    if args.incremental:
+        stats = RunStats('incremental')
+        with stats.phase('convert'):
+            result = convert_incremental(input_file, output_file, replacer, prelude, stats.counts,
+                                         cache_dir=args.cache_dir)
+        messages.incremental(output_file, result, sum(stats.counts.values()), out)
+        report_stats(args, stats, replacer, output_file)
+        run_build(args, output_file)
+        return
+
+    stats = RunStats('memory')
+    messages.reading(input_file, out)
+    with stats.phase('read'), open(input_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    messages.read(content, out)
+    # An in-place run reads its own output; its theme blocks are replaced
+    content = content[prelude_length(content, prelude):]
+
+    # Only declaration values are rewritten; selectors, comments, url()
+    # and the theme variable blocks are left alone
+    converted = stats.convert(content, replacer)
+    with stats.phase('prelude'):
+        final = prelude + converted
+    messages.converted(final, sum(stats.counts.values()), out)
+
+    with stats.phase('write'), open_output(output_file) as f:
+        f.write(final)
+    messages.written(input_file, output_file, out)
+    report_stats(args, stats, replacer, output_file, converted)
+    run_build(args, output_file)
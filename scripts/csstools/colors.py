@@ -0,0 +1,175 @@
+"""
+Canonical CSS color parsing
+
+Every color form (3/4/6/8-digit hex, rgb()/rgba() with commas, spaces or
+percentages, hsl()/hsla() and named colors) is normalized to one packed
+0xRRGGBBAA integer, so palette lookups are a single dict access whatever
+the spelling. Parsing is memoized: repeated literals are parsed once.
+"""
+
+import colorsys
+import math
+import re
+from functools import lru_cache
+
+# Packed key of a color: 0xRRGGBBAA
+OPAQUE = 0xff
+
+NAMED_COLORS = {
+    'aliceblue': 0xf0f8ff, 'antiquewhite': 0xfaebd7, 'aqua': 0x00ffff, 'aquamarine': 0x7fffd4,
+    'azure': 0xf0ffff, 'beige': 0xf5f5dc, 'bisque': 0xffe4c4, 'black': 0x000000,
+    'blanchedalmond': 0xffebcd, 'blue': 0x0000ff, 'blueviolet': 0x8a2be2, 'brown': 0xa52a2a,
+    'burlywood': 0xdeb887, 'cadetblue': 0x5f9ea0, 'chartreuse': 0x7fff00, 'chocolate': 0xd2691e,
+    'coral': 0xff7f50, 'cornflowerblue': 0x6495ed, 'cornsilk': 0xfff8dc, 'crimson': 0xdc143c,
+    'cyan': 0x00ffff, 'darkblue': 0x00008b, 'darkcyan': 0x008b8b, 'darkgoldenrod': 0xb8860b,
+    'darkgray': 0xa9a9a9, 'darkgreen': 0x006400, 'darkgrey': 0xa9a9a9, 'darkkhaki': 0xbdb76b,
+    'darkmagenta': 0x8b008b, 'darkolivegreen': 0x556b2f, 'darkorange': 0xff8c00,
+    'darkorchid': 0x9932cc, 'darkred': 0x8b0000, 'darksalmon': 0xe9967a,
+    'darkseagreen': 0x8fbc8f, 'darkslateblue': 0x483d8b, 'darkslategray': 0x2f4f4f,
+    'darkslategrey': 0x2f4f4f, 'darkturquoise': 0x00ced1, 'darkviolet': 0x9400d3,
+    'deeppink': 0xff1493, 'deepskyblue': 0x00bfff, 'dimgray': 0x696969, 'dimgrey': 0x696969,
+    'dodgerblue': 0x1e90ff, 'firebrick': 0xb22222, 'floralwhite': 0xfffaf0,
+    'forestgreen': 0x228b22, 'fuchsia': 0xff00ff, 'gainsboro': 0xdcdcdc, 'ghostwhite': 0xf8f8ff,
+    'gold': 0xffd700, 'goldenrod': 0xdaa520, 'gray': 0x808080, 'green': 0x008000,
+    'greenyellow': 0xadff2f, 'grey': 0x808080, 'honeydew': 0xf0fff0, 'hotpink': 0xff69b4,
+    'indianred': 0xcd5c5c, 'indigo': 0x4b0082, 'ivory': 0xfffff0, 'khaki': 0xf0e68c,
+    'lavender': 0xe6e6fa, 'lavenderblush': 0xfff0f5, 'lawngreen': 0x7cfc00,
+    'lemonchiffon': 0xfffacd, 'lightblue': 0xadd8e6, 'lightcoral': 0xf08080,
+    'lightcyan': 0xe0ffff, 'lightgoldenrodyellow': 0xfafad2, 'lightgray': 0xd3d3d3,
+    'lightgreen': 0x90ee90, 'lightgrey': 0xd3d3d3, 'lightpink': 0xffb6c1,
+    'lightsalmon': 0xffa07a, 'lightseagreen': 0x20b2aa, 'lightskyblue': 0x87cefa,
+    'lightslategray': 0x778899, 'lightslategrey': 0x778899, 'lightsteelblue': 0xb0c4de,
+    'lightyellow': 0xffffe0, 'lime': 0x00ff00, 'limegreen': 0x32cd32, 'linen': 0xfaf0e6,
+    'magenta': 0xff00ff, 'maroon': 0x800000, 'mediumaquamarine': 0x66cdaa,
+    'mediumblue': 0x0000cd, 'mediumorchid': 0xba55d3, 'mediumpurple': 0x9370db,
+    'mediumseagreen': 0x3cb371, 'mediumslateblue': 0x7b68ee, 'mediumspringgreen': 0x00fa9a,
+    'mediumturquoise': 0x48d1cc, 'mediumvioletred': 0xc71585, 'midnightblue': 0x191970,
+    'mintcream': 0xf5fffa, 'mistyrose': 0xffe4e1, 'moccasin': 0xffe4b5,
+    'navajowhite': 0xffdead, 'navy': 0x000080, 'oldlace': 0xfdf5e6, 'olive': 0x808000,
+    'olivedrab': 0x6b8e23, 'orange': 0xffa500, 'orangered': 0xff4500, 'orchid': 0xda70d6,
+    'palegoldenrod': 0xeee8aa, 'palegreen': 0x98fb98, 'paleturquoise': 0xafeeee,
+    'palevioletred': 0xdb7093, 'papayawhip': 0xffefd5, 'peachpuff': 0xffdab9, 'peru': 0xcd853f,
+    'pink': 0xffc0cb, 'plum': 0xdda0dd, 'powderblue': 0xb0e0e6, 'purple': 0x800080,
+    'rebeccapurple': 0x663399, 'red': 0xff0000, 'rosybrown': 0xbc8f8f, 'royalblue': 0x4169e1,
+    'saddlebrown': 0x8b4513, 'salmon': 0xfa8072, 'sandybrown': 0xf4a460, 'seagreen': 0x2e8b57,
+    'seashell': 0xfff5ee, 'sienna': 0xa0522d, 'silver': 0xc0c0c0, 'skyblue': 0x87ceeb,
+    'slateblue': 0x6a5acd, 'slategray': 0x708090, 'slategrey': 0x708090, 'snow': 0xfffafa,
+    'springgreen': 0x00ff7f, 'steelblue': 0x4682b4, 'tan': 0xd2b48c, 'teal': 0x008080,
+    'thistle': 0xd8bfd8, 'tomato': 0xff6347, 'turquoise': 0x40e0d0, 'violet': 0xee82ee,
+    'wheat': 0xf5deb3, 'white': 0xffffff, 'whitesmoke': 0xf5f5f5, 'yellow': 0xffff00,
+    'yellowgreen': 0x9acd32,
+}
+
+# Functional color notation: rgb(), rgba(), hsl(), hsla()
+COLOR_FUNCTION = r'(?<![\w-])(?:rgba?|hsla?)\([^()]*\)'
+NAMED_COLOR = r'(?<![\w-])(?:transparent|' + '|'.join(
+    sorted(NAMED_COLORS, key=len, reverse=True)) + r')(?![\w-])'
+
+_FUNCTION = re.compile(r'(rgba?|hsla?)\(\s*(.*?)\s*\)$', re.IGNORECASE | re.DOTALL)
+_SEPARATOR = re.compile(r'\s*[,/]\s*|\s+')
+_NUMBER = re.compile(r'([+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)(%|deg|rad|grad|turn)?$',
+                     re.IGNORECASE)
+_ANGLE_TO_TURNS = {None: 1 / 360, 'deg': 1 / 360, 'rad': 1 / (2 * math.pi), 'grad': 1 / 400, 'turn': 1}
+
+
+def _clamp(value):
+    return min(max(int(round(value)), 0), 255)
+
+
+def _number(text):
+    """Parse a CSS number into (value, unit) or raise ValueError"""
+    if text.lower() == 'none':
+        return 0.0, None
+    match = _NUMBER.match(text)
+    if match is None:
+        raise ValueError(text)
+    unit = match.group(2)
+    return float(match.group(1)), unit.lower() if unit else None
+
+
+def _channel(text):
+    value, unit = _number(text)
+    if unit == '%':
+        return _clamp(value * 2.55)
+    if unit is not None:
+        raise ValueError(text)
+    return _clamp(value)
+
+
+def _alpha(text):
+    value, unit = _number(text)
+    if unit == '%':
+        value /= 100
+    elif unit is not None:
+        raise ValueError(text)
+    return _clamp(min(max(value, 0.0), 1.0) * 255)
+
+
+def _percent(text):
+    value, unit = _number(text)
+    if unit not in ('%', None):
+        raise ValueError(text)
+    return min(max(value / 100, 0.0), 1.0)
+
+
+def pack(red, green, blue, alpha=OPAQUE):
+    return (red << 24) | (green << 16) | (blue << 8) | alpha
+
+
+def unpack(key):
+    """Return (red, green, blue, alpha) of a packed key"""
+    return key >> 24, (key >> 16) & 0xff, (key >> 8) & 0xff, key & 0xff
+
+
+@lru_cache(maxsize=4096)
+def parse_color(text):
+    """Return the packed 0xRRGGBBAA key of a CSS color, or None"""
+    text = text.strip().lower()
+    if text.startswith('#'):
+        digits = text[1:]
+        if len(digits) not in (3, 4, 6, 8):
+            return None
+        try:
+            value = int(digits, 16)
+        except ValueError:
+            return None
+        if len(digits) <= 4:
+            # '#abc' -> '#aabbcc', '#abcd' -> '#aabbccdd'
+            digits = ''.join(digit * 2 for digit in digits)
+            value = int(digits, 16)
+        return value if len(digits) == 8 else (value << 8) | OPAQUE
+
+    if text == 'transparent':
+        return 0
+    if text in NAMED_COLORS:
+        return (NAMED_COLORS[text] << 8) | OPAQUE
+
+    match = _FUNCTION.match(text)
+    if match is None:
+        return None
+    args = [arg for arg in _SEPARATOR.split(match.group(2)) if arg]
+    if len(args) not in (3, 4):
+        return None
+    try:
+        alpha = _alpha(args[3]) if len(args) == 4 else OPAQUE
+        if match.group(1).startswith('rgb'):
+            return pack(_channel(args[0]), _channel(args[1]), _channel(args[2]), alpha)
+        hue, unit = _number(args[0])
+        if unit == '%':
+            return None
+        hue = (hue * _ANGLE_TO_TURNS[unit]) % 1.0
+        red, green, blue = colorsys.hls_to_rgb(hue, _percent(args[2]), _percent(args[1]))
+        return pack(_clamp(red * 255), _clamp(green * 255), _clamp(blue * 255), alpha)
+    except ValueError:
+        return None
+
+
+def format_color(key):
+    """Shortest canonical CSS spelling of a packed key"""
+    red, green, blue, alpha = unpack(key)
+    if alpha == OPAQUE:
+        text = f'#{red:02x}{green:02x}{blue:02x}'
+        if all(text[i] == text[i + 1] for i in (1, 3, 5)):
+            text = '#' + text[1] + text[3] + text[5]
+        return text
+    return f'rgba({red}, {green}, {blue}, {round(alpha / 255, 3):g})'
@@ -0,0 +1,149 @@
+"""
+sRGB <-> OKLab / OKLCH / CIELAB conversions
+
+Scalar functions work on (r, g, b) triples of 0-255 channels. The
+*_array variants take an (n, 3) NumPy array and convert a whole palette
+in one vectorized batch; they are only usable when NumPy is installed.
+NumPy is imported on first use (numpy()), not when the converters start.
+"""
+
+import math
+
+_numpy = False
+
+# sRGB (linear) -> LMS, and cube-rooted LMS -> OKLab (Björn Ottosson)
+_RGB_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_OKLAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_OKLAB_TO_LMS = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+_LMS_TO_RGB = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+_RGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+_WHITE = (0.95047, 1.0, 1.08883)
+
+
+def numpy():
+    """The numpy module, or None when it is not installed; imported on the first call"""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - optional dependency
+            np = None
+        _numpy = np
+    return _numpy
+
+
+def _mul(matrix, vector):
+    return tuple(sum(m * v for m, v in zip(row, vector)) for row in matrix)
+
+
+def _to_linear(channel):
+    channel /= 255.0
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _from_linear(channel):
+    channel = channel * 12.92 if channel <= 0.0031308 else 1.055 * channel ** (1 / 2.4) - 0.055
+    return min(max(int(round(channel * 255)), 0), 255)
+
+
+def _cbrt(value):
+    return math.copysign(abs(value) ** (1 / 3), value)
+
+
+def rgb_to_oklab(rgb):
+    """OKLab (L in 0-1) of an (r, g, b) triple"""
+    lms = _mul(_RGB_TO_LMS, [_to_linear(c) for c in rgb])
+    return _mul(_LMS_TO_OKLAB, [_cbrt(c) for c in lms])
+
+
+def oklab_to_rgb(lab):
+    """(r, g, b) triple of an OKLab color, clipped to the sRGB gamut"""
+    lms = [c ** 3 for c in _mul(_OKLAB_TO_LMS, lab)]
+    return tuple(_from_linear(c) for c in _mul(_LMS_TO_RGB, lms))
+
+
+def oklab_to_oklch(lab):
+    lightness, a, b = lab
+    return lightness, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360
+
+
+def oklch_to_oklab(lch):
+    lightness, chroma, hue = lch
+    hue = math.radians(hue)
+    return lightness, chroma * math.cos(hue), chroma * math.sin(hue)
+
+
+def rgb_to_lab(rgb):
+    """CIELAB (D65) of an (r, g, b) triple"""
+    xyz = _mul(_RGB_TO_XYZ, [_to_linear(c) for c in rgb])
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = (f(c / w) for c, w in zip(xyz, _WHITE))
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _linear_array(rgb):
+    np = numpy()
+    rgb = rgb / 255.0
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def _from_linear_array(linear):
+    np = numpy()
+    linear = np.clip(linear, 0.0, 1.0)
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return np.clip(np.rint(srgb * 255), 0, 255).astype(int)
+
+
+def rgb_to_oklab_array(rgb):
+    np = numpy()
+    lms = _linear_array(rgb) @ np.array(_RGB_TO_LMS).T
+    return np.cbrt(lms) @ np.array(_LMS_TO_OKLAB).T
+
+
+def oklab_to_rgb_array(lab):
+    np = numpy()
+    lms = (lab @ np.array(_OKLAB_TO_LMS).T) ** 3
+    return _from_linear_array(lms @ np.array(_LMS_TO_RGB).T)
+
+
+def oklab_to_oklch_array(lab):
+    np = numpy()
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    hue = np.degrees(np.arctan2(lab[:, 2], lab[:, 1])) % 360
+    return np.stack([lab[:, 0], chroma, hue], axis=1)
+
+
+def oklch_to_oklab_array(lch):
+    np = numpy()
+    hue = np.radians(lch[:, 2])
+    return np.stack([lch[:, 0], lch[:, 1] * np.cos(hue), lch[:, 1] * np.sin(hue)], axis=1)
+
+
+def rgb_to_lab_array(rgb):
+    np = numpy()
+    xyz = (_linear_array(rgb) @ np.array(_RGB_TO_XYZ).T) / np.array(_WHITE)
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
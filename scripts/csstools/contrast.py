@@ -0,0 +1,303 @@
+"""
+Batch WCAG contrast auditing for every theme
+
+One tokenizer pass collects the theme variables (:root and
+[data-theme=...] blocks) and the foreground/background pair each rule
+sets. Every pair is resolved under every theme, translucent colors are
+composited, and all contrast ratios are computed in one batch (a NumPy
+array operation when it is installed, plain Python otherwise).
+
+A rule scoped to a theme ([data-theme="dark"] .card) is only checked
+under the themes its selector can match.
+
+A rule that sets only one side inherits the other from markup the
+stylesheet cannot see; with assume_defaults it is paired with the
+theme's page colors (--color-bg-body / --color-text-primary) instead.
+
+A fully transparent background shows whatever is behind the element.
+It is taken from the rule of the selector's ancestor ('.nav .btn' ->
+'.nav') when the stylesheet has one, and counted as unresolvable
+otherwise rather than composited over white.
+"""
+
+import re
+from collections import namedtuple
+
+from .colors import COLOR_FUNCTION, NAMED_COLOR, format_color, parse_color, unpack
+from .colorspace import numpy
+from .engine import HEX_TOKEN
+from .tokenizer import BLOCK_END, DECLARATION, SELECTOR, is_theme_selector, iter_rules, split_value
+from .usage import split_selectors
+
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+
+LIGHT = 'light'
+DEFAULT_BACKGROUND = '--color-bg-body'
+DEFAULT_TEXT = '--color-text-primary'
+
+BACKGROUND_PROPERTIES = ('background-color', 'background')
+MAX_VAR_DEPTH = 8
+
+_VAR = re.compile(r'var\(\s*(--[\w-]+)\s*(?:,\s*((?:[^()]|\([^()]*\))*))?\)')
+_COLOR = re.compile(HEX_TOKEN + '|' + COLOR_FUNCTION + '|' + NAMED_COLOR, re.IGNORECASE)
+_THEME_NAME = re.compile(r'\[data-theme\s*[~|^$*]?=\s*["\']?([\w-]+)')
+_NOT = re.compile(r':not\((?:[^()]|\([^()]*\))*\)')
+_FONT_SIZE = re.compile(r'^\s*([\d.]+)(px|rem|em|pt)\s*$', re.IGNORECASE)
+_FONT_UNITS = {'px': 1.0, 'rem': 16.0, 'em': 16.0, 'pt': 4 / 3}
+# The last compound of a selector and the descendant/child combinator before it
+_LAST_COMPOUND = re.compile(r'\s*>?\s*[^\s>+~]+$')
+
+# themes is the set of themes the selector can match, or None for all of them
+Pair = namedtuple('Pair', 'selector line foreground background large themes')
+Result = namedtuple('Result', 'selector line theme foreground background ratio required assumed')
+
+
+def _theme_name(selector):
+    match = _THEME_NAME.search(selector)
+    return match.group(1) if match else LIGHT
+
+
+def _selector_themes(selector):
+    """Themes a selector list can match, or None when one of its selectors matches every theme"""
+    themes = set()
+    for part in split_selectors(selector):
+        names = _THEME_NAME.findall(_NOT.sub('', part))
+        if not names:
+            return None
+        themes.update(names)
+    return themes
+
+
+def _scope(context, selector):
+    """Themes a rule nested in context can match (None: all)"""
+    themes = None
+    for part in context + [selector]:
+        scope = _selector_themes(part)
+        if scope is not None:
+            themes = scope if themes is None else themes & scope
+    return themes
+
+
+def _is_large(size, weight):
+    """WCAG large text: at least 24px, or 18.66px when bold"""
+    match = _FONT_SIZE.match(size or '')
+    if match is None:
+        return False
+    pixels = float(match.group(1)) * _FONT_UNITS[match.group(2).lower()]
+    bold = (weight or '').strip().lower() in ('bold', 'bolder', '600', '700', '800', '900')
+    return pixels >= 24 or (bold and pixels >= 18.66)
+
+
+def collect(tokens):
+    """
+    Return (variables, pairs) for a token stream: variables maps each
+    theme to its {custom property: value}, pairs lists the Pair of
+    every rule that sets a color or a background.
+    """
+    variables = {LIGHT: {}}
+    pairs = []
+    rules = []  # open rules: [depth, selector, line, properties]
+    line = 1
+
+    for context, token in iter_rules(tokens):
+        kind = token.kind
+        if kind == SELECTOR:
+            # Multi-line selectors are reported on one line
+            selector = ' '.join(' '.join(context + [token.name]).split())
+            rules.append([len(context) + 1, selector, line, {}, _scope(context, token.name)])
+        elif kind == DECLARATION:
+            if token.name.startswith('--'):
+                if len(context) == 1 and is_theme_selector(context[0]):
+                    variables.setdefault(_theme_name(context[0]), {})[token.name] = token.value
+            elif rules and rules[-1][0] == len(context):
+                rules[-1][3][token.name] = token.value
+        elif kind == BLOCK_END and rules and rules[-1][0] == len(context):
+            _, selector, start, properties, themes = rules.pop()
+            foreground = properties.get('color')
+            background = next((properties[name] for name in BACKGROUND_PROPERTIES if name in properties), None)
+            if foreground is not None or background is not None:
+                large = _is_large(properties.get('font-size'), properties.get('font-weight'))
+                pairs.append(Pair(selector, start, foreground, background, large, themes))
+        line += token.text.count('\n')
+    return variables, pairs
+
+
+def theme_variables(variables):
+    """Full variable set of every theme: themes override the light values"""
+    light = variables.get(LIGHT, {})
+    return {theme: dict(light, **values) for theme, values in variables.items()}
+
+
+def resolve_color(value, variables):
+    """
+    Packed color of a declaration value under one theme's variables, or
+    None when it cannot be known statically (inherit, currentColor, images).
+    Backgrounds resolve to their first color, e.g. a gradient's first stop.
+    """
+    if value is None:
+        return None
+    for _ in range(MAX_VAR_DEPTH):
+        if 'var(' not in value:
+            break
+        value = _VAR.sub(lambda match: variables.get(match.group(1), match.group(2) or ''), value)
+    for is_code, text in split_value(value):
+        if is_code:
+            match = _COLOR.search(text)
+            if match is not None:
+                return parse_color(match.group(0))
+    return None
+
+
+def _ancestor(selector):
+    """'.nav > .btn' -> '.nav'; None when the selector names no ancestor"""
+    if '(' in selector or '[' in selector:
+        return None
+    match = _LAST_COMPOUND.search(selector)
+    if match is None or not match.start() or selector[match.start() - 1] in '+~':
+        return None
+    ancestor = selector[:match.start()].strip()
+    return ancestor if ancestor and ancestor[-1] not in '+~' else None
+
+
+def resolve_background(selector, value, variables, backgrounds):
+    """
+    Packed background of a rule under one theme's variables. A fully
+    transparent one is looked up in backgrounds ({selector: value}) for
+    the nearest ancestor selector; None when none is found.
+    """
+    colors = set()
+    for part in split_selectors(selector):
+        part = part.strip()
+        color = resolve_color(value, variables)
+        while color is not None and not color & 0xff:
+            part = _ancestor(part)
+            color = resolve_color(backgrounds.get(part), variables) if part else None
+        colors.add(color)
+    return colors.pop() if len(colors) == 1 else None
+
+
+def _luminance(channel):
+    channel /= 255.0
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _over(top, bottom):
+    """Composite the (r, g, b, a) color top over the opaque bottom"""
+    alpha = top[3] / 255
+    return tuple(t * alpha + b * (1 - alpha) for t, b in zip(top[:3], bottom[:3])) + (255,)
+
+
+def contrast_ratios(foregrounds, backgrounds, pages):
+    """
+    WCAG contrast ratio of each packed foreground over its background,
+    with translucent backgrounds composited over the page color (itself
+    over white) and translucent foregrounds over the result.
+    """
+    if not foregrounds:
+        return []
+    np = numpy()
+    if np is not None:
+        def rgba(keys):
+            keys = np.asarray(keys, dtype=np.uint32)
+            return np.stack([(keys >> shift) & 0xff for shift in (24, 16, 8, 0)], axis=1).astype(float)
+
+        def over(top, bottom):
+            alpha = top[:, 3:] / 255
+            return top[:, :3] * alpha + bottom * (1 - alpha)
+
+        def luminance(rgb):
+            rgb = rgb / 255.0
+            linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+            return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+        page = over(rgba(pages), np.full(3, 255.0))
+        background = over(rgba(backgrounds), page)
+        foreground = over(rgba(foregrounds), background)
+        first, second = luminance(foreground), luminance(background)
+        ratios = (np.maximum(first, second) + 0.05) / (np.minimum(first, second) + 0.05)
+        return ratios.tolist()
+
+    ratios = []
+    white = (255, 255, 255, 255)
+    for foreground, background, page in zip(foregrounds, backgrounds, pages):
+        page = _over(unpack(page), white)
+        background = _over(unpack(background), page)
+        foreground = _over(unpack(foreground), background)
+        first, second = (sum(w * _luminance(c) for w, c in zip((0.2126, 0.7152, 0.0722), color[:3]))
+                         for color in (foreground, background))
+        ratios.append((max(first, second) + 0.05) / (min(first, second) + 0.05))
+    return ratios
+
+
+def audit(tokens, min_ratio=AA_NORMAL, large_ratio=AA_LARGE, assume_defaults=False, themes=None):
+    """
+    Audit every rule under every theme.
+    Returns (results, skipped): results lists a Result for each resolved
+    pair, worst ratio relative to its requirement first; skipped counts
+    the pairs that could not be resolved statically.
+    """
+    variables, pairs = collect(tokens)
+    resolved = theme_variables(variables)
+    if themes:
+        resolved = {theme: resolved[theme] for theme in themes if theme in resolved}
+
+    rows = []
+    skipped = 0
+    for theme, values in resolved.items():
+        page_background = resolve_color(values.get(DEFAULT_BACKGROUND), values)
+        page_text = resolve_color(values.get(DEFAULT_TEXT), values)
+        backgrounds = {part.strip(): pair.background for pair in pairs
+                       if pair.background and (pair.themes is None or theme in pair.themes)
+                       for part in split_selectors(pair.selector)}
+        for pair in pairs:
+            if pair.themes is not None and theme not in pair.themes:
+                continue
+            assumed = pair.foreground is None or pair.background is None
+            if assumed and not assume_defaults:
+                continue
+            foreground = resolve_color(pair.foreground, values) if pair.foreground else page_text
+            background = (resolve_background(pair.selector, pair.background, values, backgrounds)
+                          if pair.background else page_background)
+            if foreground is None or background is None or page_background is None:
+                skipped += 1
+                continue
+            rows.append((pair, theme, foreground, background, page_background, assumed))
+
+    ratios = contrast_ratios([row[2] for row in rows], [row[3] for row in rows], [row[4] for row in rows])
+    results = []
+    for (pair, theme, foreground, background, _, assumed), ratio in zip(rows, ratios):
+        required = large_ratio if pair.large else min_ratio
+        results.append(Result(pair.selector, pair.line, theme, format_color(foreground),
+                              format_color(background), ratio, required, assumed))
+    results.sort(key=lambda result: (result.ratio / result.required, result.line, result.theme))
+    return results, skipped
+
+
+def failures(results):
+    return [result for result in results if result.ratio < result.required]
+
+
+def format_results(results, skipped, limit=None):
+    """Human-readable lines for audit() results: the failures, worst first"""
+    failed = failures(results)
+    themes = sorted({result.theme for result in results})
+    lines = [f"Contrast audit ({', '.join(themes) or 'no themes'}): {len(results)} pairs checked, "
+             f"{len(failed)} below WCAG AA, {skipped} unresolvable"]
+    for result in failed[:limit]:
+        note = ' (assumed)' if result.assumed else ''
+        lines.append(f"  {result.ratio:5.2f}:1 < {result.required:g}  [{result.theme}] line {result.line}: "
+                     f"{result.selector}  {result.foreground} on {result.background}{note}")
+    if limit is not None and len(failed) > limit:
+        lines.append(f"  ... {len(failed) - limit} more")
+    return lines
+
+
+def results_to_json(results, skipped):
+    failed = failures(results)
+    return {
+        'checked': len(results),
+        'failed': len(failed),
+        'unresolvable': skipped,
+        'failures': [dict(result._asdict(), ratio=round(result.ratio, 2)) for result in failed],
+    }
@@ -0,0 +1,229 @@
+"""
+Token-driven color conversion
+
+Colors are only rewritten inside declaration values, outside comments,
+strings and url(...). Selectors, comments and the custom properties of
+the theme blocks (:root, [data-theme=...]) pass through untouched.
+
+convert_css() does not tokenize what it does not have to: one scan with
+the replacer's pattern finds the color literals the palette rewrites,
+split_top_level() finds the top-level statements holding them, and every
+other statement is copied as it is (the mmap path does the same on
+bytes). A statement that is a plain rule, or @media/@supports blocks of
+them (no string, escape or url(), comments only ahead of declarations),
+has its hits checked against its declarations directly; any other
+statement goes through the tokenizer.
+"""
+
+import re
+from collections import Counter
+
+from .colors import parse_color
+from .tokenizer import (DECLARATION, RULE_BLOCK_AT_RULES, is_theme_selector, iter_rules, split_top_level,
+                        split_value, tokenize)
+
+# What the plain-rule path leaves to the tokenizer
+_NOT_PLAIN = re.compile(r'["\'\\]|url\(|\([^()]*[;{}]', re.IGNORECASE)
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_LEADING = re.compile(r'(?:\s|/\*.*?\*/)*', re.DOTALL)
+_AT_NAME = re.compile(r'@([-\w]+)')
+# The comment render_prelude() opens the theme blocks with
+_BANNER = re.compile(r'/\* =+\n[^\n]*\n *=+ \*/\n')
+
+
+def replace_value(value, replacer, counts=None):
+    """Rewrite the colors of one declaration value"""
+    parts = []
+    for is_code, text in split_value(value):
+        parts.append(replacer.replace(text, counts) if is_code else text)
+    return ''.join(parts)
+
+
+def _rewrites(tokens, replacer, counts=None):
+    """Yield (token, converted text or None when unchanged) for each token"""
+    for context, token in iter_rules(tokens):
+        if token.kind == DECLARATION:
+            in_theme = token.name.startswith('--') and context and is_theme_selector(context[-1])
+            if not in_theme:
+                value = replace_value(token.value, replacer, counts)
+                if value != token.value:
+                    yield token, token.head + value + token.tail
+                    continue
+        yield token, None
+
+
+def convert_tokens(tokens, replacer, counts=None):
+    """Yield the output text for each token, converting declaration values"""
+    for token, text in _rewrites(tokens, replacer, counts):
+        yield token.text if text is None else text
+
+
+def convert_spans(tokens, replacer, counts=None):
+    """
+    Yield (start, end, text) for every declaration convert_tokens() would
+    rewrite, as character offsets into the input, in input order.
+    """
+    position = 0
+    for token, text in _rewrites(tokens, replacer, counts):
+        end = position + len(token.text)
+        if text is not None:
+            yield position, end, text
+        position = end
+
+
+def changing_hits(content, replacer):
+    """(start, end, key, value) of the color literals of content that the replacer rewrites, wherever they are"""
+    values = replacer.values
+    hits = []
+    for match in replacer.pattern.finditer(content):
+        token = match.group(0)
+        key = parse_color(token)
+        value = values.get(key)
+        if value is not None and value != token:
+            hits.append((match.start(), match.end(), key, value))
+    return hits
+
+
+def _blank_comments(text):
+    """text with every comment replaced by as many spaces"""
+    return _COMMENT.sub(lambda match: ' ' * len(match.group(0)), text) if '/*' in text else text
+
+
+def _convert_plain(piece, offset, hits, replacer, counts):
+    """
+    Convert a top-level statement holding hits (offsets into the whole
+    text; piece starts at offset) when it is a plain rule, or a
+    rule-holding at-rule (@media, @supports, ...) of plain rules; None
+    when the tokenizer has to do it. Comments may stand between
+    statements, not inside one.
+    """
+    if _NOT_PLAIN.search(piece):
+        return None
+    masked = _blank_comments(piece)
+    if '/*' in masked:
+        return None  # unterminated
+    # Tallied apart, as a nested rule can still hand the whole statement to the tokenizer
+    tally = None if counts is None else Counter()
+    converted = _plain(piece, masked, offset, hits, replacer, tally)
+    if converted is not None and counts is not None:
+        counts.update(tally)
+    return converted
+
+
+def _plain(piece, masked, offset, hits, replacer, counts):
+    lead = _LEADING.match(piece).end()
+    brace = masked.find('{')
+    if brace < 0 or not masked.rstrip().endswith('}'):
+        return None
+    if piece.startswith('@', lead):
+        match = _AT_NAME.match(piece, lead)
+        if match is None or match.group(1).lower() not in RULE_BLOCK_AT_RULES:
+            return None
+        # Hits in the prelude stay; the block is plain rules split like the top level
+        close = masked.rindex('}')
+        parts = [piece[:brace + 1]]
+        index = 0
+        start = brace + 1
+        for inner in split_top_level(piece[brace + 1:close]):
+            end = start + len(inner)
+            first = index
+            while index < len(hits) and hits[index][0] - offset < end:
+                index += 1
+            inside = [hit for hit in hits[first:index] if hit[0] - offset >= start]
+            if inside:
+                inner = _plain(inner, masked[start:end], offset + start, inside, replacer, counts)
+                if inner is None:
+                    return None
+            parts.append(inner)
+            start = end
+        parts.append(piece[close:])
+        return ''.join(parts)
+
+    if '@' in masked or masked.find('{', brace + 1) >= 0:
+        return None
+    if '/*' in piece[brace:]:
+        for match in _COMMENT.finditer(piece, brace):
+            statement = max(masked.rfind(';', brace, match.start()), brace) + 1
+            if _LEADING.match(piece, statement).end() < match.end():
+                return None
+    theme = is_theme_selector(piece[lead:brace].strip())
+    parts = []
+    copied = 0
+    for start, end, key, value in hits:
+        start -= offset
+        if start < brace or masked[start] != piece[start]:
+            continue  # in the selector (#fff), or in a comment between declarations
+        statement = max(masked.rfind(';', brace, start), brace) + 1
+        colon = masked.find(':', statement, start)
+        if colon < 0:
+            continue
+        if theme and piece.startswith('--', _LEADING.match(piece, statement).end()):
+            continue
+        parts.append(piece[copied:start])
+        parts.append(value)
+        copied = end - offset
+        if counts is not None:
+            counts[replacer.names[key]] += 1
+    parts.append(piece[copied:])
+    return ''.join(parts)
+
+
+def prelude_length(text, prelude, complete=True):
+    """
+    Length of the theme blocks an earlier run wrote at the start of text:
+    an in-place run reads its own output, and replaces them rather than
+    adding another copy. These are prelude itself, or the banner-led
+    :root / [data-theme] blocks of an earlier palette; 0 when text starts
+    with neither. With complete=False text is only the start of the input,
+    and None means more of it is needed to tell.
+    """
+    if not prelude:
+        return 0
+    if not complete and len(text) < len(prelude):
+        return None
+    if text.startswith(prelude):
+        return len(prelude)
+    if not _BANNER.match(text):
+        return 0
+    end = 0
+    for piece in split_top_level(text):
+        body = _COMMENT.sub('', piece).strip()
+        brace = body.find('{')
+        if brace <= 0 or not body.endswith('}') or not is_theme_selector(body[:brace].strip()):
+            if not complete and end + len(piece) == len(text):
+                return None
+            break
+        end += len(piece)
+    else:
+        if not complete:
+            return None
+    # render_prelude() ends the last block with a blank line
+    return end + 2 if text.startswith('\n\n', end) else end
+
+
+def convert_css(content, replacer, counts=None, inline=False):
+    """Convert a whole stylesheet (or an inline declaration list) held in memory"""
+    if inline:
+        return ''.join(convert_tokens(tokenize(content, inline=True), replacer, counts))
+    hits = changing_hits(content, replacer)
+    if not hits:
+        return content
+    parts = []
+    index = start = 0
+    for piece in split_top_level(content):
+        end = start + len(piece)
+        if hits[index][0] < end:
+            first = index
+            while index < len(hits) and hits[index][0] < end:
+                index += 1
+            converted = _convert_plain(piece, start, hits[first:index], replacer, counts)
+            if converted is None:
+                converted = ''.join(convert_tokens(tokenize(piece), replacer, counts))
+            parts.append(converted)
+        else:
+            parts.append(piece)
+        start = end
+        if index == len(hits):
+            break
+    parts.append(content[start:])
+    return ''.join(parts)
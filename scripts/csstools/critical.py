@@ -0,0 +1,415 @@
+"""
+Per-page critical CSS extraction for the EJS views
+
+Each top-level template is rendered statically: includes are inlined,
+every other <% %> tag is dropped (both branches of a condition are kept)
+and the markup is parsed into an element tree. The first `fold` visible
+elements in document order stand in for the first screen; a selector is
+critical when it matches one of them. Elements are invisible when they
+are hidden by attribute, inline style or a plain '.name { display: none }'
+rule of the stylesheet (modals, dropdown menus).
+
+Matching is a superset: attribute selectors, structural pseudo-classes
+and :not()/:is() arguments are assumed to match, since the runtime DOM
+(e.g. data-theme on <html>) is unknown. Interaction states such as
+:hover or :focus cannot affect the first paint and are left deferred.
+
+The inline critical rules come before the shared stylesheet, which is
+loaded whole without blocking: one cacheable file for every page. Each
+critical rule reappears in it after the inline copy, so once it loads
+the cascade is exactly that of the original.
+"""
+
+import os
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+
+from .prune import KEYFRAMES, filter_rules
+from .tokenizer import AT_RULE, BLOCK_END, DECLARATION, SELECTOR, iter_rules
+from .usage import split_selectors
+
+DEFAULT_FOLD = 200
+DEFAULT_VIEWS = 'views'
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+})
+# Content that is never rendered as elements
+RAW_ELEMENTS = frozenset({'script', 'style', 'template', 'noscript'})
+CONTAINERS = frozenset({'div', 'section', 'nav', 'aside', 'dialog', 'ul', 'ol', 'form'})
+INTERACTION_STATES = frozenset({
+    'hover', 'focus', 'focus-within', 'focus-visible', 'active', 'visited', 'target',
+})
+# Written with one colon for compatibility, counted as pseudo-elements
+LEGACY_PSEUDO_ELEMENTS = frozenset({'before', 'after', 'first-line', 'first-letter'})
+# Pseudo-classes that take the specificity of their most specific argument
+SELECTOR_ARGUMENTS = frozenset({'not', 'is', 'has', 'matches', '-webkit-any', '-moz-any'})
+
+_INCLUDE = re.compile(r'''<%-\s*include\(\s*["']([^"']+)["'][^%]*%>''')
+_EJS = re.compile(r'<%.*?%>', re.DOTALL)
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_HIDDEN_STYLE = re.compile(r'display\s*:\s*none', re.IGNORECASE)
+_NAME_SELECTOR = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)$')
+
+_COMBINATOR = re.compile(r'\s*([>+~])\s*|\s+')
+_SIMPLE = re.compile(r'''
+    (?P<kind>\.|\#|::?|)(?P<name>-?[_a-zA-Z*][\w-]*|\*)(?P<args>\((?:[^()]|\([^()]*\))*\))?
+    | (?P<attribute>\[[^\]]*\])
+''', re.VERBOSE)
+_IMPORTANT = re.compile(r'!\s*important\s*$', re.IGNORECASE)
+
+# One style rule of the stylesheet: the index of its selector token, its
+# selectors as (specificity, subject) and {property: !important}
+StyleRule = namedtuple('StyleRule', 'index selectors properties')
+
+
+class Element:
+    __slots__ = ('tag', 'id', 'classes', 'parent', 'children')
+
+    def __init__(self, tag, attrs, parent):
+        attrs = dict(attrs)
+        self.tag = tag
+        self.id = attrs.get('id') or None
+        self.classes = frozenset((attrs.get('class') or '').split())
+        self.parent = parent
+        self.children = []
+
+    def previous_siblings(self):
+        if self.parent is None:
+            return []
+        siblings = self.parent.children
+        return reversed(siblings[:siblings.index(self)])
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self, hidden_classes=frozenset(), hidden_ids=frozenset()):
+        super().__init__(convert_charrefs=True)
+        self.hidden_classes = hidden_classes
+        self.hidden_ids = hidden_ids
+        self.root = Element('#document', (), None)
+        self.stack = [self.root]
+        self.visible = []  # body elements in document order, hidden subtrees excluded
+        self.hidden = 0
+        self.in_body = False
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, attrs, self.stack[-1])
+        self.stack[-1].children.append(element)
+        if tag == 'body':
+            self.in_body = True
+        attributes = dict(attrs)
+        hidden = (tag in RAW_ELEMENTS or 'hidden' in attributes
+                  or _HIDDEN_STYLE.search(attributes.get('style') or '')
+                  or (attributes.get('aria-hidden') == 'true' and tag in CONTAINERS)
+                  or element.id in self.hidden_ids or not element.classes.isdisjoint(self.hidden_classes))
+        if self.in_body and not self.hidden and not hidden:
+            self.visible.append(element)
+        if tag in VOID_ELEMENTS:
+            return
+        if self.hidden or hidden:
+            self.hidden += 1
+        self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                for _ in range(len(self.stack) - depth):
+                    self.stack.pop()
+                    if self.hidden:
+                        self.hidden -= 1
+                return
+
+
+def _include_path(template, name):
+    target = os.path.normpath(os.path.join(os.path.dirname(template), name))
+    return target if target.endswith('.ejs') else target + '.ejs'
+
+
+def included_templates(path, seen=None):
+    """The template and every template it includes, transitively"""
+    seen = set() if seen is None else seen
+    seen.add(os.path.normpath(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    for match in _INCLUDE.finditer(content):
+        target = _include_path(path, match.group(1))
+        if target not in seen and os.path.isfile(target):
+            included_templates(target, seen)
+    return seen
+
+
+def render_template(path, seen=()):
+    """Static markup of an EJS template: includes inlined, other tags dropped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    def include(match):
+        target = _include_path(path, match.group(1))
+        if target in seen or not os.path.isfile(target):
+            return ''
+        return render_template(target, seen + (target,))
+
+    content = _INCLUDE.sub(include, content)
+    return _COMMENT.sub('', _EJS.sub('', content))
+
+
+def hidden_by_default(tokens):
+    """
+    Return the (classes, ids) that a top-level '.name { display: none }'
+    or '#name { ... }' rule hides until a script or a state shows them,
+    such as modals and dropdown menus.
+    """
+    classes = set()
+    ids = set()
+    for context, token in iter_rules(tokens):
+        if (token.kind == DECLARATION and len(context) == 1 and token.name == 'display'
+                and token.value.strip().lower() == 'none'):
+            for selector in split_selectors(context[0]):
+                match = _NAME_SELECTOR.match(selector.strip())
+                if match is not None:
+                    (classes if match.group(1) == '.' else ids).add(match.group(2))
+    return frozenset(classes), frozenset(ids)
+
+
+def parse_markup(markup, hidden=(frozenset(), frozenset())):
+    """Return (root element, visible body elements in document order)"""
+    builder = _TreeBuilder(*hidden)
+    builder.feed(markup)
+    builder.close()
+    return builder.root, builder.visible
+
+
+def parse_selector(selector):
+    """
+    Split a comma-free selector into [(combinator, compound)] from left
+    to right, each compound a (tag, id, classes, deferred) tuple, or
+    return None when the selector cannot match at first paint.
+    """
+    parts = []
+    combinator = ' '
+    pos = 0
+    selector = selector.strip()
+    while pos < len(selector):
+        tag = element_id = None
+        classes = []
+        start = pos
+        while pos < len(selector):
+            match = _SIMPLE.match(selector, pos)
+            if match is None or match.end() == pos:
+                break
+            pos = match.end()
+            kind, name = match.group('kind'), match.group('name')
+            if match.group('attribute') or name is None:
+                continue
+            if kind == '.':
+                classes.append(name)
+            elif kind == '#':
+                element_id = name
+            elif kind == ':' and name.lower() in INTERACTION_STATES:
+                return None
+            elif kind == '' and name != '*':
+                tag = name.lower()
+        if pos == start:
+            # Anything unparsed is assumed to match
+            pos += 1
+            continue
+        parts.append((combinator, (tag, element_id, frozenset(classes))))
+        match = _COMBINATOR.match(selector, pos)
+        if match is not None and match.end() > pos:
+            combinator = match.group(1) or ' '
+            pos = match.end()
+    return parts
+
+
+def _compound_matches(compound, element):
+    tag, element_id, classes = compound
+    return ((tag is None or element.tag == tag)
+            and (element_id is None or element.id == element_id)
+            and classes <= element.classes)
+
+
+def _matches(parts, index, element):
+    combinator, compound = parts[index]
+    if not _compound_matches(compound, element):
+        return False
+    if index == 0:
+        return True
+    if combinator == '>':
+        return element.parent is not None and _matches(parts, index - 1, element.parent)
+    if combinator in '+~':
+        for sibling in element.previous_siblings():
+            if _matches(parts, index - 1, sibling):
+                return True
+            if combinator == '+':
+                return False
+        return False
+    ancestor = element.parent
+    while ancestor is not None:
+        if _matches(parts, index - 1, ancestor):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+
+class Page:
+    """The first-screen elements of one rendered template"""
+
+    def __init__(self, markup, fold=DEFAULT_FOLD, hidden=(frozenset(), frozenset())):
+        self.root, visible = parse_markup(markup, hidden)
+        self.elements = visible[:fold]
+        self.by_class = {}
+        self.by_id = {}
+        for element in self.elements:
+            for name in element.classes:
+                self.by_class.setdefault(name, []).append(element)
+            if element.id:
+                self.by_id.setdefault(element.id, []).append(element)
+        self._cache = {}
+
+    def _candidates(self, compound):
+        tag, element_id, classes = compound
+        if element_id is not None:
+            return self.by_id.get(element_id, ())
+        if classes:
+            return self.by_class.get(next(iter(classes)), ())
+        return self.elements
+
+    def matches(self, selector):
+        """Whether a single selector matches a first-screen element"""
+        selector = selector.strip()
+        if selector not in self._cache:
+            parts = parse_selector(selector)
+            if parts is None:
+                result = False
+            elif not parts:
+                result = True
+            else:
+                result = any(_matches(parts, len(parts) - 1, element)
+                             for element in self._candidates(parts[-1][1]))
+            self._cache[selector] = result
+        return self._cache[selector]
+
+
+def page_templates(views=DEFAULT_VIEWS):
+    """Top-level templates: every .ejs outside the _-prefixed partial directories"""
+    templates = []
+    for directory, subdirectories, files in os.walk(views):
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('_'))
+        templates.extend(os.path.join(directory, name) for name in sorted(files)
+                         if name.endswith('.ejs') and not name.startswith('_'))
+    return templates
+
+
+def page_name(template, views=DEFAULT_VIEWS):
+    """'views/questions/question.ejs' -> 'questions-question'"""
+    relative = os.path.splitext(os.path.relpath(template, views))[0]
+    return relative.replace(os.sep, '-')
+
+
+def specificity(selector):
+    """(ids, classes, types) specificity of a single selector"""
+    ids = classes = types = 0
+    pos = 0
+    while pos < len(selector):
+        match = _SIMPLE.match(selector, pos)
+        if match is None or match.end() == pos:
+            pos += 1
+            continue
+        pos = match.end()
+        if match.group('attribute'):
+            classes += 1
+            continue
+        kind, name = match.group('kind'), match.group('name').lower()
+        if kind == '#':
+            ids += 1
+        elif kind == '.':
+            classes += 1
+        elif kind == '::' or (kind == ':' and name in LEGACY_PSEUDO_ELEMENTS):
+            types += 1
+        elif kind == ':' and name in SELECTOR_ARGUMENTS and match.group('args'):
+            inner = max(specificity(part) for part in split_selectors(match.group('args')[1:-1]))
+            ids, classes, types = ids + inner[0], classes + inner[1], types + inner[2]
+        elif kind == ':':
+            classes += name != 'where'
+        elif name != '*':
+            types += 1
+    return ids, classes, types
+
+
+def _subject(selector):
+    """
+    (tag, id, classes, pseudo-element) of the compound a selector applies
+    to; None where it has none
+    """
+    tag = element_id = pseudo = None
+    classes = []
+    pos = 0
+    selector = selector.strip()
+    while pos < len(selector):
+        match = _SIMPLE.match(selector, pos)
+        if match is None or match.end() == pos:
+            if selector[pos] in ' \t\r\n>+~':
+                tag = element_id = pseudo = None
+                classes = []
+            pos += 1
+            continue
+        pos = match.end()
+        kind, name = match.group('kind'), match.group('name')
+        if match.group('attribute') or name is None:
+            continue
+        if kind == '#':
+            element_id = name
+        elif kind == '.':
+            classes.append(name)
+        elif kind == '::' or (kind == ':' and name.lower() in LEGACY_PSEUDO_ELEMENTS):
+            pseudo = name.lower()
+        elif kind == '' and name != '*':
+            tag = name.lower()
+    return tag, element_id, frozenset(classes), pseudo
+
+
+def style_rules(tokens):
+    """The StyleRule of every rule in a token list (@keyframes steps excepted)"""
+    rules = []
+    stack = []  # open blocks: a StyleRule, an at-rule name, or None in @keyframes
+    in_keyframes = 0
+    for index, token in enumerate(tokens):
+        kind = token.kind
+        if kind == SELECTOR:
+            rule = None
+            if not in_keyframes:
+                selectors = [(specificity(part), _subject(part)) for part in split_selectors(token.name)]
+                rule = StyleRule(index, selectors, {})
+                rules.append(rule)
+            stack.append(rule)
+        elif kind == AT_RULE and token.text.endswith('{'):
+            in_keyframes += token.name in KEYFRAMES
+            stack.append(token.name)
+        elif kind == BLOCK_END and stack:
+            block = stack.pop()
+            if isinstance(block, str) and block in KEYFRAMES:
+                in_keyframes -= 1
+        elif kind == DECLARATION and stack and isinstance(stack[-1], StyleRule):
+            stack[-1].properties[token.name.lower()] = bool(_IMPORTANT.search(token.value))
+    return rules
+
+
+def critical_css(tokens, page):
+    """The rules of a token list that a Page needs for its first screen"""
+    critical, _, _ = filter_rules(tokens, page.matches, extras=False)
+    return critical.strip() + '\n'
+
+
+def render_partial(critical, href):
+    """EJS partial inlining the critical CSS and loading href without blocking"""
+    return (f'<style>\n{critical}</style>\n'
+            f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>\n')
+
@@ -0,0 +1,159 @@
+"""
+Unified diffs built from replacement spans
+
+The converters know exactly which parts of the input they rewrite, so a
+preview does not need to compare the old and new text line by line.
+span_diff() takes the (start, end, text) spans recorded during the
+conversion pass, maps them to line ranges of the original with a
+bisect over the line offsets and formats only those lines (plus
+context) as a unified diff. The cost is proportional to the number of
+changes, not to the size of the file.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+
+from .convert import convert_spans, prelude_length
+from .tokenizer import tokenize
+
+DEFAULT_CONTEXT = 3
+NO_NEWLINE = '\\ No newline at end of file\n'
+
+# Lines first..last (exclusive) of the original become new_lines
+Change = namedtuple('Change', 'first last new_lines')
+
+
+def line_starts(text):
+    """Offsets at which each line of text starts (none for empty text)"""
+    if not text:
+        return []
+    starts = [0]
+    find = text.find
+    position = find('\n')
+    while position != -1 and position + 1 < len(text):
+        starts.append(position + 1)
+        position = find('\n', position + 1)
+    return starts
+
+
+def _changes(text, starts, spans):
+    """Merge spans, in input order, into Changes of whole original lines;
+    spans on the same or adjacent lines form one Change, as in difflib"""
+    def line_of(offset):
+        return bisect_right(starts, min(offset, len(text) - 1)) - 1
+
+    group = []
+    first = last = None
+    for start, end, replacement in spans:
+        at_line_start = start == len(text) or start == starts[line_of(start)]
+        if start == end and at_line_start and replacement.endswith('\n'):
+            # Whole lines inserted before a line (e.g. the prelude): nothing removed
+            span_first = span_last = line_of(start) if start < len(text) else len(starts)
+        else:
+            span_first = line_of(start)
+            span_last = line_of(max(start, end - 1)) + 1
+            if end < len(text) and text[end - 1] == '\n' and not replacement.endswith('\n'):
+                # The line break is replaced, so the next line joins this one
+                span_last += 1
+        if group and span_first <= last:
+            group.append((start, end, replacement))
+            last = max(last, span_last)
+            continue
+        if group:
+            yield _change(text, starts, first, last, group)
+        group = [(start, end, replacement)]
+        first, last = span_first, span_last
+    if group:
+        yield _change(text, starts, first, last, group)
+
+
+def _offset(text, starts, line):
+    return starts[line] if line < len(starts) else len(text)
+
+
+def _change(text, starts, first, last, spans):
+    position = _offset(text, starts, first)
+    parts = []
+    for start, end, replacement in spans:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:_offset(text, starts, last)])
+    return Change(first, last, ''.join(parts).splitlines(keepends=True))
+
+
+def _range(start, length):
+    # Same conventions as difflib.unified_diff
+    if length == 1:
+        return f'{start + 1}'
+    if not length:
+        return f'{start},0'
+    return f'{start + 1},{length}'
+
+
+def _line(prefix, line):
+    if line.endswith('\n'):
+        return [prefix + line]
+    return [prefix + line + '\n', NO_NEWLINE]
+
+
+def _hunk(text, starts, changes, offset, context):
+    """Lines of one hunk and the line count it adds"""
+    def old_lines(first, last):
+        lines = []
+        for index in range(first, last):
+            lines.append(text[starts[index]:_offset(text, starts, index + 1)])
+        return lines
+
+    old_start = max(0, changes[0].first - context)
+    old_end = min(len(starts), changes[-1].last + context)
+    added = sum(len(change.new_lines) - (change.last - change.first) for change in changes)
+    lines = [f'@@ -{_range(old_start, old_end - old_start)} '
+             f'+{_range(old_start + offset, old_end - old_start + added)} @@\n']
+    position = old_start
+    for change in changes:
+        for line in old_lines(position, change.first):
+            lines += _line(' ', line)
+        for line in old_lines(change.first, change.last):
+            lines += _line('-', line)
+        for line in change.new_lines:
+            lines += _line('+', line)
+        position = change.last
+    for line in old_lines(position, old_end):
+        lines += _line(' ', line)
+    return lines, added
+
+
+def span_diff(text, spans, from_file, to_file, context=DEFAULT_CONTEXT):
+    """Yield the unified diff lines of applying spans (sorted, non-overlapping) to text"""
+    starts = line_starts(text)
+    hunk = []
+    offset = 0  # line number shift of the new file before the current hunk
+    for change in _changes(text, starts, spans):
+        if not hunk:
+            if not offset:
+                yield f'--- {from_file}\n'
+                yield f'+++ {to_file}\n'
+        elif change.first - hunk[-1].last > 2 * context:
+            lines, added = _hunk(text, starts, hunk, offset, context)
+            yield from lines
+            offset += added
+            hunk = []
+        hunk.append(change)
+    if hunk:
+        yield from _hunk(text, starts, hunk, offset, context)[0]
+
+
+def dry_run(content, replacer, prelude='', from_file='a', to_file='b', counts=None, context=DEFAULT_CONTEXT):
+    """Unified diff lines of a converter run over content; nothing is written"""
+    spans = convert_spans(tokenize(content), replacer, counts)
+    # Theme blocks from an earlier run are replaced, as the converters do
+    skip = prelude_length(content, prelude)
+    if prelude and content[:skip] != prelude:
+        spans = _prepend((0, skip, prelude), (span for span in spans if span[0] >= skip))
+    return span_diff(content, spans, from_file, to_file, context)
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
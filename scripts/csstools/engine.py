@@ -0,0 +1,119 @@
+"""
+Single-pass color replacement engine
+
+All palette entries are folded into one compiled pattern. The text is
+scanned once and every hit is resolved with a dict lookup, so the cost
+of a run grows with the input size and not with the palette size.
+Palette keys and hits are both normalized to packed RGBA integers, so
+'#FFF', '#ffffff', 'rgb(255 255 255)' and 'rgba(255,255,255,1)' are one
+entry.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+
+from .colors import COLOR_FUNCTION, NAMED_COLOR, parse_color
+
+# Bump whenever a change to the engine or the conversion rules would
+# change the output for the same palette; cached results are keyed on it
+ENGINE_VERSION = 3
+
+# A hex color token: 3-8 hex digits not followed by another name character,
+# so '#fff' never matches inside '#fff3cd' or '#fff-banner'.
+HEX_TOKEN = r'(?<![\w-])#[0-9a-fA-F]{3,8}(?![\w-])'
+
+# HEX_TOKEN or COLOR_FUNCTION, spelled to lead with a literal character
+# class: the regex engine then skips straight to '#', 'r' and 'h' instead
+# of trying every alternative at every position, which scans several
+# times faster. The lookbehind checks the character before the lead one.
+COLOR_TOKEN = (r'[#rRhH](?<![\w-].)(?:(?<=#)[0-9a-fA-F]{3,8}(?![\w-])'
+               r'|(?<=[rR])[gG][bB][aA]?\([^()]*\)|(?<=[hH])[sS][lL][aA]?\([^()]*\))')
+
+
+class ColorReplacer:
+    """Replace palette colors with their mapped values in one scan"""
+
+    def __init__(self, color_map, literal_map=None, match_names=False):
+        # The maps are kept as given so the replacer can be rebuilt in workers
+        self.color_map = dict(color_map)
+        self.literal_map = dict(literal_map or {})
+        self.match_names = match_names
+
+        # packed color -> replacement, and packed color -> palette spelling for reports
+        self.values = {}
+        self.names = {}
+        for mapping in (self.color_map, self.literal_map):
+            for spelling, value in mapping.items():
+                key = parse_color(spelling)
+                if key is None:
+                    raise ValueError(f"Unparseable palette color: {spelling!r}")
+                self.values[key] = value
+                self.names.setdefault(key, spelling.lower())
+
+        self.pattern = self._compile_pattern(match_names)
+
+    @staticmethod
+    def _compile_pattern(match_names):
+        # Named colors are opt-in: words like 'tan' or 'red' also occur in
+        # font names, animation names and grid areas
+        if not match_names:
+            return re.compile(COLOR_TOKEN)
+        return re.compile('|'.join([HEX_TOKEN, COLOR_FUNCTION, NAMED_COLOR]), re.IGNORECASE)
+
+    @classmethod
+    def from_table(cls, entries, match_names=False):
+        """
+        Build a replacer from precompiled (key, spelling, value, literal)
+        entries, e.g. a cached palette artifact, without parsing any color.
+        """
+        replacer = cls.__new__(cls)
+        replacer.color_map = {}
+        replacer.literal_map = {}
+        replacer.match_names = match_names
+        replacer.values = {}
+        replacer.names = {}
+        for key, spelling, value, literal in entries:
+            (replacer.literal_map if literal else replacer.color_map)[spelling] = value
+            replacer.values[key] = value
+            replacer.names[key] = spelling
+        replacer.pattern = cls._compile_pattern(match_names)
+        return replacer
+
+    def __reduce__(self):
+        return ColorReplacer, (self.color_map, self.literal_map, self.match_names)
+
+    def fingerprint(self):
+        """Hash identifying the palette and engine version, for caching"""
+        payload = json.dumps([ENGINE_VERSION, self.match_names, sorted(self.values.items())])
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def resolve(self, token):
+        """Return the replacement for a color token, or None"""
+        return self.values.get(parse_color(token))
+
+    def replace(self, text, counts=None):
+        """
+        Replace every mapped color in text.
+        Hits are tallied per palette spelling into counts when given.
+        """
+        values = self.values
+
+        def substitute(match):
+            token = match.group(0)
+            key = parse_color(token)
+            value = values.get(key)
+            # Spelling normalizations are not counted when already canonical
+            if value is None or value == token:
+                return token
+            if counts is not None:
+                counts[self.names[key]] += 1
+            return value
+
+        return self.pattern.sub(substitute, text)
+
+    def replace_with_counts(self, text):
+        """Replace colors and return (result, Counter of hits per palette spelling)"""
+        counts = Counter()
+        return self.replace(text, counts), counts
@@ -0,0 +1,156 @@
+"""
+Theme linting in one tokenizer pass
+
+lint_css() walks the stylesheet once, in the same tokenizer pass the
+converters use, and reports:
+
+- missing-theme     a color variable of the :root block that a
+                    [data-theme=...] block does not define, so the theme
+                    keeps the light color (error)
+- theme-only        a variable only a [data-theme=...] block defines (warning)
+- undefined-var     var(--name) where --name is defined nowhere; a
+                    warning when the var() has a fallback
+- unconverted       a color literal the palette maps, i.e. one the
+                    converters should have rewritten (error)
+- literal           any other hex literal in a declaration value (warning)
+
+Literals are only looked for outside comments, strings and url(), and
+not in the theme blocks themselves. Translucent rgba()/hsla() colors
+outside the palette are left alone: the converters keep them on
+purpose.
+"""
+
+import re
+from collections import Counter, namedtuple
+
+from .colors import COLOR_FUNCTION, parse_color
+from .engine import HEX_TOKEN
+from .tokenizer import DECLARATION, is_theme_selector, iter_rules, split_value, tokenize
+
+ERROR = 'error'
+WARNING = 'warning'
+ROOT = 'root'
+
+_VALUE = re.compile(r'var\(\s*(--[\w-]+)\s*(,?)|(' + HEX_TOKEN + '|' + COLOR_FUNCTION + ')', re.IGNORECASE)
+_THEME_NAME = re.compile(r'\[data-theme\s*[~|^$*]?=\s*["\']?([\w-]+)')
+
+Issue = namedtuple('Issue', 'check severity line name message')
+
+
+def _theme(selector):
+    match = _THEME_NAME.search(selector)
+    return match.group(1) if match else ROOT
+
+
+def lint_css(content, replacer):
+    """Return (issues sorted by line, summary dict) for a stylesheet"""
+    themes = {ROOT: {}}       # theme -> {variable: offset}
+    defined = set()
+    references = []           # (offset, name, has_fallback)
+    literals = []             # (offset, literal)
+    colors = set()            # theme variables holding a color literal
+    selectors = {}            # selector -> theme name, or None outside theme blocks
+    offset = 0                # of the token; lines are only counted for what gets reported
+    for context, token in iter_rules(tokenize(content)):
+        kind = token.kind
+        if kind == DECLARATION:
+            name = token.name
+            theme = None
+            if context:
+                selector = context[-1]
+                if selector not in selectors:
+                    selectors[selector] = _theme(selector) if is_theme_selector(selector) else None
+                theme = selectors[selector]
+            in_theme = theme is not None
+            if name.startswith('--'):
+                defined.add(name)
+                if in_theme:
+                    themes.setdefault(theme, {})[name] = offset
+            value = token.value
+            if '(' in value or '#' in value:
+                for is_code, text in split_value(value):
+                    if not is_code:
+                        continue
+                    for match in _VALUE.finditer(text):
+                        if match.group(1):
+                            references.append((offset, match.group(1), bool(match.group(2))))
+                        elif in_theme and name.startswith('--'):
+                            colors.add(name)
+                        else:
+                            literals.append((offset, match.group(3)))
+            # Declaration.text would join the parts again
+            offset += len(token.head) + len(value) + len(token.tail)
+        else:
+            offset += len(token.text)
+
+    # Issues are built with offsets in place of lines
+    issues = []
+    root = themes.pop(ROOT)
+    for theme, variables in sorted(themes.items()):
+        for name, first in root.items():
+            # Other variables (spacing, fonts) are inherited from :root on purpose
+            if name not in variables and name in colors:
+                issues.append(Issue('missing-theme', ERROR, first, name,
+                                    f"{name} is defined in :root but not in the {theme} theme"))
+        for name, first in variables.items():
+            if name not in root:
+                issues.append(Issue('theme-only', WARNING, first, name,
+                                    f"{name} is defined by the {theme} theme only"))
+    for first, name, fallback in references:
+        if name not in defined:
+            issues.append(Issue('undefined-var', WARNING if fallback else ERROR, first, name,
+                                f"var({name}) refers to an undefined property"
+                                + (' (the fallback is used)' if fallback else '')))
+    for first, literal in literals:
+        value = replacer.values.get(parse_color(literal))
+        if value is not None:
+            if value.lower() != literal.lower():
+                issues.append(Issue('unconverted', ERROR, first, literal,
+                                    f"{literal} should be {value}"))
+        elif literal.startswith('#'):
+            issues.append(Issue('literal', WARNING, first, literal,
+                                f"{literal} is not in the palette and ignores the theme"))
+    issues.sort(key=lambda issue: (issue.line, issue.check))
+    lines = {}
+    line = 1
+    position = 0
+    for offset in sorted({issue.line for issue in issues}):
+        line += content.count('\n', position, offset)
+        lines[offset] = line
+        position = offset
+    issues = [issue._replace(line=lines[issue.line]) for issue in issues]
+
+    summary = {
+        'root_variables': len(root),
+        'theme_variables': {theme: len(variables) for theme, variables in sorted(themes.items())},
+        'references': len(references),
+        'literals': len(literals),
+    }
+    return issues, summary
+
+
+def lint_report(path, issues, summary, elapsed_ms):
+    """JSON-ready report of a lint run"""
+    severities = Counter(issue.severity for issue in issues)
+    return {
+        'file': path,
+        'elapsed_ms': round(elapsed_ms, 3),
+        'errors': severities[ERROR],
+        'warnings': severities[WARNING],
+        'checks': dict(sorted(Counter(issue.check for issue in issues).items())),
+        'summary': summary,
+        'issues': [issue._asdict() for issue in issues],
+    }
+
+
+def format_lint(report, limit=None):
+    """Human-readable lines for a lint_report() dict"""
+    lines = []
+    for issue in report['issues'][:limit]:
+        where = f"line {issue['line']}" if issue['line'] else 'file'
+        lines.append(f"  {issue['severity']:<7} {where}: {issue['message']} [{issue['check']}]")
+    if limit is not None and len(report['issues']) > limit:
+        lines.append(f"  ... {len(report['issues']) - limit} more")
+    lines.append(f"{report['file']}: {report['errors']} errors, {report['warnings']} warnings "
+                 f"in {report['elapsed_ms']:.1f} ms")
+    return lines
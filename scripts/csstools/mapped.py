@@ -0,0 +1,149 @@
+"""
+Memory-mapped conversion at the byte level
+
+For large inputs the file is mapped instead of read and decoded. A bytes
+pattern finds the color literals the palette would rewrite, a byte-level
+scanner finds the top-level statement boundaries (the same ones as
+tokenizer.split_top_level), and only the statements holding such a
+literal are decoded and converted. Everything else is copied from the
+map to the output as it is. UTF-8 keeps every structural character
+ASCII, so the boundaries found in bytes are those of the decoded text.
+
+Output goes through stream.open_output: a temp file moved into place,
+so an interrupted run never leaves a truncated stylesheet behind.
+"""
+
+import mmap
+import re
+
+from .colors import parse_color
+from .convert import convert_css, prelude_length
+from .stream import open_output
+
+_STRUCTURE = re.compile(rb'[{};()]|/\*.*?(?:\*/|\Z)|"(?:[^"\\]|\\.)*(?:"|\Z)|\'(?:[^\'\\]|\\.)*(?:\'|\Z)'
+                        rb'|\\(?:.|\Z)', re.DOTALL)
+_OPEN, _CLOSE, _PAREN_OPEN, _PAREN_CLOSE = b'{}()'
+
+# A superset of the engine's hex and rgb()/hsl() tokens, led by a literal
+# character class so the scan skips ahead quickly; statements holding a
+# false positive are merely converted for nothing
+_CANDIDATE = re.compile(rb'[#rhRH](?:(?<=#)[0-9a-fA-F]{3,8}(?![\w-])'
+                        rb'|(?<=[rR])[gG][bB][aA]?\([^()]*\)|(?<=[hH])[sS][lL][aA]?\([^()]*\))')
+
+
+def statement_ends(buf):
+    """
+    Yield the offset after each top-level statement of buf, matching
+    tokenizer.split_top_level: strings, comments, escapes and
+    parentheses are skipped and blocks nest.
+    """
+    depth = parens = 0
+    for match in _STRUCTURE.finditer(buf):
+        char = buf[match.start()]
+        if match.end() - match.start() > 1:
+            continue  # comment, string or escape
+        if char == _PAREN_OPEN:
+            parens += 1
+        elif char == _PAREN_CLOSE:
+            parens = max(parens - 1, 0)
+        elif parens:
+            continue
+        elif char == _OPEN:
+            depth += 1
+        else:
+            if char == _CLOSE:
+                depth = max(depth - 1, 0)
+            if depth == 0:
+                yield match.end()
+
+
+def _changing(buf, replacer):
+    """Offsets of the color literals in buf that the replacer rewrites"""
+    if replacer.match_names:
+        pattern = re.compile(replacer.pattern.pattern.encode('ascii'), re.IGNORECASE)
+    else:
+        pattern = _CANDIDATE
+    values = replacer.values
+    offsets = []
+    for match in pattern.finditer(buf):
+        token = match.group(0).decode('utf-8', 'replace')
+        value = values.get(parse_color(token))
+        if value is not None and value != token:
+            offsets.append(match.start())
+    return offsets
+
+
+def _prelude_size(buf, prelude):
+    """Bytes of the theme blocks an earlier in-place run wrote at the start of buf"""
+    if not prelude:
+        return 0
+    size = len(prelude.encode('utf-8'))
+    while True:
+        head = buf[:size].decode('utf-8', 'surrogateescape')
+        skip = prelude_length(head, prelude, complete=size >= len(buf))
+        if skip is not None:
+            return len(head[:skip].encode('utf-8', 'surrogateescape'))
+        size *= 2
+
+
+def convert_mapped(input_path, output_path, replacer, prelude='', counts=None):
+    """
+    Convert input_path into output_path through a memory map.
+    Returns a dict with the bytes 'read', 'written' and 'decoded', and the
+    number of 'statements' that were converted.
+    """
+    result = {'read': 0, 'written': 0, 'decoded': 0, 'statements': 0}
+    with open_output(output_path, binary=True) as target:
+        if prelude:
+            encoded = prelude.encode('utf-8')
+            target.write(encoded)
+            result['written'] += len(encoded)
+        with open(input_path, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return result  # an empty file cannot be mapped
+        with buf, memoryview(buf) as view:
+            result['read'] = len(buf)
+            # Replaced by prelude
+            skip = _prelude_size(buf, prelude)
+            changing = [offset for offset in _changing(buf, replacer) if offset >= skip]
+            index = 0
+            copied = start = skip  # buf[copied:start] is pending verbatim output
+            ends = statement_ends(buf)
+            try:
+                for end in ends:
+                    if end <= skip:
+                        continue
+                    if index == len(changing):
+                        break
+                    if changing[index] >= end:
+                        start = end
+                        continue
+                    while index < len(changing) and changing[index] < end:
+                        index += 1
+                    target.write(view[copied:start])
+                    result['written'] += start - copied + _convert(view, start, end, target, replacer, counts)
+                    result['decoded'] += end - start
+                    result['statements'] += 1
+                    copied = start = end
+            finally:
+                # The scanner holds a buffer export that would keep the map open
+                ends.close()
+            if index < len(changing):
+                # Trailing text after the last complete statement
+                target.write(view[copied:start])
+                result['written'] += start - copied + _convert(view, start, len(buf), target, replacer, counts)
+                result['decoded'] += len(buf) - start
+                result['statements'] += 1
+                copied = len(buf)
+            target.write(view[copied:])
+            result['written'] += len(buf) - copied
+    return result
+
+
+def _convert(view, start, end, target, replacer, counts):
+    """Decode, convert and write one statement; returns the bytes written"""
+    encoded = convert_css(str(view[start:end], 'utf-8'), replacer, counts).encode('utf-8')
+    target.write(encoded)
+    return len(encoded)
@@ -0,0 +1,429 @@
+"""
+EJS-aware conversion of templates
+
+EJS tags (<% %>, <%= %>, <%- %>, <%# %>, ...) are masked with word-like
+placeholders before anything else, so a quote or a '>' inside template
+code can no longer end an attribute or a tag early; '<%%' is the EJS
+escape for a literal '<%' and is left alone. The masked markup is then
+scanned for tags, <!-- --> comments and <script>/<style> elements:
+
+- <style> bodies are converted as stylesheets
+- style="..." attributes are converted as inline declaration lists
+- <script> bodies and comments are never touched, so markup built in
+  JavaScript strings keeps its literal colors
+
+Placeholders survive the CSS tokenizer as plain words, and are put back
+after conversion.
+
+hoist_styles() optionally moves inline styles that repeat across the
+templates into generated utility classes. A class has a lower priority
+than an inline style, so a style stays inline when a stylesheet rule
+that may match its element (same tag, id or a shared class; ancestors
+and pseudo-classes are assumed to match) sets one of its properties,
+when its element has a class or id written by template code, and when
+it sets a property in KEEP_INLINE, which scripts toggle and read back
+through element.style. Only templates that load the main stylesheet,
+directly or through the page including them, are hoisted, and the
+utility stylesheet is linked right after the main one in those pages.
+"""
+
+import hashlib
+import os
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict, namedtuple
+
+from .convert import convert_css
+from .critical import style_rules
+from .properties import sets_overlap
+from .stream import open_output
+from .tokenizer import DECLARATION, SPACE, tokenize
+
+HOIST_PREFIX = 'u-'
+HOIST_MIN_COUNT = 2
+KEEP_INLINE = ('display', 'visibility', 'opacity')
+
+_EJS = re.compile(r'<%(?!%).*?%>', re.DOTALL)
+_MARKUP = re.compile(r'<!--.*?(?:-->|\Z)'
+                     r'|<(script|style)\b((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>(.*?)(?:</\1\s*>|\Z)'
+                     r'|<[a-zA-Z](?:"[^"]*"|\'[^\']*\'|[^\'">])*>',
+                     re.IGNORECASE | re.DOTALL)
+_STYLE_ATTRIBUTE = re.compile(r'''(\sstyle\s*=\s*)(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+_CLASS_ATTRIBUTE = re.compile(r'''(\sclass\s*=\s*)(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE)
+_ID_ATTRIBUTE = re.compile(r'''(\sid\s*=\s*)(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE)
+_TAG_NAME = re.compile(r'<([a-zA-Z][\w:-]*)')
+_SLUG = re.compile(r'[^a-z0-9]+')
+_INCLUDE = re.compile(r'''\binclude\(\s*(["'])([^"']+)\1''')
+_LINK = r'''<link\b[^>]*\bhref\s*=\s*["']{href}["'][^>]*>'''
+
+# css is a <style> body, or an inline declaration list of element ('div.card#x');
+# offset is where it starts in the template
+StyleSource = namedtuple('StyleSource', 'offset css inline element')
+
+# One hoisted style: the class name, its declarations and the number of attributes
+Utility = namedtuple('Utility', 'name declarations count')
+
+
+class Masked(namedtuple('Masked', 'text tags marker shifts')):
+    """
+    Template text with its EJS tags replaced by marker + index + marker.
+    shifts lists (masked offset after a placeholder, characters removed so far).
+    """
+
+    def unmask(self, text):
+        if not self.tags:
+            return text
+        pattern = re.escape(self.marker) + r'(\d+)' + re.escape(self.marker)
+        return re.sub(pattern, lambda match: self.tags[int(match.group(1))], text)
+
+    def has_tag(self, text):
+        return bool(self.tags) and self.marker in text
+
+    def source_offset(self, offset):
+        """Offset in the template of an offset of the masked text (outside placeholders)"""
+        index = bisect_right(self.shifts, (offset, float('inf'))) - 1
+        return offset + (self.shifts[index][1] if index >= 0 else 0)
+
+
+def mask_ejs(content):
+    """Replace every EJS tag of content with a placeholder word"""
+    marker = '__ejs'
+    while marker in content:
+        marker += '_'
+    tags = []
+    shifts = []
+    removed = 0
+
+    def placeholder(match):
+        nonlocal removed
+        tags.append(match.group(0))
+        text = f'{marker}{len(tags) - 1}{marker}'
+        removed += len(match.group(0)) - len(text)
+        shifts.append((match.end() - removed, removed))
+        return text
+
+    return Masked(_EJS.sub(placeholder, content), tags, marker, shifts)
+
+
+def _attribute_value(match):
+    """(quote, value) of a _STYLE_ATTRIBUTE or _CLASS_ATTRIBUTE match"""
+    if match.group(2) is not None:
+        return '"', match.group(2)
+    if match.group(3) is not None:
+        return "'", match.group(3)
+    return '', match.group(4)
+
+
+def _rewrite_markup(text, element, attribute):
+    """
+    Rewrite masked markup: element(body) for each <style> body and
+    attribute(tag) for each other tag; both return the new text.
+    """
+    def rewrite(match):
+        name = match.group(1)
+        if match.group(0).startswith('<!--') or (name and name.lower() == 'script'):
+            return match.group(0)
+        if name:
+            start, end = match.span(3)
+            offset = match.start()
+            whole = match.group(0)
+            return whole[:start - offset] + element(match.group(3)) + whole[end - offset:]
+        return attribute(match.group(0))
+
+    return _MARKUP.sub(rewrite, text)
+
+
+def convert_markup(content, replacer, counts=None):
+    """Convert the <style> elements and style attributes of an EJS/HTML template"""
+    masked = mask_ejs(content)
+
+    def element(body):
+        return convert_css(body, replacer, counts)
+
+    def attribute(tag):
+        def style(match):
+            quote, value = _attribute_value(match)
+            return match.group(1) + quote + convert_css(value, replacer, counts, inline=True) + quote
+        return _STYLE_ATTRIBUTE.sub(style, tag)
+
+    return masked.unmask(_rewrite_markup(masked.text, element, attribute))
+
+
+def style_sources(content):
+    """Yield a StyleSource for each <style> body and style attribute of a template"""
+    masked = mask_ejs(content)
+    for match in _MARKUP.finditer(masked.text):
+        name = match.group(1)
+        if match.group(0).startswith('<!--') or (name and name.lower() == 'script'):
+            continue
+        if name:
+            yield StyleSource(masked.source_offset(match.start(3)), masked.unmask(match.group(3)), False, None)
+            continue
+        tag = match.group(0)
+        for attribute in _STYLE_ATTRIBUTE.finditer(tag):
+            start = attribute.start(2) if attribute.group(2) is not None else attribute.start(3)
+            yield StyleSource(masked.source_offset(match.start() + start),
+                              masked.unmask(_attribute_value(attribute)[1]), True, _element(tag, masked))
+
+
+def _element(tag, masked):
+    """'<div class="a b <%= c %>" id="x" ...>' -> 'div.a.b#x' (template values are left out)"""
+    element = _TAG_NAME.match(tag).group(1).lower()
+    classes = _CLASS_ATTRIBUTE.search(tag)
+    if classes is not None:
+        element += ''.join('.' + name for name in _attribute_value(classes)[1].split() if not masked.has_tag(name))
+    identifier = _ID_ATTRIBUTE.search(tag)
+    if identifier is not None and not masked.has_tag(_attribute_value(identifier)[1]):
+        element += '#' + _attribute_value(identifier)[1].strip()
+    return element
+
+
+def _element_subject(tag, masked):
+    """(tag, id, classes) of a tag, or None when template code writes its class or id"""
+    name = _TAG_NAME.match(tag).group(1).lower()
+    classes = _CLASS_ATTRIBUTE.search(tag)
+    classes = _attribute_value(classes)[1] if classes is not None else ''
+    identifier = _ID_ATTRIBUTE.search(tag)
+    identifier = _attribute_value(identifier)[1].strip() if identifier is not None else None
+    if masked.has_tag(classes) or (identifier and masked.has_tag(identifier)):
+        return None
+    return name, identifier or None, frozenset(classes.split())
+
+
+def rule_index(stylesheets):
+    """
+    {(kind, name): [(subject, properties)]} of the rules of stylesheets
+    (CSS texts), keyed by a class ('.'), else the id ('#'), else the tag
+    ('', None for any element) of their subject
+    """
+    index = defaultdict(list)
+    for css in stylesheets:
+        for rule in style_rules(tokenize(css)):
+            for _, subject in rule.selectors:
+                tag, element_id, classes, pseudo = subject
+                if pseudo is not None:
+                    continue
+                if classes:
+                    keys = [('.', name) for name in classes]
+                else:
+                    keys = [('#', element_id) if element_id else ('', tag)]
+                for key in keys:
+                    index[key].append((subject, rule.properties))
+    return index
+
+
+def _styled_properties(index, element):
+    """The properties set by the indexed rules that may match an _element_subject()"""
+    tag, element_id, classes = element
+    keys = [('', None), ('', tag)] + [('.', name) for name in classes]
+    if element_id:
+        keys.append(('#', element_id))
+    names = set()
+    for key in keys:
+        for (rule_tag, rule_id, _, _), properties in index.get(key, ()):
+            if (rule_tag is None or rule_tag == tag) and (rule_id is None or rule_id == element_id):
+                names.update(properties)
+    return names
+
+
+def normalize_style(value, keep=KEEP_INLINE):
+    """
+    Canonical 'name: value; ...' form of an inline style, or None when it
+    cannot be hoisted: empty, holding anything but declarations, or
+    setting a property in keep.
+    """
+    declarations = []
+    for token in tokenize(value, inline=True):
+        if token.kind == SPACE:
+            continue
+        if token.kind != DECLARATION or not token.name:
+            return None
+        name = token.name.lower()
+        if name in keep:
+            return None
+        declarations.append(f'{name}: {token.value.strip()}')
+    return '; '.join(declarations) or None
+
+
+def _hoistable_style(tag, value, masked, keep, index):
+    """
+    Normalized style of a style attribute value of tag, or None when it
+    must stay inline. index is a rule_index() of the stylesheets that
+    apply to the template, or None to skip that check.
+    """
+    if masked.has_tag(value):
+        return None
+    style = normalize_style(value, keep)
+    if style is None or index is None:
+        return style
+    element = _element_subject(tag, masked)
+    if element is None:
+        return None
+    names = [declaration.split(':', 1)[0] for declaration in style.split('; ')]
+    return None if sets_overlap(names, _styled_properties(index, element)) else style
+
+
+def _inline_styles(masked, keep, index):
+    """Yield the hoistable style of every attribute of masked markup (None if not hoistable)"""
+    for match in _MARKUP.finditer(masked.text):
+        if match.group(1) or match.group(0).startswith('<!--'):
+            continue
+        tag = match.group(0)
+        for attribute in _STYLE_ATTRIBUTE.finditer(tag):
+            yield _hoistable_style(tag, _attribute_value(attribute)[1], masked, keep, index)
+
+
+def count_styles(contents, keep=KEEP_INLINE, index=None):
+    """Counter of the hoistable inline styles across template contents"""
+    styles = Counter()
+    for content in contents:
+        styles.update(style for style in _inline_styles(mask_ejs(content), keep, index) if style)
+    return styles
+
+
+def utility_classes(styles, min_count=HOIST_MIN_COUNT, prefix=HOIST_PREFIX):
+    """
+    {normalized style: Utility} for the styles used at least min_count
+    times. Names are slugs of the declarations ('u-height-auto'), or a
+    digest when the slug is long or already taken.
+    """
+    classes = {}
+    taken = set()
+    for style, count in sorted(styles.items(), key=lambda item: (-item[1], item[0])):
+        if count < min_count:
+            continue
+        slug = _SLUG.sub('-', style.lower()).strip('-')
+        name = prefix + slug
+        if not slug or len(slug) > 32 or name in taken:
+            name = prefix + hashlib.blake2b(style.encode('utf-8'), digest_size=4).hexdigest()
+        taken.add(name)
+        classes[style] = Utility(name, style, count)
+    return classes
+
+
+def hoist_styles(content, classes, keep=KEEP_INLINE, index=None):
+    """
+    Replace the style attributes whose hoistable style is in classes with
+    their utility class. Returns (content, number of attributes hoisted).
+    """
+    masked = mask_ejs(content)
+    hoisted = 0
+
+    def attribute(tag):
+        nonlocal hoisted
+        style = _STYLE_ATTRIBUTE.search(tag)
+        if style is None:
+            return tag
+        value = _attribute_value(style)[1]
+        utility = classes.get(_hoistable_style(tag, value, masked, keep, index))
+        if utility is None:
+            return tag
+        hoisted += 1
+        existing = _CLASS_ATTRIBUTE.search(tag)
+        if existing is None:
+            return tag[:style.start()] + f' class="{utility.name}"' + tag[style.end():]
+        tag = tag[:style.start()] + tag[style.end():]
+        existing = _CLASS_ATTRIBUTE.search(tag)
+        names = _attribute_value(existing)[1]
+        merged = f'{names} {utility.name}' if names.strip() else utility.name
+        return tag[:existing.start()] + f'{existing.group(1)}"{merged}"' + tag[existing.end():]
+
+    converted = _rewrite_markup(masked.text, lambda body: body, attribute)
+    return masked.unmask(converted), hoisted
+
+
+def utility_stylesheet(classes):
+    """The stylesheet defining the utility classes, most used first"""
+    lines = ['/* Generated by the converters (--hoist-styles): utility classes for repeated inline styles */']
+    for utility in classes.values():
+        body = ' '.join(f'{declaration};' for declaration in utility.declarations.split('; '))
+        lines.append(f'.{utility.name} {{ {body} }} /* {utility.count} uses */')
+    return '\n'.join(lines) + '\n'
+
+
+def link_stylesheet(content, href, after):
+    """
+    Add a <link> to the stylesheet at href right after the one to after.
+    Returns (content, whether it was added); nothing is added when the
+    template already links href or does not link after.
+    """
+    if re.search(_LINK.format(href=re.escape(href)), content, re.IGNORECASE):
+        return content, False
+    match = re.search(r'(^[ \t]*)?' + _LINK.format(href=re.escape(after)), content, re.IGNORECASE | re.MULTILINE)
+    if match is None:
+        return content, False
+    newline = '\r\n' if '\r\n' in content else '\n'
+    link = f'{newline}{match.group(1) or ""}<link rel="stylesheet" href="{href}" />'
+    return content[:match.end()] + link + content[match.end():], True
+
+
+def linked_templates(contents, href):
+    """
+    The paths of contents ({path: template}) that load the stylesheet at
+    href: those linking it, and the templates they include, transitively
+    """
+    link = re.compile(_LINK.format(href=re.escape(href)), re.IGNORECASE)
+    paths = {os.path.normpath(path): path for path in contents}
+    pending = [path for path, content in contents.items() if link.search(mask_ejs(content).text)]
+    linked = set(pending)
+    while pending:
+        path = pending.pop()
+        for match in _INCLUDE.finditer(contents[path]):
+            target = os.path.normpath(os.path.join(os.path.dirname(path), match.group(2)))
+            if not os.path.splitext(target)[1]:
+                target += '.ejs'
+            target = paths.get(target)
+            if target is not None and target not in linked:
+                linked.add(target)
+                pending.append(target)
+    return linked
+
+
+def hoist_files(paths, stylesheet, href, main_href, stylesheets=(), min_count=HOIST_MIN_COUNT,
+                prefix=HOIST_PREFIX, keep=KEEP_INLINE, write=True):
+    """
+    Hoist the inline styles repeated across the template files at paths
+    that load the main stylesheet (served at main_href). Styles that a
+    rule of stylesheets (CSS files), or of a <style> element of the
+    templates, may override stay inline. Rewrites the templates in place,
+    writes the utility classes to stylesheet and links it (served at href)
+    after the main stylesheet. Returns a JSON-ready dict.
+    """
+    contents = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            contents[path] = f.read()
+    sheets = []
+    for path in stylesheets:
+        with open(path, 'r', encoding='utf-8') as f:
+            sheets.append(f.read())
+    for content in contents.values():
+        sheets.extend(source.css for source in style_sources(content) if not source.inline)
+    index = rule_index(sheets)
+    linked = linked_templates(contents, main_href)
+    hoistable = {path: content for path, content in contents.items() if path in linked}
+    classes = utility_classes(count_styles(hoistable.values(), keep, index), min_count, prefix)
+    files = {}
+    links = []
+    for path, content in hoistable.items():
+        if not classes:
+            break
+        converted, hoisted = hoist_styles(content, classes, keep, index)
+        converted, added = link_stylesheet(converted, href, main_href)
+        if hoisted:
+            files[path] = hoisted
+        if added:
+            links.append(path)
+        if write and (hoisted or added):
+            with open_output(path) as f:
+                f.write(converted)
+    if write and classes:
+        with open_output(stylesheet) as f:
+            f.write(utility_stylesheet(classes))
+    return {
+        'stylesheet': stylesheet,
+        'classes': {utility.name: {'style': style, 'count': utility.count} for style, utility in classes.items()},
+        'files': files,
+        'linked': links,
+        'hoisted': sum(files.values()),
+    }
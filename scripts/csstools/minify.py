@@ -0,0 +1,138 @@
+"""
+Token-level CSS minification
+
+Comments (except /*! ... */ notices) and insignificant whitespace are
+dropped, the last ';' of each block is removed, colors take their
+shortest hex form and numbers lose redundant zeros ('0.50px' -> '.5px',
+'0px' -> '0' outside functions and flex). Strings, url() arguments and custom
+property values are left as they are, apart from trimming.
+"""
+
+import re
+
+from .colors import COLOR_FUNCTION, OPAQUE, parse_color, unpack
+from .engine import HEX_TOKEN
+from .tokenizer import AT_RULE, BLOCK_END, COMMENT, DECLARATION, SELECTOR, SPACE, split_value, tokenize
+
+_SPACE = re.compile(r'\s+')
+_SELECTOR_SPACE = re.compile(r'\s*([>+~,])\s*')
+_VALUE_SPACE = re.compile(r'\s*([,/])\s*|(\()\s+|\s+(\))')
+_COLOR = re.compile(HEX_TOKEN + '|' + COLOR_FUNCTION, re.IGNORECASE)
+_NUMBER = re.compile(r'(?<![\w.#-])(-?)(\d*\.\d+|\d+)([a-zA-Z%]*)')
+_ZERO_LENGTH = re.compile(r'^(?:px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc)$', re.IGNORECASE)
+# Properties where a unitless 0 is read as something other than a zero
+# length: 'flex: 1 0' sets flex-shrink, where 'flex: 1 0px' set the basis
+_ZERO_UNIT_KEPT = frozenset({'flex', '-webkit-flex', '-ms-flex'})
+_MEDIA_SPACE = re.compile(r'\s*([,:])\s*|(\()\s+|\s+(\))')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+
+
+def shortest_color(key):
+    """Shortest hex spelling of a packed color: #abc, #aabbcc, #abcd or #aabbccdd"""
+    red, green, blue, alpha = unpack(key)
+    channels = (red, green, blue) if alpha == OPAQUE else (red, green, blue, alpha)
+    if all(channel % 17 == 0 for channel in channels):
+        return '#' + ''.join(f'{channel // 17:x}' for channel in channels)
+    return '#' + ''.join(f'{channel:02x}' for channel in channels)
+
+
+def _color(match):
+    text = match.group(0)
+    key = parse_color(text)
+    if key is None:
+        return text
+    short = shortest_color(key)
+    return short if len(short) < len(text) else text
+
+
+def _number(match, keep_unit):
+    sign, digits, unit = match.groups()
+    integer, _, fraction = digits.partition('.')
+    fraction = fraction.rstrip('0')
+    digits = integer.lstrip('0') + ('.' + fraction if fraction else '') or '0'
+    if digits == '0':
+        sign = ''
+        if not keep_unit and _ZERO_LENGTH.match(unit):
+            unit = ''
+    return sign + digits + unit
+
+
+def _kept(match):
+    return next(group for group in match.groups() if group is not None)
+
+
+def _protect(text, minify):
+    """Apply minify to text outside quoted strings"""
+    parts = []
+    pos = 0
+    for match in _STRING.finditer(text):
+        parts.append(minify(text[pos:match.start()]))
+        parts.append(match.group(0))
+        pos = match.end()
+    parts.append(minify(text[pos:]))
+    return ''.join(parts)
+
+
+def minify_selector(selector):
+    return _protect(selector, lambda text: _SELECTOR_SPACE.sub(r'\1', _SPACE.sub(' ', text)))
+
+
+def minify_at_rule(text):
+    text = text.strip()
+    head = text[:-1] if text.endswith(('{', ';')) else text
+    head = _protect(head, lambda part: _MEDIA_SPACE.sub(_kept, _SPACE.sub(' ', part))).strip()
+    return head + text[-1] if text.endswith(('{', ';')) else head
+
+
+def minify_value(value, name=''):
+    """Minify one declaration value"""
+    value = value.strip()
+    if name.startswith('--'):
+        return value
+    parts = []
+    for is_code, text in split_value(value):
+        if not is_code:
+            if not text.startswith('/*'):
+                parts.append(text)
+            continue
+        text = _SPACE.sub(' ', text)
+        text = _COLOR.sub(_color, text)
+        keep_unit = '(' in value or name.lower() in _ZERO_UNIT_KEPT
+        text = _NUMBER.sub(lambda match: _number(match, keep_unit), text)
+        text = _VALUE_SPACE.sub(_kept, text)
+        parts.append(text)
+    return ''.join(parts).strip()
+
+
+def _important(value):
+    return re.sub(r'\s*!\s*important$', '!important', value, flags=re.IGNORECASE)
+
+
+def minify_tokens(tokens):
+    """Yield the minified text of a token stream"""
+    pending = None  # declaration text waiting to know whether it ends its block
+    for token in tokens:
+        kind = token.kind
+        if kind in (SPACE, COMMENT) and not (kind == COMMENT and token.text.startswith('/*!')):
+            continue
+        if kind == DECLARATION:
+            if pending is not None:
+                yield pending + ';'
+            name = token.head.split(':', 1)[0].strip()
+            pending = f'{name}:{_important(minify_value(token.value, token.name))}'
+            continue
+        if pending is not None:
+            yield pending if kind == BLOCK_END else pending + ';'
+            pending = None
+        if kind == SELECTOR:
+            yield minify_selector(token.name) + '{'
+        elif kind == AT_RULE:
+            yield minify_at_rule(token.text)
+        else:
+            yield token.text.strip()
+    if pending is not None:
+        yield pending
+
+
+def minify_css(content):
+    return ''.join(minify_tokens(tokenize(content)))
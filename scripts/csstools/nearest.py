@@ -0,0 +1,161 @@
+"""
+Nearest-palette matching for unmapped colors
+
+Unmapped literals are converted to OKLab (or CIELAB) in one batch and
+matched against every palette color through a distance matrix. Colors
+within the ΔE threshold are mapped to the nearest palette entry, the
+rest are reported. NumPy is used when it is installed; otherwise the
+same math runs in plain Python.
+"""
+
+import math
+from collections import Counter, namedtuple
+
+from .colors import OPAQUE, format_color, parse_color, unpack
+from .colorspace import numpy, rgb_to_lab, rgb_to_lab_array, rgb_to_oklab, rgb_to_oklab_array
+from .engine import ColorReplacer
+from .tokenizer import DECLARATION, is_theme_selector, iter_rules, split_value, tokenize
+
+# ΔE values are OKLab distances scaled by 100 so that thresholds read
+# like the familiar CIELAB ones (about 2 is barely noticeable)
+OKLAB_SCALE = 100.0
+
+Match = namedtuple('Match', 'color target value delta_e count')
+
+
+def to_oklab(rgb):
+    """OKLab coordinates of an (r, g, b) triple, scaled by OKLAB_SCALE"""
+    return tuple(OKLAB_SCALE * c for c in rgb_to_oklab(rgb))
+
+
+SPACES = {'oklab': to_oklab, 'lab': rgb_to_lab}
+ARRAY_SPACES = {
+    'oklab': lambda rgb: OKLAB_SCALE * rgb_to_oklab_array(rgb),
+    'lab': rgb_to_lab_array,
+}
+
+
+def _rgb_array(keys):
+    np = numpy()
+    keys = np.asarray(keys, dtype=np.uint32)
+    return np.stack([(keys >> 24) & 0xff, (keys >> 16) & 0xff, (keys >> 8) & 0xff], axis=1).astype(float)
+
+
+def nearest(colors, palette, space='oklab'):
+    """
+    For each packed color return (index of the nearest palette color, ΔE).
+    Both lists are converted in one batch; the distance matrix is
+    vectorized when NumPy is available.
+    """
+    if not colors or not palette:
+        return [(None, math.inf) for _ in colors]
+
+    np = numpy()
+    if np is not None:
+        convert = ARRAY_SPACES[space]
+        a = convert(_rgb_array(colors))
+        b = convert(_rgb_array(palette))
+        distances = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+        indexes = distances.argmin(axis=1)
+        return [(int(i), float(distances[row, i])) for row, i in enumerate(indexes)]
+
+    convert = SPACES[space]
+    points = [convert(unpack(key)[:3]) for key in colors]
+    targets = [convert(unpack(key)[:3]) for key in palette]
+    results = []
+    for point in points:
+        best = min(range(len(targets)), key=lambda i: math.dist(point, targets[i]))
+        results.append((best, math.dist(point, targets[best])))
+    return results
+
+
+def collect_unmapped(content, replacer, counts=None):
+    """Count the unmapped colors used in declaration values, keyed by packed color"""
+    counts = Counter() if counts is None else counts
+    for context, token in iter_rules(tokenize(content)):
+        if token.kind != DECLARATION:
+            continue
+        if token.name.startswith('--') and context and is_theme_selector(context[-1]):
+            continue
+        for is_code, text in split_value(token.value):
+            if not is_code:
+                continue
+            for match in replacer.pattern.finditer(text):
+                key = parse_color(match.group(0))
+                if key is not None and key not in replacer.values:
+                    counts[key] += 1
+    return counts
+
+
+def extend_from_files(replacer, paths, threshold, space='oklab'):
+    """
+    Scan paths for unmapped colors and auto-map those within threshold.
+    Returns (replacer, matches, misses).
+    """
+    from .batch import file_kind
+    from .markup import style_sources
+
+    unmapped = Counter()
+    for path in paths:
+        kind = file_kind(path)
+        if kind not in ('css', 'markup'):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if kind == 'css':
+            collect_unmapped(content, replacer, unmapped)
+            continue
+        for source in style_sources(content):
+            collect_unmapped('x{' + source.css + '}' if source.inline else source.css, replacer, unmapped)
+
+    matches, misses = match_unmapped(unmapped, replacer, threshold, space)
+    return extend_replacer(replacer, matches), matches, misses
+
+
+def palette_targets(replacer):
+    """Opaque palette colors that map to something other than a color literal"""
+    return [key for key, value in replacer.values.items()
+            if key & 0xff == OPAQUE and parse_color(value) is None]
+
+
+def match_unmapped(unmapped, replacer, threshold, space='oklab'):
+    """
+    Split unmapped colors into (matches, misses) lists of Match.
+    Translucent colors are never auto-mapped since the palette is opaque.
+    """
+    targets = palette_targets(replacer)
+    opaque = [key for key in unmapped if key & 0xff == OPAQUE]
+    matches = []
+    misses = []
+    for key, (index, delta_e) in zip(opaque, nearest(opaque, targets, space)):
+        target = targets[index] if index is not None else None
+        value = replacer.values[target] if target is not None else None
+        match = Match(format_color(key), replacer.names.get(target), value, delta_e, unmapped[key])
+        (matches if delta_e <= threshold else misses).append(match)
+    for key in unmapped:
+        if key & 0xff != OPAQUE:
+            misses.append(Match(format_color(key), None, None, math.inf, unmapped[key]))
+    matches.sort(key=lambda match: (match.delta_e, match.color))
+    misses.sort(key=lambda match: (match.delta_e, match.color))
+    return matches, misses
+
+
+def extend_replacer(replacer, matches):
+    """Return a replacer that also maps the matched colors"""
+    color_map = dict(replacer.color_map)
+    for match in matches:
+        color_map[match.color] = match.value
+    return ColorReplacer(color_map, replacer.literal_map, replacer.match_names)
+
+
+def format_matches(matches, misses, threshold):
+    """Human-readable lines for match_unmapped() results"""
+    lines = [f"Nearest-palette matching (ΔE <= {threshold:g}): "
+             f"{len(matches)} auto-mapped, {len(misses)} left as-is"]
+    for match in matches:
+        lines.append(f"  {match.color} -> {match.value} (nearest {match.target}, "
+                     f"ΔE {match.delta_e:.2f}, {match.count} uses)")
+    for match in misses:
+        nearest_text = f"nearest {match.target}, ΔE {match.delta_e:.2f}" if match.target else 'translucent'
+        lines.append(f"  unmapped {match.color} ({nearest_text}, {match.count} uses)")
+    return lines
@@ -0,0 +1,350 @@
+"""
+Structural stylesheet optimization
+
+Three passes over a parsed rule tree, each reported in bytes saved:
+
+overridden   a declaration set again later in the same rule (or reset by
+             its shorthand) is dropped, unless it may be a fallback for
+             older browsers: vendor prefixes, functions such as calc(),
+             or a later value using other units or functions
+             ('height: 100vh; height: 100dvh')
+shorthands   margin/padding longhands and border width/style/color
+             triples are collapsed into one shorthand (not when a part
+             holds several values or a var(), nor into border when the
+             rule sets border-image, which border resets)
+merged       a rule whose declarations equal those of an earlier rule in
+             the same block joins that rule's selector list, provided no
+             rule in between sets an overlapping property (gap and
+             row-gap, font and line-height: properties.SHORTHANDS), so
+             the cascade is unchanged (rules with comments are kept)
+
+Formatting is kept: untouched rules are emitted byte for byte and new
+text follows the indentation of the declarations it replaces.
+"""
+
+import re
+from collections import namedtuple
+
+from .properties import BORDER_PARTS, SIDES, longhands, sets_overlap
+from .tokenizer import AT_RULE, BLOCK_END, COMMENT, DECLARATION, SELECTOR, SPACE, Declaration, tokenize
+from .usage import split_selectors
+
+OptimizeReport = namedtuple('OptimizeReport', 'bytes_before bytes_after overridden shorthands merged '
+                                              'overridden_bytes shorthand_bytes merged_bytes')
+
+BOX_SHORTHANDS = ('margin', 'padding')
+
+_IMPORTANT = re.compile(r'\s*!\s*important\s*$', re.IGNORECASE)
+_FALLBACK = re.compile(r'-(?:webkit|moz|ms|o)-|\(', re.IGNORECASE)
+_HEX = re.compile(r'#[0-9a-fA-F]+')
+_UNIT = re.compile(r'(?<![\w-])[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?(%|[a-zA-Z]+)', re.IGNORECASE)
+_PARENTHESES = re.compile(r'\([^()]*\)')
+_FUNCTION = re.compile(r'([\w-]+)\(')
+# Selectors that invalidate a whole selector list in browsers that do not know them
+_FRAGILE_SELECTOR = re.compile(r'::?-|:(?:has|is|where|focus-visible)\(|:focus-visible', re.IGNORECASE)
+
+
+class Rule:
+    """A style rule: its selector token, body tokens and closing brace"""
+    __slots__ = ('selector', 'body', 'end', 'nested')
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.body = []
+        self.end = ''
+        self.nested = False
+
+    @property
+    def text(self):
+        return self.selector.text + ''.join(token.text for token in self.body) + self.end
+
+    def declarations(self):
+        return [token for token in self.body if token.kind == DECLARATION]
+
+    def signature(self):
+        return tuple((token.name, ' '.join(token.value.split())) for token in self.declarations())
+
+
+class Block:
+    """An at-rule block holding rules (@media, @supports...)"""
+    __slots__ = ('head', 'children', 'end')
+
+    def __init__(self, head):
+        self.head = head
+        self.children = []
+        self.end = ''
+
+    @property
+    def text(self):
+        return self.head.text + ''.join(child.text for child in self.children) + self.end
+
+
+def parse(tokens):
+    """Parse tokens into a list of Rule, Block and plain tokens"""
+    root = []
+    stack = [root]
+    owners = []  # open Rule/Block, or the opening token of a block kept verbatim
+    for token in tokens:
+        kind = token.kind
+        opens = kind == SELECTOR or (kind == AT_RULE and token.text.endswith('{'))
+        if opens and owners and not isinstance(owners[-1], Block):
+            # Nested rules and blocks stay verbatim inside the enclosing rule
+            for owner in reversed(owners):
+                if isinstance(owner, Rule):
+                    owner.nested = True
+                    break
+            stack[-1].append(token)
+            owners.append(token)
+        elif opens:
+            node = Rule(token) if kind == SELECTOR else Block(token)
+            stack[-1].append(node)
+            stack.append(node.body if kind == SELECTOR else node.children)
+            owners.append(node)
+        elif kind == BLOCK_END and owners:
+            owner = owners.pop()
+            if isinstance(owner, (Rule, Block)):
+                owner.end = token.text
+                stack.pop()
+            else:
+                stack[-1].append(token)
+        else:
+            stack[-1].append(token)
+    return root
+
+
+def render(nodes):
+    return ''.join(node.text for node in nodes)
+
+
+def _is_important(token):
+    return bool(_IMPORTANT.search(token.value))
+
+
+def _position(body, token):
+    return next(index for index, item in enumerate(body) if item is token)
+
+
+def _remove(body, token):
+    """Remove a declaration and the whitespace before it"""
+    index = _position(body, token)
+    del body[index]
+    if index and body[index - 1].kind == SPACE:
+        del body[index - 1]
+
+
+def _features(value):
+    """The units and functions a value relies on: {'dvh'}, {'calc', 'px'}"""
+    value = _HEX.sub('', value)
+    return ({unit.lower() for unit in _UNIT.findall(value)}
+            | {name.lower() + '()' for name in _FUNCTION.findall(value)})
+
+
+def drop_overridden(rule):
+    """Remove declarations that a later one in the same rule replaces; returns the count"""
+    removed = 0
+    declarations = rule.declarations()
+    for index, token in enumerate(declarations):
+        if token.name.startswith('--') or _FALLBACK.search(token.value):
+            continue
+        for later in declarations[index + 1:]:
+            if later.name != token.name and token.name not in longhands(later.name):
+                continue
+            if _is_important(token) and not _is_important(later):
+                continue
+            if later.name == token.name and _FALLBACK.search(later.value):
+                # 'width: 100px; width: calc(...)' keeps the fallback
+                continue
+            if _features(token.value) != _features(later.value):
+                # 'height: 100vh; height: 100dvh' keeps the fallback too
+                continue
+            _remove(rule.body, token)
+            removed += 1
+            break
+    return removed
+
+
+def _box_value(values):
+    top, right, bottom, left = values
+    if left == right:
+        if bottom == top:
+            return top if right == top else f'{top} {right}'
+        return f'{top} {right} {bottom}'
+    return f'{top} {right} {bottom} {left}'
+
+
+def _replace(rule, tokens, name, value):
+    """Replace tokens with one 'name: value;' at the position of the last of them"""
+    last = max(tokens, key=lambda token: _position(rule.body, token))
+    important = ' !important' if _is_important(last) else ''
+    tail = last.tail if last.tail.strip() else ';'
+    replacement = Declaration(f'{name}: ', value + important, tail, name)
+    rule.body[_position(rule.body, last)] = replacement
+    for token in tokens:
+        if token is not last:
+            _remove(rule.body, token)
+
+
+def _single_value(value):
+    """Whether value is one component: '1px', 'rgb(0 0 0)', but not '1px 2px' or var(--x)"""
+    if 'var(' in value.lower():
+        return False
+    previous = None
+    while previous != value:
+        previous, value = value, _PARENTHESES.sub('', value)
+    return not value.split(None, 1)[1:]
+
+
+def collapse_shorthands(rule):
+    """Collapse complete longhand sets into shorthands; returns the count"""
+    collapsed = 0
+    by_name = {}
+    for token in rule.declarations():
+        by_name.setdefault(token.name, []).append(token)
+    if any(len(tokens) > 1 for tokens in by_name.values()):
+        # Repeated properties are fallbacks, leave the rule alone
+        return 0
+
+    def complete(names):
+        tokens = [by_name[name][0] for name in names if name in by_name]
+        if len(tokens) != len(names):
+            return None
+        if len({_is_important(token) for token in tokens}) != 1:
+            return None
+        return tokens
+
+    for shorthand in BOX_SHORTHANDS:
+        if shorthand in by_name:
+            continue
+        tokens = complete([f'{shorthand}-{side}' for side in SIDES])
+        if tokens:
+            values = [_IMPORTANT.sub('', token.value).strip() for token in tokens]
+            _replace(rule, tokens, shorthand, _box_value(values))
+            collapsed += 1
+
+    for prefix in ['border'] + [f'border-{side}' for side in SIDES]:
+        if prefix in by_name or (prefix != 'border' and 'border' in by_name):
+            continue
+        tokens = complete([f'{prefix}-{part}' for part in BORDER_PARTS])
+        if not tokens:
+            continue
+        if prefix == 'border' and any(name.startswith('border-image') for name in by_name):
+            # border resets border-image
+            continue
+        values = [_IMPORTANT.sub('', token.value).strip() for token in tokens]
+        if not all(_single_value(value) for value in values):
+            # Per-side values such as 'border-width: 1px 2px' have no shorthand, and
+            # var() may hold several
+            continue
+        _replace(rule, tokens, prefix, ' '.join(values))
+        collapsed += 1
+    return collapsed
+
+
+def _properties(node):
+    """Properties a rule, or the rules of a block, set"""
+    if isinstance(node, Rule):
+        return {token.name.lower() for token in node.body if token.kind == DECLARATION}
+    if isinstance(node, Block):
+        names = set()
+        for child in node.children:
+            names |= _properties(child)
+        return names
+    return set()
+
+
+def _indent(nodes, index):
+    before = nodes[index - 1] if index else None
+    if before is not None and getattr(before, 'kind', None) == SPACE:
+        return before.text.rsplit('\n', 1)[-1]
+    return ''
+
+
+def merge_identical(nodes, properties=None):
+    """
+    Merge rules with identical bodies into the earlier rule; returns the count.
+    properties caches _properties() by node id across the nested calls.
+    """
+    cache = {} if properties is None else properties
+
+    def names(node):
+        if id(node) not in cache:
+            cache[id(node)] = _properties(node)
+        return cache[id(node)]
+
+    merged = 0
+    index = 0
+    while index < len(nodes):
+        node = nodes[index]
+        if isinstance(node, Block):
+            merged += merge_identical(node.children, cache)
+        if not isinstance(node, Rule) or node.nested or not node.declarations() \
+                or _FRAGILE_SELECTOR.search(node.selector.name) \
+                or any(token.kind == COMMENT for token in node.body):
+            # Comments in the body would be lost with the rule
+            index += 1
+            continue
+        signature = node.signature()
+        properties = names(node)
+        target = None
+        for earlier in range(index - 1, -1, -1):
+            candidate = nodes[earlier]
+            if isinstance(candidate, Rule) and not candidate.nested and candidate.signature() == signature \
+                    and not _FRAGILE_SELECTOR.search(candidate.selector.name):
+                target = earlier
+                break
+            if sets_overlap(names(candidate), properties):
+                break
+        if target is None:
+            index += 1
+            continue
+
+        rule = nodes[target]
+        separator = ',\n' + _indent(nodes, target)
+        selectors = split_selectors(rule.selector.name) + split_selectors(node.selector.name)
+        selector = separator.join(part.strip() for part in selectors)
+        head = rule.selector.text
+        rule.selector = rule.selector._replace(name=selector, text=selector + head[len(rule.selector.name):])
+        del nodes[index]
+        if index and getattr(nodes[index - 1], 'kind', None) == SPACE:
+            del nodes[index - 1]
+            index -= 1
+        merged += 1
+    return merged
+
+
+def _rules(nodes):
+    for node in nodes:
+        if isinstance(node, Rule) and not node.nested:
+            yield node
+        elif isinstance(node, Block):
+            yield from _rules(node.children)
+
+
+def optimize_css(content):
+    """Return (optimized text, OptimizeReport)"""
+    nodes = parse(tokenize(content))
+    before = len(content.encode('utf-8'))
+
+    overridden = sum(drop_overridden(rule) for rule in _rules(nodes))
+    after_overridden = len(render(nodes).encode('utf-8'))
+    shorthands = sum(collapse_shorthands(rule) for rule in _rules(nodes))
+    after_shorthands = len(render(nodes).encode('utf-8'))
+    merged = merge_identical(nodes)
+    text = render(nodes)
+    after = len(text.encode('utf-8'))
+
+    return text, OptimizeReport(before, after, overridden, shorthands, merged,
+                                before - after_overridden, after_overridden - after_shorthands,
+                                after_shorthands - after)
+
+
+def format_report(report):
+    """Human-readable lines for an OptimizeReport"""
+    saved = report.bytes_before - report.bytes_after
+    percent = 100 * saved / report.bytes_before if report.bytes_before else 0.0
+    return [
+        f"Optimized {report.bytes_before:,} -> {report.bytes_after:,} bytes ({saved:,} saved, {percent:.1f}%)",
+        f"  overridden declarations: {report.overridden} removed ({report.overridden_bytes:,} bytes)",
+        f"  shorthands:              {report.shorthands} collapsed ({report.shorthand_bytes:,} bytes)",
+        f"  identical rules:         {report.merged} merged ({report.merged_bytes:,} bytes)",
+    ]
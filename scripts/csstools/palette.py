@@ -0,0 +1,145 @@
+"""
+Compiled palette shared by the converters
+
+scripts/palette.json is the single source of the theme variables: each
+variable has its light and dark value and the color spellings that
+convert to it, and 'normalize' lists rgba() colors that only get a
+canonical spelling. compile_palette() validates the source (unparseable
+colors, variables defined twice or missing a theme, one color claimed
+by two variables) and produces an artifact with normalized keys, the
+replacement table and the rendered :root / [data-theme="dark"] prelude.
+
+The artifact is cached as JSON under the cache directory, keyed by the
+source hash and ENGINE_VERSION, so a converter run only reads one file
+and never re-parses or re-validates an unchanged palette.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from .cache import DEFAULT_CACHE_DIR, content_hash
+from .colors import parse_color
+from .engine import ENGINE_VERSION, ColorReplacer
+
+DEFAULT_PALETTE = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'palette.json'))
+
+PALETTE_FORMAT = 1
+THEMES = ('light', 'dark')
+
+Palette = namedtuple('Palette', 'replacer prelude themes digest')
+
+
+def _banner(title, width):
+    rule = '=' * width
+    return f"/* {rule}\n   {title}\n   {rule} */\n"
+
+
+def _theme_block(selector, sections, theme):
+    lines = [f"{selector} {{"]
+    for index, section in enumerate(sections):
+        if index:
+            lines.append('')
+        lines.append(f"  /* ============ {section['title']} ============ */")
+        for variable in section['variables']:
+            lines.append(f"  {variable['name']}: {variable[theme]};")
+    return '\n'.join(lines) + '\n}\n\n'
+
+
+def render_prelude(source):
+    """The :root and [data-theme="dark"] blocks written ahead of converted CSS"""
+    sections = source['sections']
+    return (_banner(source['title'], 57) + _theme_block(':root', sections, 'light')
+            + _banner(source['dark_title'], 60) + _theme_block('[data-theme="dark"]', sections, 'dark'))
+
+
+def compile_palette(source):
+    """
+    Validate a parsed palette source and return its artifact dict.
+    Raises ValueError listing every problem found.
+    """
+    errors = []
+    themes = {theme: {} for theme in THEMES}
+    entries = []
+    owners = {}  # packed color -> variable or 'normalize'
+
+    def claim(spelling, value, owner, literal):
+        key = parse_color(spelling)
+        if key is None:
+            errors.append(f"{owner}: unparseable color {spelling!r}")
+            return
+        if key in owners:
+            # Other spellings of a claimed color ('#fff', '#ffffff') are fine
+            if owners[key] != owner:
+                errors.append(f"{spelling} is claimed by both {owners[key]} and {owner}")
+            return
+        owners[key] = owner
+        entries.append((key, spelling.lower(), value, literal))
+
+    for section in source.get('sections', []):
+        for variable in section.get('variables', []):
+            name = variable.get('name', '')
+            if not name.startswith('--'):
+                errors.append(f"{section.get('title')}: invalid variable name {name!r}")
+                continue
+            if name in themes['light']:
+                errors.append(f"{name} is defined twice")
+                continue
+            for theme in THEMES:
+                if not variable.get(theme):
+                    errors.append(f"{name} has no {theme} value")
+                themes[theme][name] = variable.get(theme)
+            for spelling in variable.get('match', []):
+                claim(spelling, f'var({name})', name, False)
+
+    # 'normalize' colors are rewritten to their own canonical spelling
+    for spelling in source.get('normalize', []):
+        claim(spelling, spelling, 'normalize', True)
+
+    if errors:
+        raise ValueError('Invalid palette:\n  ' + '\n  '.join(errors))
+    return {
+        'format': PALETTE_FORMAT,
+        'engine': ENGINE_VERSION,
+        'entries': entries,
+        'themes': themes,
+        'prelude': render_prelude(source),
+    }
+
+
+def _from_artifact(artifact, digest):
+    replacer = ColorReplacer.from_table(tuple(entry) for entry in artifact['entries'])
+    return Palette(replacer, artifact['prelude'], artifact['themes'], digest)
+
+
+def load_palette(path=DEFAULT_PALETTE, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the Palette for a source file, compiling it only when its artifact is missing"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = content_hash(b'%d:%d:' % (PALETTE_FORMAT, ENGINE_VERSION) + data)
+    artifact_path = os.path.join(cache_dir, f'palette-{digest}.json')
+    try:
+        with open(artifact_path, 'r', encoding='utf-8') as f:
+            artifact = json.load(f)
+        if artifact.get('format') == PALETTE_FORMAT:
+            return _from_artifact(artifact, digest)
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        pass
+
+    try:
+        source = json.loads(data.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"Invalid palette {path}: {e}") from None
+    artifact = compile_palette(source)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = artifact_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, artifact_path)
+    # Artifacts of earlier palette versions are never read again
+    for name in os.listdir(cache_dir):
+        if name.startswith('palette-') and name.endswith('.json') and name != os.path.basename(artifact_path):
+            os.remove(os.path.join(cache_dir, name))
+    return _from_artifact(artifact, digest)
@@ -0,0 +1,126 @@
+"""
+Parallel conversion of one large stylesheet
+
+The input is cut at top-level statement boundaries (tokenizer.
+split_top_level: @media and other blocks stay whole, and braces inside
+comments or strings never count), so each chunk starts with the
+tokenizer at the top level and converts exactly as it would inside the
+whole file. Chunks of about chunk_size characters are converted in a
+ProcessPoolExecutor whose workers receive the compiled palette once, in
+the initializer, and are stitched back in input order; the output is
+byte-identical to convert_css() on the whole text.
+
+Splitting stays serial and costs roughly a tenth of a conversion, which
+bounds the speedup; inputs that make a single chunk are converted in
+process.
+"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .benchmark import first_difference
+from .convert import convert_css
+from .tokenizer import split_top_level
+
+MIN_CHUNK_SIZE = 1 << 20
+# Chunks per worker, so a slow chunk does not leave the other workers idle
+CHUNKS_PER_JOB = 4
+
+_replacer = None
+
+
+def chunk_bounds(text, chunk_size):
+    """Offsets (start, end) of chunks of about chunk_size characters, cut between top-level statements"""
+    bounds = []
+    start = end = 0
+    for statement in split_top_level(text):
+        end += len(statement)
+        if end - start >= chunk_size:
+            bounds.append((start, end))
+            start = end
+    if start < len(text):
+        bounds.append((start, len(text)))
+    return bounds
+
+
+def default_chunk_size(length, jobs):
+    return max(MIN_CHUNK_SIZE, -(-length // (jobs * CHUNKS_PER_JOB)))
+
+
+def _init_worker(replacer):
+    # The palette is sent once per worker process, not once per chunk
+    global _replacer
+    _replacer = replacer
+
+
+def _convert_chunk(text, replacer):
+    # CPU time, so chunks sharing a core are not counted twice
+    start = time.process_time()
+    counts = Counter()
+    converted = convert_css(text, replacer, counts)
+    return converted, counts, time.process_time() - start
+
+
+def _convert_in_worker(text):
+    return _convert_chunk(text, _replacer)
+
+
+def convert_parallel(content, replacer, jobs=None, chunk_size=None, counts=None):
+    """
+    Convert content across a process pool. Returns (converted text, timings)
+    where timings has the 'split' and 'convert' wall times, the summed
+    'chunk' CPU times of the conversions, and the 'chunks' and 'jobs' used.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    bounds = chunk_bounds(content, chunk_size or default_chunk_size(len(content), jobs))
+    split = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = [content[first:last] for first, last in bounds]
+    if len(chunks) <= 1 or jobs == 1:
+        results = [_convert_chunk(chunk, replacer) for chunk in chunks]
+        jobs = 1
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)), initializer=_init_worker,
+                                 initargs=(replacer,)) as pool:
+            results = list(pool.map(_convert_in_worker, chunks))
+    converted = ''.join(text for text, _, _ in results)
+    elapsed = time.perf_counter() - start
+
+    if counts is not None:
+        for _, chunk_counts, _ in results:
+            counts.update(chunk_counts)
+    timings = {
+        'split': split,
+        'convert': elapsed,
+        'chunk': sum(seconds for _, _, seconds in results),
+        'chunks': len(chunks),
+        'jobs': min(jobs, len(chunks)) or 1,
+    }
+    return converted, timings
+
+
+def time_serial(content, replacer, converted):
+    """
+    Time convert_css() on the whole content. Returns (seconds, offset of the
+    first character where its output differs from converted, or None).
+    """
+    start = time.perf_counter()
+    expected = convert_css(content, replacer)
+    return time.perf_counter() - start, first_difference(converted, expected)
+
+
+def format_speedup(timings, serial=None):
+    """
+    One line on the parallel run. serial is the measured time of the serial
+    path; without it the speedup is estimated from the CPU time of the chunks.
+    """
+    wall = timings['split'] + timings['convert']
+    line = (f"Parallel: {timings['chunks']} chunks on {timings['jobs']} workers in {wall * 1000:.1f} ms "
+            f"(split {timings['split'] * 1000:.1f} ms)")
+    if serial is not None:
+        return line + f", serial {serial * 1000:.1f} ms, speedup {serial / wall:.2f}x"
+    return line + f", estimated speedup {timings['chunk'] / wall:.2f}x"
@@ -0,0 +1,87 @@
+"""
+Shorthand and longhand CSS properties
+
+SHORTHANDS maps each shorthand to the properties it sets, so two
+declarations can be tested for touching the same property without
+guessing from names: gap sets row-gap, font sets line-height, inset sets
+top, and border also resets border-image.
+"""
+
+SIDES = ('top', 'right', 'bottom', 'left')
+CORNERS = ('top-left', 'top-right', 'bottom-right', 'bottom-left')
+BORDER_PARTS = ('width', 'style', 'color')
+
+SHORTHANDS = {
+    'animation': ('animation-name', 'animation-duration', 'animation-timing-function', 'animation-delay',
+                  'animation-iteration-count', 'animation-direction', 'animation-fill-mode',
+                  'animation-play-state'),
+    'background': ('background-color', 'background-image', 'background-repeat', 'background-attachment',
+                   'background-position', 'background-size', 'background-origin', 'background-clip'),
+    'background-position': ('background-position-x', 'background-position-y'),
+    'border': tuple(f'border-{side}' for side in SIDES) + tuple(f'border-{part}' for part in BORDER_PARTS)
+    + ('border-image',),
+    **{f'border-{side}': tuple(f'border-{side}-{part}' for part in BORDER_PARTS) for side in SIDES},
+    **{f'border-{part}': tuple(f'border-{side}-{part}' for side in SIDES) for part in BORDER_PARTS},
+    'border-image': ('border-image-source', 'border-image-slice', 'border-image-width',
+                     'border-image-outset', 'border-image-repeat'),
+    'border-radius': tuple(f'border-{corner}-radius' for corner in CORNERS),
+    'column-rule': ('column-rule-width', 'column-rule-style', 'column-rule-color'),
+    'columns': ('column-width', 'column-count'),
+    'flex': ('flex-grow', 'flex-shrink', 'flex-basis'),
+    'flex-flow': ('flex-direction', 'flex-wrap'),
+    'font': ('font-style', 'font-variant', 'font-weight', 'font-stretch', 'font-size', 'line-height',
+             'font-family', 'font-size-adjust', 'font-kerning'),
+    'gap': ('row-gap', 'column-gap'),
+    'grid': ('grid-template', 'grid-auto-rows', 'grid-auto-columns', 'grid-auto-flow'),
+    'grid-template': ('grid-template-rows', 'grid-template-columns', 'grid-template-areas'),
+    'grid-area': ('grid-row', 'grid-column'),
+    'grid-row': ('grid-row-start', 'grid-row-end'),
+    'grid-column': ('grid-column-start', 'grid-column-end'),
+    'inset': SIDES,
+    'list-style': ('list-style-type', 'list-style-position', 'list-style-image'),
+    'margin': tuple(f'margin-{side}' for side in SIDES),
+    'outline': ('outline-width', 'outline-style', 'outline-color'),
+    'overflow': ('overflow-x', 'overflow-y'),
+    'padding': tuple(f'padding-{side}' for side in SIDES),
+    'place-content': ('align-content', 'justify-content'),
+    'place-items': ('align-items', 'justify-items'),
+    'place-self': ('align-self', 'justify-self'),
+    'text-decoration': ('text-decoration-line', 'text-decoration-style', 'text-decoration-color',
+                        'text-decoration-thickness'),
+    'transition': ('transition-property', 'transition-duration', 'transition-timing-function',
+                   'transition-delay'),
+}
+
+_expanded = {}
+
+
+def longhands(name):
+    """Every property a declaration of name sets, name itself included"""
+    if name not in _expanded:
+        names = {name}
+        for part in SHORTHANDS.get(name, ()):
+            names |= longhands(part)
+        _expanded[name] = frozenset(names)
+    return _expanded[name]
+
+
+def overlaps(first, second):
+    """Whether declarations of the two properties set a property in common"""
+    if first == second:
+        return True
+    if first.startswith('--') or second.startswith('--'):
+        return False
+    if 'all' in (first, second):
+        # all resets everything but custom properties, direction and unicode-bidi
+        return not {first, second} & {'direction', 'unicode-bidi'}
+    return not longhands(first).isdisjoint(longhands(second))
+
+
+def sets_overlap(names, others):
+    """Whether a property of names overlaps one of others"""
+    if 'all' in names or 'all' in others:
+        return any(overlaps(name, other) for name in names for other in others)
+    expanded = set()
+    for name in names:
+        expanded |= longhands(name)
+    return any(not expanded.isdisjoint(longhands(other)) for other in others)
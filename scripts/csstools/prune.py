@@ -0,0 +1,168 @@
+"""
+Dead-rule and unused-variable pruning
+
+Rules are checked selector by selector against a Usage scan of the views
+and client scripts: selectors that can never match are removed from
+their list, rules left without selectors are dropped, and so are the
+@media/@supports blocks they leave empty. @keyframes and @font-face are
+kept as they are.
+
+Then the --color-* custom properties of the theme blocks that nothing
+references through var() (directly or through another kept variable)
+are dropped.
+"""
+
+import re
+from collections import namedtuple
+
+from .tokenizer import (AT_RULE, BLOCK_END, COMMENT, DECLARATION, RULE_BLOCK_AT_RULES, SELECTOR,
+                        is_theme_selector, iter_rules, tokenize)
+from .usage import skip_block, split_selectors
+
+PRUNED_VARIABLE = re.compile(r'--color-[\w-]+$')
+KEYFRAMES = frozenset({'keyframes', '-webkit-keyframes', '-moz-keyframes'})
+
+_VAR_REFERENCE = re.compile(r'var\(\s*(--[\w-]+)')
+
+PruneReport = namedtuple('PruneReport', 'bytes_before bytes_after rule_bytes variable_bytes '
+                                        'rules selectors variables')
+
+
+def _strip_space(parts):
+    """Drop the whitespace emitted just before a removed statement"""
+    while parts and parts[-1].isspace():
+        parts.pop()
+
+
+def filter_rules(tokens, predicate, extras=True):
+    """
+    Keep the selectors for which predicate(selector) is true.
+    Return (text, rules removed, selectors removed); rules left without
+    selectors are removed and so are the rule blocks they leave empty.
+    With extras=False comments, @keyframes, @font-face and other
+    statements that are not rules are removed too.
+    """
+    tokens = iter(tokens)
+    root = [None, [], 0]
+    stack = [root]  # open blocks: [opening token, parts, kept children]
+    removed_rules = 0
+    removed_selectors = 0
+
+    for token in tokens:
+        head, parts, _ = stack[-1]
+        kind = token.kind
+        in_keyframes = head is not None and head.kind == AT_RULE and head.name in KEYFRAMES
+        if kind == SELECTOR and not in_keyframes:
+            selectors = split_selectors(token.name)
+            kept = [selector for selector in selectors if predicate(selector)]
+            if not kept:
+                _strip_space(parts)
+                skip_block(tokens)
+                removed_rules += 1
+                removed_selectors += len(selectors)
+                continue
+            text = token.text
+            if len(kept) < len(selectors):
+                removed_selectors += len(selectors) - len(kept)
+                text = ','.join(kept).strip() + text[len(token.name):]
+            stack.append([token, [text], 0])
+        elif kind == AT_RULE and token.text.endswith('{'):
+            if not extras and (token.name not in RULE_BLOCK_AT_RULES or token.name in KEYFRAMES):
+                _strip_space(parts)
+                skip_block(tokens)
+                continue
+            stack.append([token, [token.text], 0])
+        elif kind == BLOCK_END and len(stack) > 1:
+            head, parts, kept = stack.pop()
+            parent = stack[-1]
+            parts.append(token.text)
+            if head.kind == AT_RULE and head.name in RULE_BLOCK_AT_RULES and head.name not in KEYFRAMES \
+                    and not kept:
+                _strip_space(parent[1])
+                continue
+            parent[1].append(''.join(parts))
+            parent[2] += 1
+        elif not extras and head is None and kind in (COMMENT, AT_RULE):
+            _strip_space(parts)
+        else:
+            parts.append(token.text)
+    while len(stack) > 1:
+        # Unterminated blocks are kept as they are
+        _, parts, _ = stack.pop()
+        stack[-1][1].append(''.join(parts))
+    return ''.join(root[1]), removed_rules, removed_selectors
+
+
+def prune_rules(tokens, usage, keep=None, tags=False):
+    """
+    Return (text, rules removed, selectors removed) for a token stream.
+    keep is an optional compiled regex of selectors that are always kept.
+    """
+    def predicate(selector):
+        return (keep is not None and keep.search(selector.strip())) or usage.selector_matches(selector, tags)
+
+    return filter_rules(tokens, predicate)
+
+
+def unused_variables(content, usage):
+    """Theme --color-* variables not reachable from any var() outside the theme blocks"""
+    defined = {}
+    roots = set(usage.variables)
+    for context, token in iter_rules(tokenize(content)):
+        if token.kind != DECLARATION:
+            continue
+        references = _VAR_REFERENCE.findall(token.value)
+        if token.name.startswith('--') and context and is_theme_selector(context[-1]):
+            defined.setdefault(token.name, set()).update(references)
+        else:
+            roots.update(references)
+
+    used = set()
+    pending = [name for name in roots if name in defined]
+    while pending:
+        name = pending.pop()
+        if name in used:
+            continue
+        used.add(name)
+        pending.extend(reference for reference in defined.get(name, ()) if reference in defined)
+    return sorted(name for name in defined if name not in used and PRUNED_VARIABLE.match(name))
+
+
+def drop_variables(content, names):
+    """Remove the theme-block declarations of names"""
+    names = set(names)
+    parts = []
+    for context, token in iter_rules(tokenize(content)):
+        if (token.kind == DECLARATION and token.name in names
+                and context and is_theme_selector(context[-1])):
+            if parts and parts[-1].isspace():
+                parts.pop()
+            continue
+        parts.append(token.text)
+    return ''.join(parts)
+
+
+def prune_css(content, usage, keep=None, tags=False, variables=True):
+    """Return (pruned text, PruneReport)"""
+    pruned, rules, selectors = prune_rules(tokenize(content), usage, keep, tags)
+    after_rules = len(pruned.encode('utf-8'))
+    names = unused_variables(pruned, usage) if variables else []
+    if names:
+        pruned = drop_variables(pruned, names)
+    before = len(content.encode('utf-8'))
+    after = len(pruned.encode('utf-8'))
+    return pruned, PruneReport(before, after, before - after_rules, after_rules - after,
+                               rules, selectors, names)
+
+
+def format_report(report):
+    """Human-readable lines for a PruneReport"""
+    saved = report.bytes_before - report.bytes_after
+    percent = 100 * saved / report.bytes_before if report.bytes_before else 0.0
+    return [
+        f"Pruned {report.bytes_before:,} -> {report.bytes_after:,} bytes "
+        f"({saved:,} saved, {percent:.1f}%)",
+        f"  rules:     {report.rules} removed, {report.selectors} selectors "
+        f"({report.rule_bytes:,} bytes)",
+        f"  variables: {len(report.variables)} removed ({report.variable_bytes:,} bytes)",
+    ] + [f"    {name}" for name in report.variables]
@@ -0,0 +1,116 @@
+"""
+Run statistics and profiling for the converters
+
+RunStats collects per-phase wall times and palette hit counts while a
+converter runs; report() adds the palette entries that never matched
+and the color literals left unconverted in the output, and returns a
+JSON-ready dict. profiled() wraps a run in cProfile and dumps the
+pstats file for later inspection.
+"""
+
+import cProfile
+import pstats
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .colors import parse_color
+from .convert import convert_css
+from .tokenizer import DECLARATION, is_theme_selector, iter_rules, split_value, tokenize
+
+PROFILE_LIMIT = 20
+
+
+class RunStats:
+    """Phase times and hit counts of one converter run"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.phases = {}
+        self.counts = Counter()
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def convert(self, content, replacer):
+        """convert_css() timed as the convert phase"""
+        with self.phase('convert'):
+            return convert_css(content, replacer, self.counts)
+
+    def report(self, replacer, output=None):
+        """
+        JSON-ready statistics. output is the converted text when available;
+        without it the unconverted literals are not reported.
+        """
+        total = time.perf_counter() - self.started
+        hits = [{'color': color, 'value': replacer.resolve(color), 'count': count}
+                for color, count in self.counts.most_common()]
+        report = {
+            'mode': self.mode,
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            'total_ms': round(total * 1000, 3),
+            'replacements': sum(self.counts.values()),
+            'hits': hits,
+            'unused': sorted(name for name in replacer.names.values() if name not in self.counts),
+            'unconverted': None,
+        }
+        if output is not None:
+            start = time.perf_counter()
+            unconverted = unconverted_literals(output, replacer)
+            report['unconverted'] = dict(unconverted.most_common())
+            report['scan_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return report
+
+
+def unconverted_literals(content, replacer):
+    """Color literals outside the palette left in declaration values, by lowercase spelling"""
+    literals = Counter()
+    for context, token in iter_rules(tokenize(content)):
+        if token.kind != DECLARATION:
+            continue
+        if token.name.startswith('--') and context and is_theme_selector(context[-1]):
+            continue
+        for is_code, text in split_value(token.value):
+            if not is_code:
+                continue
+            for match in replacer.pattern.finditer(text):
+                literal = match.group(0)
+                if parse_color(literal) not in replacer.values:
+                    literals[literal.lower()] += 1
+    return literals
+
+
+def format_stats(report):
+    """Human-readable lines for a report() dict"""
+    phases = ', '.join(f'{name} {ms:.1f} ms' for name, ms in report['phases_ms'].items())
+    lines = [f"Phases: {phases} (total {report['total_ms']:.1f} ms)",
+             f"Replacements: {report['replacements']} across {len(report['hits'])} palette colors, "
+             f"{len(report['unused'])} palette colors never matched"]
+    if report['unconverted'] is not None:
+        lines.append(f"Unconverted literals: {sum(report['unconverted'].values())} "
+                     f"({len(report['unconverted'])} distinct)")
+    return lines
+
+
+@contextmanager
+def profiled(path, out=sys.stderr, limit=PROFILE_LIMIT):
+    """Profile the block into a pstats file at path (no-op without a path)"""
+    if not path:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        print(f"Profile written to {path}; top {limit} by cumulative time:", file=out)
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(limit)
@@ -0,0 +1,94 @@
+"""
+Constant-memory streaming conversion
+
+Input is read chunk by chunk, tokenized lazily and every converted token
+is written out immediately, so peak memory stays flat however large the
+input is. '-' selects stdin/stdout so the converters can run as filters.
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+from .convert import convert_tokens, prelude_length
+from .tokenizer import CHUNK_SIZE, tokenize
+
+STDIO = '-'
+
+
+@contextmanager
+def open_input(path):
+    """Open path for streaming reads ('-' is stdin)"""
+    if path == STDIO:
+        yield sys.stdin
+        return
+    # newline='' keeps CRLF line endings byte for byte
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield f
+
+
+@contextmanager
+def open_output(path, binary=False):
+    """
+    Open path for streaming writes ('-' is stdout).
+    Files are written to a sibling temp file and moved into place on
+    success, so the input can safely be the output.
+    """
+    if path == STDIO:
+        yield sys.stdout.buffer if binary else sys.stdout
+        sys.stdout.flush()
+        return
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8', newline='')) as f:
+            yield f
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _file_mode(path):
+    """Mode for a replacement of path: keep the existing one, else honour the umask"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def convert_stream(source, target, replacer, prelude='', counts=None, chunk_size=CHUNK_SIZE):
+    """
+    Convert the text file source into target as it is read.
+    Returns (characters read, characters written).
+    """
+    head = ''
+    skip = 0
+    if prelude:
+        # Theme blocks an earlier in-place run wrote are replaced
+        while True:
+            chunk = source.read(chunk_size)
+            head += chunk
+            skip = prelude_length(head, prelude, complete=not chunk)
+            if skip is not None:
+                break
+        target.write(prelude)
+    read = [skip]
+    written = len(prelude)
+
+    def counted(tokens):
+        for token in tokens:
+            read[0] += len(token.text)
+            yield token
+
+    chunks = itertools.chain((head[skip:],), iter(lambda: source.read(chunk_size), ''))
+    for text in convert_tokens(counted(tokenize(chunks, chunk_size)), replacer, counts):
+        target.write(text)
+        written += len(text)
+    return read[0], written
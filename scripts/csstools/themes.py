@@ -0,0 +1,212 @@
+"""
+Computed theme values from the light palette
+
+scripts/palette.json is the single source: the light value of every
+variable is converted to OKLCH (opaque colors in one batch), run through
+the theme's lightness/chroma/hue transforms and converted back, and the
+result is written to the variable's theme field ("dark") of the same
+file, which keeps its layout. The converters and css-theme-tokens.py
+render the stylesheet blocks and the script tokens from there.
+
+A theme is a dict such as DEFAULT_THEMES['dark']:
+
+    lightness   L' = clamp(offset + scale * L, min, max) in OKLab (0-1)
+    chroma      C' = C * scale
+    hue         h' = h + shift (degrees)
+    alpha       translucent colors keep their RGB and get a' = min(a * scale, 1),
+                so black shadows deepen instead of turning white
+    keep_order  groups of related variables (surfaces, an accent scale)
+                whose light-theme lightness order must survive: the
+                lightness curve inverts, so within a group the transformed
+                levels are handed back out in the light order, and a
+                container stays lighter than the body it sits on; the
+                status scales are groups too, so that their light and dark
+                steps keep their meaning
+    pinned      variables that are already meant for a dark surface (the
+                navbar and footer): they keep their light value as is
+"""
+
+import json
+import re
+
+from .colors import OPAQUE, format_color, pack, parse_color, unpack
+from .colorspace import (numpy, oklab_to_oklch, oklab_to_oklch_array, oklab_to_rgb,
+                         oklab_to_rgb_array, oklch_to_oklab, oklch_to_oklab_array,
+                         rgb_to_oklab, rgb_to_oklab_array)
+from .palette import THEMES, compile_palette
+
+DEFAULT_THEMES = {
+    'dark': {
+        # Fitted so that #fafafa -> ~#1a1a1a and #333 -> ~#e0e0e0
+        'lightness': {'scale': -1.03, 'offset': 1.235, 'min': 0.18, 'max': 0.95},
+        'chroma': {'scale': 0.9},
+        'hue': {'shift': 0.0},
+        'alpha': {'scale': 3.0},
+        'keep_order': {
+            'surfaces': ['--color-bg-body', '--color-bg-container', '--color-bg-container-alt',
+                         '--color-bg-section', '--color-bg-modal', '--color-bg-purple-tint'],
+            'accents': ['--color-brand', '--color-brand-light', '--color-brand-lighter',
+                        '--color-brand-dark', '--color-brand-darker', '--color-brand-bright',
+                        '--color-purple-dark', '--color-purple-darker'],
+            'success': ['--color-success', '--color-success-bright', '--color-success-dark',
+                        '--color-success-darker', '--color-success-darkest', '--color-success-medium',
+                        '--color-success-light', '--color-success-lighter'],
+            'error': ['--color-error', '--color-error-bright', '--color-error-dark',
+                      '--color-error-darker', '--color-error-darkest', '--color-error-medium',
+                      '--color-error-light', '--color-error-lighter'],
+            'warning': ['--color-warning', '--color-warning-bright', '--color-warning-dark',
+                        '--color-warning-darkest', '--color-warning-medium', '--color-warning-light',
+                        '--color-warning-lighter'],
+            'info': ['--color-info', '--color-info-dark', '--color-info-darker', '--color-info-darkest',
+                     '--color-info-medium', '--color-info-light', '--color-info-lighter'],
+        },
+        'pinned': ['--color-nav-bg', '--color-nav-text', '--color-nav-border', '--color-nav-link',
+                   '--color-nav-divider', '--color-footer-bg', '--color-footer-text'],
+    },
+}
+
+# One variable object of palette.json, and its theme field
+_VARIABLE = re.compile(r'\{\s*"name"\s*:\s*"([^"]+)"[^{}]*\}')
+_FIELD = r'("{theme}"\s*:\s*)"[^"]*"'
+_THEME_KEYS = frozenset({'lightness', 'chroma', 'hue', 'alpha', 'keep_order', 'pinned'})
+
+
+def check_themes(themes):
+    """
+    Raise ValueError unless every theme is one the palette has a field for
+    and names only known keys
+    """
+    for name, theme in themes.items():
+        if name not in THEMES[1:]:
+            raise ValueError(f"Unknown theme {name!r}; palette themes are {', '.join(THEMES[1:])}")
+        if not isinstance(theme, dict):
+            raise ValueError(f"Theme {name!r} is not an object")
+        unknown = sorted(set(theme) - _THEME_KEYS)
+        if unknown:
+            raise ValueError(f"Theme {name!r} has unknown keys: {', '.join(unknown)}")
+
+
+def _lightness(value, theme):
+    lightness = theme.get('lightness', {})
+    value = lightness.get('offset', 0.0) + lightness.get('scale', 1.0) * value
+    return min(max(value, lightness.get('min', 0.0)), lightness.get('max', 1.0))
+
+
+def _lch_transform(lch, theme, value_l=None):
+    chroma = theme.get('chroma', {})
+    hue = theme.get('hue', {})
+    if value_l is None:
+        value_l = _lightness(lch[0], theme)
+    return value_l, lch[1] * chroma.get('scale', 1.0), (lch[2] + hue.get('shift', 0.0)) % 360
+
+
+def transform_colors(keys, theme):
+    """
+    Map packed colors to their themed CSS text.
+    Opaque colors are transformed in OKLCH as one vectorized batch when
+    NumPy is available.
+    """
+    keys = list(dict.fromkeys(keys))
+    opaque = [key for key in keys if key & 0xff == OPAQUE]
+    result = {}
+
+    np = numpy()
+    if opaque and np is not None:
+        rgb = np.array([unpack(key)[:3] for key in opaque], dtype=float)
+        lch = oklab_to_oklch_array(rgb_to_oklab_array(rgb))
+        lightness = theme.get('lightness', {})
+        lch[:, 0] = np.clip(lightness.get('offset', 0.0) + lightness.get('scale', 1.0) * lch[:, 0],
+                            lightness.get('min', 0.0), lightness.get('max', 1.0))
+        lch[:, 1] *= theme.get('chroma', {}).get('scale', 1.0)
+        lch[:, 2] = (lch[:, 2] + theme.get('hue', {}).get('shift', 0.0)) % 360
+        for key, (red, green, blue) in zip(opaque, oklab_to_rgb_array(oklch_to_oklab_array(lch))):
+            result[key] = format_color(pack(int(red), int(green), int(blue)))
+    else:
+        for key in opaque:
+            lch = _lch_transform(oklab_to_oklch(rgb_to_oklab(unpack(key)[:3])), theme)
+            result[key] = format_color(pack(*oklab_to_rgb(oklch_to_oklab(lch))))
+
+    alpha_scale = theme.get('alpha', {}).get('scale', 1.0)
+    for key in keys:
+        if key & 0xff != OPAQUE:
+            red, green, blue, alpha = unpack(key)
+            alpha = min(alpha / 255 * alpha_scale, 1.0)
+            result[key] = f'rgba({red}, {green}, {blue}, {round(alpha, 2):g})'
+    return result
+
+
+def ordered_lightness(colors, theme):
+    """
+    {variable: themed OKLab lightness} for the opaque variables of the
+    theme's keep_order groups, so that each group keeps the lightness
+    order of its light colors. colors maps variables to packed colors.
+    """
+    result = {}
+    for group, variables in theme.get('keep_order', {}).items():
+        unknown = [name for name in variables if name not in colors]
+        if unknown:
+            raise ValueError(f"keep_order group {group!r} names unknown variables: {', '.join(unknown)}")
+        light = {name: oklab_to_oklch(rgb_to_oklab(unpack(colors[name])[:3]))[0]
+                 for name in variables if colors[name] & 0xff == OPAQUE}
+        levels = sorted(set(light.values()))
+        targets = sorted(_lightness(level, theme) for level in levels)
+        themed = dict(zip(levels, targets))
+        for name, level in light.items():
+            result[name] = themed[level]
+    return result
+
+
+def generate_theme(source, theme):
+    """{variable: themed value} for every variable of a parsed palette source"""
+    colors = {}
+    for section in source.get('sections', []):
+        for variable in section.get('variables', []):
+            key = parse_color(variable.get('light', ''))
+            if key is None:
+                raise ValueError(f"{variable.get('name')}: unparseable light value {variable.get('light')!r}")
+            colors[variable['name']] = key
+    mapping = transform_colors(colors.values(), theme)
+    values = {name: mapping[key] for name, key in colors.items()}
+    for name, value_l in ordered_lightness(colors, theme).items():
+        lch = _lch_transform(oklab_to_oklch(rgb_to_oklab(unpack(colors[name])[:3])), theme, value_l)
+        values[name] = format_color(pack(*oklab_to_rgb(oklch_to_oklab(lch))))
+    pinned = theme.get('pinned', [])
+    unknown = [name for name in pinned if name not in colors]
+    if unknown:
+        raise ValueError(f"pinned names unknown variables: {', '.join(unknown)}")
+    for name in pinned:
+        values[name] = format_color(colors[name])
+    return values
+
+
+def theme_changes(source, name, values):
+    """[(variable, current value, new value)] for the values that change the color"""
+    changes = []
+    for section in source.get('sections', []):
+        for variable in section.get('variables', []):
+            current = variable.get(name)
+            value = values.get(variable['name'])
+            if value is not None and (current is None or parse_color(current) != parse_color(value)):
+                changes.append((variable['name'], current, value))
+    return changes
+
+
+def update_palette(text, name, values):
+    """
+    Return the palette.json text with the name theme field of each variable
+    in values replaced, leaving the rest of the layout alone. The result is
+    validated like any palette; raises ValueError.
+    """
+    if name not in THEMES[1:]:
+        raise ValueError(f"Unknown theme {name!r}; palette themes are {', '.join(THEMES[1:])}")
+    field = re.compile(_FIELD.format(theme=re.escape(name)))
+
+    def variable(match):
+        value = values.get(match.group(1))
+        if value is None:
+            return match.group(0)
+        return field.sub(lambda found: found.group(1) + json.dumps(value), match.group(0), count=1)
+
+    updated = _VARIABLE.sub(variable, text)
+    compile_palette(json.loads(updated))
+    return updated
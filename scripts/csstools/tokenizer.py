@@ -0,0 +1,332 @@
+"""
+Streaming CSS tokenizer and rule iterator
+
+The tokenizer reads its source in chunks and lazily yields lossless
+tokens: joining the text of every token reproduces the input exactly.
+Strings, comments and parentheses (e.g. url(data:...;...)) are skipped
+while looking for the '{', ';' and '}' that end a statement, so a
+single linear pass is enough to tell at-rules, selectors and
+declarations apart.
+"""
+
+import re
+from collections import namedtuple
+
+COMMENT = 'comment'
+SPACE = 'space'
+AT_RULE = 'at-rule'
+SELECTOR = 'selector'
+DECLARATION = 'declaration'
+BLOCK_END = 'block-end'
+OTHER = 'other'
+
+CHUNK_SIZE = 1 << 16
+
+# At-rules whose block holds rules; the blocks of all others hold declarations
+RULE_BLOCK_AT_RULES = frozenset({
+    'media', 'supports', 'document', '-moz-document', 'layer', 'container',
+    'scope', 'starting-style', 'keyframes', '-webkit-keyframes', '-moz-keyframes',
+})
+
+_SPECIAL = re.compile(r'[{};()"\'/\\]')
+_SPACE = re.compile(r'\s+')
+_AT_NAME = re.compile(r'@([-\w]+)')
+_TRAILING = re.compile(r'\s*;?\s*$')
+
+# Parts of a declaration value that must never be rewritten
+_PROTECTED_VALUE_PART = re.compile(
+    r'/\*.*?\*/'
+    r'|"(?:[^"\\]|\\.)*"'
+    r"|'(?:[^'\\]|\\.)*'"
+    r'|\burl\(\s*(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[^)]*)\s*\)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+_THEME_SELECTOR = re.compile(r'(?:html)?(?::root|\[data-theme(?:[~|^$*]?=[^\]]*)?\])$')
+
+
+class Token(namedtuple('Token', 'kind text name')):
+    """
+    A lossless slice of the source.
+    name holds the at-rule name, the selector or the property name.
+    """
+    __slots__ = ()
+
+
+class Declaration(namedtuple('Declaration', 'head value tail name')):
+    """
+    A 'property: value;' declaration split so that only the value
+    can be rewritten: head is 'property: ', tail is ' ;' or ''.
+    """
+    __slots__ = ()
+    kind = DECLARATION
+
+    @property
+    def text(self):
+        return self.head + self.value + self.tail
+
+
+def _scan(buf, i, eof):
+    """
+    Return the index of the first '{', ';' or '}' outside strings,
+    comments and parentheses, len(buf) at end of input, or None when
+    more input is needed to decide.
+    """
+    depth = 0
+    end = len(buf)
+    while True:
+        match = _SPECIAL.search(buf, i)
+        if match is None:
+            return end if eof else None
+        i = match.start()
+        char = buf[i]
+        if char == '/':
+            if i + 1 >= end:
+                return end if eof else None
+            if buf[i + 1] == '*':
+                close = buf.find('*/', i + 2)
+                if close < 0:
+                    return end if eof else None
+                i = close + 2
+            else:
+                i += 1
+        elif char == '"' or char == "'":
+            i += 1
+            while True:
+                close = buf.find(char, i)
+                if close < 0:
+                    return end if eof else None
+                escapes = 0
+                while buf[close - 1 - escapes] == '\\':
+                    escapes += 1
+                i = close + 1
+                if escapes % 2 == 0:
+                    break
+        elif char == '\\':
+            i += 2
+        elif char == '(':
+            depth += 1
+            i += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+            i += 1
+        elif depth:
+            i += 1
+        else:
+            return i
+
+
+def _declaration(text):
+    """Split raw declaration text into a Declaration, or an OTHER token"""
+    colon = text.find(':')
+    if colon < 0:
+        return Token(OTHER, text, None)
+    name = text[:colon].strip()
+    value_start = colon + 1
+    while value_start < len(text) and text[value_start].isspace():
+        value_start += 1
+    value_end = _TRAILING.search(text, value_start).start()
+    return Declaration(text[:value_start], text[value_start:value_end],
+                       text[value_end:], name.lower())
+
+
+class Tokenizer:
+    """
+    Lazily tokenize CSS from a string, a text file object or any
+    iterable of string chunks.
+    With inline=True the source is a bare declaration list, as found in
+    an HTML style attribute.
+    """
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE, inline=False):
+        if isinstance(source, str):
+            self._chunks = iter((source,))
+        elif hasattr(source, 'read'):
+            self._chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            self._chunks = iter(source)
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._inline = inline
+
+    def _fill(self):
+        """Append the next chunk, dropping consumed text; False at end of input"""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self._buf = self._buf[self._pos:] + chunk
+                self._pos = 0
+                return True
+        self._eof = True
+        return False
+
+    def __iter__(self):
+        # One entry per open block: True when it holds declarations
+        stack = [True] if self._inline else []
+        while True:
+            buf, pos = self._buf, self._pos
+            if pos >= len(buf):
+                if not self._fill():
+                    return
+                continue
+            char = buf[pos]
+
+            if char.isspace():
+                end = _SPACE.match(buf, pos).end()
+                if end == len(buf) and self._fill():
+                    continue
+                self._pos = end
+                yield Token(SPACE, buf[pos:end], None)
+                continue
+
+            if char == '/':
+                if pos + 1 >= len(buf) and self._fill():
+                    continue
+                if buf.startswith('/*', pos):
+                    close = buf.find('*/', pos + 2)
+                    if close < 0 and self._fill():
+                        continue
+                    end = len(buf) if close < 0 else close + 2
+                    self._pos = end
+                    yield Token(COMMENT, buf[pos:end], None)
+                    continue
+
+            if char == '}':
+                if stack:
+                    stack.pop()
+                self._pos = pos + 1
+                yield Token(BLOCK_END, '}', None)
+                continue
+
+            end = _scan(buf, pos, self._eof)
+            if end is None:
+                self._fill()
+                continue
+            stop = buf[end] if end < len(buf) else ''
+            in_declarations = bool(stack) and stack[-1]
+
+            if stop == '{':
+                self._pos = end + 1
+                head = buf[pos:end].strip()
+                if head.startswith('@'):
+                    match = _AT_NAME.match(head)
+                    name = match.group(1).lower() if match else ''
+                    stack.append(name not in RULE_BLOCK_AT_RULES)
+                    yield Token(AT_RULE, buf[pos:end + 1], name)
+                else:
+                    stack.append(True)
+                    yield Token(SELECTOR, buf[pos:end + 1], head)
+                continue
+
+            # ';' belongs to the statement, '}' is left for the next round
+            end = end + 1 if stop == ';' else end
+            self._pos = end
+            text = buf[pos:end]
+            if in_declarations:
+                yield _declaration(text)
+            elif text.startswith('@'):
+                match = _AT_NAME.match(text)
+                yield Token(AT_RULE, text, match.group(1).lower() if match else '')
+            else:
+                yield Token(OTHER, text, None)
+
+
+def tokenize(source, chunk_size=CHUNK_SIZE, inline=False):
+    """Return a lazy token iterator over source"""
+    return iter(Tokenizer(source, chunk_size, inline))
+
+
+def iter_rules(tokens):
+    """
+    Yield (context, token) pairs where context is the list of enclosing
+    selectors and at-rules, outermost first.
+    The list is live and changes as iteration goes on; copy it to keep it.
+    """
+    context = []
+    for token in tokens:
+        if token.kind == BLOCK_END:
+            yield context, token
+            if context:
+                context.pop()
+            continue
+        yield context, token
+        if token.kind == SELECTOR:
+            context.append(token.name)
+        elif token.kind == AT_RULE and token.text.endswith('{'):
+            context.append(token.text[:-1].strip())
+
+
+def iter_top_level(tokens):
+    """
+    Group tokens into top-level statements: each group is a whole rule,
+    at-rule block or statement together with the whitespace and comments
+    before it. Trailing whitespace and comments form the last group.
+    """
+    group = []
+    depth = 0
+    for token in tokens:
+        group.append(token)
+        kind = token.kind
+        if kind == SELECTOR or (kind == AT_RULE and token.text.endswith('{')):
+            depth += 1
+        elif kind == BLOCK_END:
+            depth = max(depth - 1, 0)
+            if depth == 0:
+                yield group
+                group = []
+        elif depth == 0 and kind not in (SPACE, COMMENT):
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def split_top_level(text):
+    """
+    Split text into top-level statements without building tokens.
+    Every piece starts where the tokenizer is back at the top level, so
+    pieces can be converted independently; this is several times faster
+    than tokenizing when most pieces are going to be skipped anyway.
+    """
+    depth = 0
+    start = pos = 0
+    end = len(text)
+    while True:
+        stop = _scan(text, pos, True)
+        if stop >= end:
+            break
+        char = text[stop]
+        pos = stop + 1
+        if char == '{':
+            depth += 1
+            continue
+        if char == '}':
+            depth = max(depth - 1, 0)
+        if depth == 0:
+            yield text[start:pos]
+            start = pos
+    if start < end:
+        yield text[start:]
+
+
+def split_value(value):
+    """
+    Split a declaration value into (is_code, text) parts.
+    Comments, strings and url(...) arguments come back with is_code False.
+    """
+    pos = 0
+    for match in _PROTECTED_VALUE_PART.finditer(value):
+        if match.start() > pos:
+            yield True, value[pos:match.start()]
+        yield False, match.group(0)
+        pos = match.end()
+    if pos < len(value):
+        yield True, value[pos:]
+
+
+def is_theme_selector(selector):
+    """True for the blocks that define the palette (:root, [data-theme=...])"""
+    parts = [part.strip() for part in selector.split(',')]
+    return all(_THEME_SELECTOR.match(part) for part in parts)
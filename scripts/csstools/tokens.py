@@ -0,0 +1,117 @@
+"""
+Theme tokens for scripts
+
+Canvas drawing cannot use var(), and calling getComputedStyle() on every
+frame is too slow for animations, so the palette's resolved values are
+emitted as a small ES module (render_tokens) with one frozen table per
+theme. The module exports the table of the active theme as a live
+binding and swaps it when the data-theme attribute of <html> changes,
+so drawing code reads colors by property lookup:
+
+    import { tokens, onThemeChange } from "/public/js/theme-tokens.js";
+    ctx.strokeStyle = tokens.brand;          // --color-brand
+    onThemeChange(() => redraw());
+
+Classic scripts get the same API on window.ThemeTokens once the module
+has run (read it when drawing, not when the script loads).
+
+Keys are the variable names without '--color-' in camelCase.
+"""
+
+import json
+import re
+
+from .palette import THEMES
+
+_PREFIX = '--color-'
+_WORD = re.compile(r'[^a-zA-Z0-9]+')
+
+
+def token_name(variable):
+    """'--color-bg-body' -> 'bgBody'"""
+    name = variable[len(_PREFIX):] if variable.startswith(_PREFIX) else variable.lstrip('-')
+    words = [word for word in _WORD.split(name) if word]
+    key = words[0].lower() + ''.join(word[:1].upper() + word[1:].lower() for word in words[1:])
+    return '_' + key if key[:1].isdigit() else key
+
+
+def token_names(variables):
+    """{variable: key} for the variables, raising ValueError when two share a key"""
+    names = {}
+    owners = {}
+    for variable in variables:
+        key = token_name(variable)
+        if key in owners:
+            raise ValueError(f"{owners[key]} and {variable} both become the token {key!r}")
+        owners[key] = variable
+        names[variable] = key
+    return names
+
+
+def _table(values, names, indent):
+    lines = [f'{indent}  {names[variable]}: {json.dumps(value)},' for variable, value in values.items()]
+    return 'Object.freeze({\n' + '\n'.join(lines) + f'\n{indent}}})'
+
+
+def render_tokens(palette, source='scripts/palette.json'):
+    """The ES module text for a Palette"""
+    names = token_names(palette.themes[THEMES[0]])
+    themes = ',\n'.join(f'  {theme}: {_table(palette.themes[theme], names, "  ")}' for theme in THEMES)
+    variables = ',\n'.join(f'  {key}: {json.dumps(variable)}' for variable, key in names.items())
+    return f'''\
+// Generated by scripts/css-theme-tokens.py from {source} (palette {palette.digest}).
+// Do not edit; rerun the script after changing the palette.
+
+export const THEMES = Object.freeze({{
+{themes},
+}});
+
+// Token -> CSS custom property
+export const VARIABLES = Object.freeze({{
+{variables},
+}});
+
+const DEFAULT_THEME = {json.dumps(THEMES[0])};
+const listeners = new Set();
+
+export function themeName(root = document.documentElement) {{
+  const theme = root.getAttribute("data-theme");
+  return Object.prototype.hasOwnProperty.call(THEMES, theme) ? theme : DEFAULT_THEME;
+}}
+
+export let theme = typeof document === "undefined" ? DEFAULT_THEME : themeName();
+// The table of the active theme; importers see it swapped in place
+export let tokens = THEMES[theme];
+
+function update() {{
+  const next = themeName();
+  if (next === theme) return;
+  theme = next;
+  tokens = THEMES[theme];
+  listeners.forEach((listener) => listener(tokens, theme));
+}}
+
+// Calls listener(tokens, theme) after each theme switch; returns an unsubscribe function
+export function onThemeChange(listener) {{
+  listeners.add(listener);
+  return () => listeners.delete(listener);
+}}
+
+if (typeof document !== "undefined") {{
+  new MutationObserver(update).observe(document.documentElement, {{
+    attributes: true,
+    attributeFilter: ["data-theme"],
+  }});
+}}
+
+if (typeof window !== "undefined") {{
+  window.ThemeTokens = Object.freeze({{
+    THEMES,
+    VARIABLES,
+    onThemeChange,
+    themeName,
+    get theme() {{ return theme; }},
+    get tokens() {{ return tokens; }},
+  }});
+}}
+'''
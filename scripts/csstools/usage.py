@@ -0,0 +1,172 @@
+"""
+Selector usage scanning for EJS views and client scripts
+
+The scan is deliberately conservative: a name counts as used when it
+appears in a class/id attribute, in any string literal (classList calls,
+querySelector strings, innerHTML templates) or as a tag. Names that are
+only partly known stay matchable:
+
+- 'genre-' + type, `genre-${type}` and class="genre-<%= g %>" record
+  the prefix 'genre-'
+- class="announcement-genre <%= item.genre %>" marks announcement-genre
+  as open: any compound selector that also requires it may match
+"""
+
+import re
+
+from .tokenizer import AT_RULE, BLOCK_END, SELECTOR
+
+DEFAULT_SOURCES = ('views/**/*.ejs', 'public/js/**/*.js', 'public/*.js', 'content/**/*.md',
+                   'routes/**/*.js', 'lib/**/*.js', 'app.js')
+
+# Present on every page whatever the markup says
+IMPLICIT_TAGS = frozenset({'html', 'body', 'head'})
+
+# Class prefixes of markup generated by third-party scripts (KaTeX auto-render)
+LIBRARY_PREFIXES = ('katex',)
+
+_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'|`((?:[^`\\]|\\.)*)`', re.DOTALL)
+_ATTRIBUTE = re.compile(r'''\b(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+_TAG = re.compile(r'<([a-zA-Z][\w-]*)')
+_EJS = re.compile(r'<%[-=_#]?(.*?)[-_]?%>', re.DOTALL)
+_WORD = re.compile(r'-?[_a-zA-Z][\w-]*')
+_VARIABLE = re.compile(r'--[\w-]+')
+
+_NESTED = re.compile(r'\([^()]*\)|\[[^\[\]]*\]|"[^"]*"|\'[^\']*\'')
+_COMBINATOR = re.compile(r'\s*[>+~]\s*|\s+')
+_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_ID = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+_TYPE = re.compile(r'^([a-zA-Z][\w-]*)')
+
+
+class Usage:
+    """The classes, ids, tags and custom properties a set of sources may use"""
+
+    def __init__(self):
+        self.classes = set()
+        self.ids = set()
+        self.tags = set(IMPLICIT_TAGS)
+        self.prefixes = set(LIBRARY_PREFIXES)
+        self.open_classes = set()
+        self.variables = set()
+
+    def update(self, other):
+        for name in ('classes', 'ids', 'tags', 'prefixes', 'open_classes', 'variables'):
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def _words(self, text, target, open_words):
+        words = _WORD.findall(text)
+        for word in words:
+            target.add(word)
+            if word.endswith('-'):
+                self.prefixes.add(word)
+        if open_words:
+            self.open_classes.update(words)
+
+    def scan(self, content, markup=True):
+        """Record the names used by one source file"""
+        self.variables.update(_VARIABLE.findall(content))
+        for match in _STRING.finditer(content):
+            text = next(group for group in match.groups() if group is not None)
+            after = content[match.end():match.end() + 8].lstrip()
+            before = content[max(match.start() - 8, 0):match.start()].rstrip()
+            dynamic = '${' in text or after.startswith('+') or before.endswith('+')
+            # String literals may hold class names, ids or tag names alike
+            self._words(text, self.classes, dynamic)
+            self.ids.update(_WORD.findall(text))
+            self.tags.update(word.lower() for word in _WORD.findall(text))
+        if not markup:
+            return self
+        for match in _ATTRIBUTE.finditer(content):
+            value = match.group(2) if match.group(2) is not None else match.group(3)
+            static = _EJS.sub(' \0 ', value)
+            dynamic = '\0' in static
+            # 'genre-<%= g %>' leaves the prefix 'genre-' glued to the marker
+            static = re.sub(r'([\w-]+-)\0', lambda m: m.group(1) + ' ', static).replace('\0', ' ')
+            if match.group(1).lower() == 'class':
+                self._words(static, self.classes, dynamic)
+            else:
+                self._words(static, self.ids, dynamic)
+        self.tags.update(tag.lower() for tag in _TAG.findall(_EJS.sub('', content)))
+        return self
+
+    def has_class(self, name):
+        return name in self.classes or any(name.startswith(prefix) for prefix in self.prefixes)
+
+    def has_id(self, name):
+        return name in self.ids or any(name.startswith(prefix) for prefix in self.prefixes)
+
+    def compound_matches(self, classes, ids, tag, tags=False):
+        """Whether one compound selector (e.g. a.btn.active#x) can match"""
+        if tags and tag and tag.lower() not in self.tags:
+            return False
+        if not all(self.has_id(name) for name in ids):
+            return False
+        missing = [name for name in classes if not self.has_class(name)]
+        if not missing:
+            return True
+        # Classes next to a dynamic expression may be joined by anything
+        return any(name in self.open_classes and self.has_class(name) for name in classes)
+
+    def selector_matches(self, selector, tags=False):
+        """
+        Whether a single (comma-free) selector can match anything.
+        Arguments of :not()/:is()/:has(), attribute selectors and escapes
+        are never used to rule a selector out.
+        """
+        if '\\' in selector:
+            return True
+        previous = None
+        while previous != selector:
+            previous, selector = selector, _NESTED.sub('', selector)
+        for compound in _COMBINATOR.split(selector.strip()):
+            if not compound:
+                continue
+            match = _TYPE.match(compound)
+            if not self.compound_matches(_CLASS.findall(compound), _ID.findall(compound),
+                                         match.group(1) if match else None, tags):
+                return False
+        return True
+
+
+def scan_files(paths):
+    """Usage of every path (.js/.mjs as scripts, anything else as markup)"""
+    usage = Usage()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            usage.scan(f.read(), markup=not path.endswith(('.js', '.mjs')))
+    return usage
+
+
+def split_selectors(selector):
+    """Split a selector list on top-level commas"""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(selector):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(depth - 1, 0)
+        elif char == ',' and depth == 0:
+            parts.append(selector[start:i])
+            start = i + 1
+    parts.append(selector[start:])
+    return parts
+
+
+def opens_block(token):
+    return token.kind == SELECTOR or (token.kind == AT_RULE and token.text.endswith('{'))
+
+
+def skip_block(tokens):
+    """Consume the tokens of a block whose opening token was just read"""
+    depth = 1
+    for token in tokens:
+        if opens_block(token):
+            depth += 1
+        elif token.kind == BLOCK_END:
+            depth -= 1
+            if depth == 0:
+                return
@@ -0,0 +1,317 @@
+"""
+Persistent custom-property usage index
+
+A SQLite database records, for the stylesheets, templates and scripts
+of the repository:
+
+- definitions  every custom property declaration, with its selector and
+               theme (light for :root, the data-theme value otherwise)
+- uses         every var(--name) in stylesheets, <style> elements and
+               style attributes, and every '--name' string in scripts
+               (getPropertyValue() / setProperty() calls)
+- colors       every color literal and what the palette converts it to
+
+with the file and line of each. update_index() only rescans files whose
+size, mtime and then content hash changed, and drops the rows of files
+that disappeared; a new palette or a new index format rebuilds
+everything. affected() answers "what does this variable affect",
+following variables defined in terms of it (--a: var(--b)).
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+from .cache import DEFAULT_CACHE_DIR, content_hash
+from .colors import COLOR_FUNCTION, parse_color
+from .engine import HEX_TOKEN
+from .markup import style_sources
+from .palette import THEMES
+from .tokenizer import DECLARATION, is_theme_selector, iter_rules, split_value, tokenize
+
+INDEX_FORMAT = 1
+DEFAULT_INDEX = os.path.join(DEFAULT_CACHE_DIR, 'usage.sqlite')
+DEFAULT_SOURCES = ('public/*.css', 'views/**/*.ejs', 'public/js/**/*.js', 'public/*.js')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, kind TEXT, size INTEGER, mtime_ns INTEGER, hash TEXT);
+CREATE TABLE IF NOT EXISTS definitions (path TEXT, line INTEGER, variable TEXT, selector TEXT, theme TEXT,
+                                        value TEXT);
+CREATE TABLE IF NOT EXISTS uses (path TEXT, line INTEGER, variable TEXT, selector TEXT, property TEXT,
+                                 fallback INTEGER, source TEXT);
+CREATE TABLE IF NOT EXISTS colors (path TEXT, line INTEGER, selector TEXT, property TEXT, literal TEXT,
+                                   replacement TEXT, source TEXT);
+CREATE INDEX IF NOT EXISTS definitions_variable ON definitions (variable);
+CREATE INDEX IF NOT EXISTS definitions_path ON definitions (path);
+CREATE INDEX IF NOT EXISTS uses_variable ON uses (variable);
+CREATE INDEX IF NOT EXISTS uses_path ON uses (path);
+CREATE INDEX IF NOT EXISTS colors_literal ON colors (literal);
+CREATE INDEX IF NOT EXISTS colors_replacement ON colors (replacement);
+CREATE INDEX IF NOT EXISTS colors_path ON colors (path);
+'''
+
+_VALUE = re.compile(r'var\(\s*(--[\w-]+)\s*(,?)|(' + HEX_TOKEN + '|' + COLOR_FUNCTION + ')', re.IGNORECASE)
+_THEME_NAME = re.compile(r'\[data-theme\s*[~|^$*]?=\s*["\']?([\w-]+)')
+_SCRIPT_STRING = re.compile(r'''(["'`])(--[\w-]+)\1''')
+_SCRIPT_ELEMENT = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_SCRIPT_COLOR = re.compile(r'''["'`](#[0-9a-fA-F]{3,8})["'`]''')
+
+
+def _kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.css':
+        return 'css'
+    if extension in ('.ejs', '.html', '.htm'):
+        return 'markup'
+    if extension in ('.js', '.mjs'):
+        return 'script'
+    return None
+
+
+def _line_counter(content):
+    """line(offset) for offsets given in increasing order"""
+    state = [0, 1]
+
+    def line(offset):
+        if offset < state[0]:
+            state[0], state[1] = 0, 1
+        state[1] += content.count('\n', state[0], offset)
+        state[0] = offset
+        return state[1]
+    return line
+
+
+class _Rows:
+    """Rows of one file, ready for executemany"""
+
+    def __init__(self, path, replacer):
+        self.path = path
+        self.replacer = replacer
+        self.definitions = []
+        self.uses = []
+        self.colors = []
+
+    def color(self, line, selector, prop, literal, source):
+        value = self.replacer.values.get(parse_color(literal))
+        self.colors.append((self.path, line, selector, prop, literal,
+                            value if value is not None and value.lower() != literal.lower() else None, source))
+
+    def css(self, content, source, first_line=1, inline_selector=None):
+        line = first_line
+        for context, token in iter_rules(tokenize(content, inline=inline_selector is not None)):
+            if token.kind == DECLARATION:
+                name = token.name
+                selector = inline_selector or ' '.join(' '.join(context).split())
+                innermost = context[-1] if context else ''
+                in_theme = bool(context) and is_theme_selector(innermost)
+                if name.startswith('--'):
+                    theme = None
+                    if in_theme:
+                        match = _THEME_NAME.search(innermost)
+                        theme = match.group(1) if match else THEMES[0]
+                    self.definitions.append((self.path, line, name, selector, theme, token.value.strip()))
+                value = token.value
+                if '(' in value or '#' in value:
+                    for is_code, text in split_value(value):
+                        if not is_code:
+                            continue
+                        for match in _VALUE.finditer(text):
+                            if match.group(1):
+                                self.uses.append((self.path, line, match.group(1), selector, name,
+                                                  int(bool(match.group(2))), source))
+                            elif not (in_theme and name.startswith('--')):
+                                self.color(line, selector, name, match.group(3), source)
+            line += token.text.count('\n')
+
+    def markup(self, content):
+        line = _line_counter(content)
+        for style in style_sources(content):
+            if style.inline:
+                self.css(style.css, 'inline', line(style.offset), style.element)
+            else:
+                self.css(style.css, 'style', line(style.offset))
+        for match in _SCRIPT_ELEMENT.finditer(content):
+            self.script(match.group(1), line(match.start(1)))
+
+    def script(self, content, first_line=1):
+        line = _line_counter(content)
+        for match in _SCRIPT_STRING.finditer(content):
+            self.uses.append((self.path, first_line - 1 + line(match.start()), match.group(2), None, None, 0,
+                              'script'))
+        line = _line_counter(content)
+        for match in _SCRIPT_COLOR.finditer(content):
+            self.color(first_line - 1 + line(match.start()), None, None, match.group(1), 'script')
+
+
+def scan_file(path, content, kind, replacer):
+    """The rows of one file"""
+    rows = _Rows(path, replacer)
+    if kind == 'css':
+        rows.css(content, 'css')
+    elif kind == 'markup':
+        rows.markup(content)
+    else:
+        rows.script(content)
+    return rows
+
+
+def open_index(db_path=DEFAULT_INDEX):
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def _delete(connection, path):
+    for table in ('definitions', 'uses', 'colors', 'files'):
+        connection.execute(f'DELETE FROM {table} WHERE path = ?', (path,))
+
+
+def update_index(connection, paths, replacer, palette_digest, root):
+    """
+    Bring the index up to date with paths (absolute; stored relative to
+    root). Returns a dict with the 'indexed', 'unchanged' and 'removed'
+    file counts and the 'seconds' taken.
+    """
+    start = time.perf_counter()
+    result = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+    with connection:
+        meta = dict(connection.execute('SELECT key, value FROM meta'))
+        stamp = {'format': str(INDEX_FORMAT), 'palette': palette_digest}
+        if any(meta.get(key) != value for key, value in stamp.items()):
+            # Converted colors depend on the palette, so nothing can be reused
+            for table in ('definitions', 'uses', 'colors', 'files'):
+                connection.execute(f'DELETE FROM {table}')
+            connection.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)', stamp.items())
+
+        known = {row[0]: row[1:] for row in connection.execute('SELECT path, size, mtime_ns, hash FROM files')}
+        seen = set()
+        for path in paths:
+            kind = _kind(path)
+            if kind is None:
+                continue
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            seen.add(relative)
+            stat = os.stat(path)
+            previous = known.get(relative)
+            if previous is not None and previous[:2] == (stat.st_size, stat.st_mtime_ns):
+                result['unchanged'] += 1
+                continue
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+            digest = content_hash(content)
+            if previous is not None and previous[2] == digest:
+                # Touched but unchanged: only the stat needs refreshing
+                connection.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?',
+                                   (stat.st_size, stat.st_mtime_ns, relative))
+                result['unchanged'] += 1
+                continue
+            rows = scan_file(relative, content, kind, replacer)
+            _delete(connection, relative)
+            connection.executemany('INSERT INTO definitions VALUES (?, ?, ?, ?, ?, ?)', rows.definitions)
+            connection.executemany('INSERT INTO uses VALUES (?, ?, ?, ?, ?, ?, ?)', rows.uses)
+            connection.executemany('INSERT INTO colors VALUES (?, ?, ?, ?, ?, ?, ?)', rows.colors)
+            connection.execute('INSERT INTO files VALUES (?, ?, ?, ?, ?)',
+                               (relative, kind, stat.st_size, stat.st_mtime_ns, digest))
+            result['indexed'] += 1
+        for relative in set(known) - seen:
+            _delete(connection, relative)
+            result['removed'] += 1
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def affected(connection, variable):
+    """
+    Everything that depends on variable: a JSON-ready dict of its
+    definitions, the variables defined through it (transitively), their
+    uses and the literals the palette converts to any of them.
+    """
+    if not variable.startswith('--'):
+        variable = '--' + variable
+    dependents = [row[0] for row in connection.execute('''
+        WITH RECURSIVE affected(variable) AS (
+            VALUES (?)
+            UNION
+            SELECT uses.property FROM uses JOIN affected ON uses.variable = affected.variable
+            WHERE substr(uses.property, 1, 2) = '--'
+        )
+        SELECT variable FROM affected''', (variable,))]
+    marks = ', '.join('?' * len(dependents))
+    definitions = [dict(zip(('path', 'line', 'selector', 'theme', 'value'), row)) for row in connection.execute(
+        'SELECT path, line, selector, theme, value FROM definitions WHERE variable = ? ORDER BY path, line',
+        (variable,))]
+    uses = [dict(zip(('variable', 'path', 'line', 'selector', 'property', 'fallback', 'source'), row))
+            for row in connection.execute(
+                f'SELECT variable, path, line, selector, property, fallback, source FROM uses '
+                f'WHERE variable IN ({marks}) ORDER BY path, line', dependents)]
+    for use in uses:
+        use['fallback'] = bool(use['fallback'])
+    literals = [dict(zip(('literal', 'replacement', 'path', 'line', 'selector', 'source'), row))
+                for row in connection.execute(
+                    f'SELECT literal, replacement, path, line, selector, source FROM colors '
+                    f'WHERE replacement IN ({marks}) ORDER BY path, line',
+                    [f'var({name})' for name in dependents])]
+    return {
+        'variable': variable,
+        'definitions': definitions,
+        'dependents': dependents[1:],
+        'uses': uses,
+        'files': sorted({use['path'] for use in uses}),
+        'selectors': sorted({use['selector'] for use in uses if use['selector']}),
+        'unconverted': literals,
+    }
+
+
+def color_uses(connection, literal):
+    """Where a color literal (any spelling of the same color) is still written"""
+    key = parse_color(literal)
+    if key is None:
+        raise ValueError(f"Not a color: {literal!r}")
+    rows = connection.execute('SELECT literal, replacement, path, line, selector, property, source FROM colors '
+                              'ORDER BY path, line')
+    return [dict(zip(('literal', 'replacement', 'path', 'line', 'selector', 'property', 'source'), row))
+            for row in rows if parse_color(row[0]) == key]
+
+
+def index_summary(connection):
+    """Row counts of the index"""
+    summary = {}
+    for table in ('files', 'definitions', 'uses', 'colors'):
+        summary[table] = connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    summary['variables'] = connection.execute('SELECT COUNT(DISTINCT variable) FROM definitions').fetchone()[0]
+    summary['undefined'] = [row[0] for row in connection.execute(
+        'SELECT DISTINCT variable FROM uses WHERE variable NOT IN (SELECT variable FROM definitions) '
+        'ORDER BY variable')]
+    summary['unused'] = [row[0] for row in connection.execute(
+        'SELECT DISTINCT variable FROM definitions WHERE variable NOT IN (SELECT variable FROM uses) '
+        'ORDER BY variable')]
+    return summary
+
+
+def format_affected(report):
+    """Human-readable lines for an affected() dict"""
+    uses = report['uses']
+    lines = [f"{report['variable']}: {len(report['definitions'])} definitions, {len(uses)} uses "
+             f"in {len(report['files'])} files, {len(report['selectors'])} selectors"]
+    if report['dependents']:
+        lines[0] += f" (through {', '.join(report['dependents'])})"
+    lines.append('Definitions:')
+    for row in report['definitions']:
+        theme = f" [{row['theme']}]" if row['theme'] else ''
+        lines.append(f"  {row['path']}:{row['line']}  {row['selector']}{theme}: {row['value']}")
+    path = None
+    for use in uses:
+        if use['path'] != path:
+            path = use['path']
+            lines.append(f"{path}:")
+        via = f" via {use['variable']}" if use['variable'] != report['variable'] else ''
+        where = ' '.join(part for part in (use['selector'], use['property']) if part) or use['source']
+        lines.append(f"  {use['line']:>6}  {where}{via}")
+    if report['unconverted']:
+        lines.append(f"Literals the converters turn into it: {len(report['unconverted'])}")
+        for row in report['unconverted']:
+            lines.append(f"  {row['path']}:{row['line']}  {row['literal']} -> {row['replacement']}")
+    return lines
@@ -0,0 +1,85 @@
+"""
+Watch mode: rebuild changed inputs as soon as they are saved
+
+Inputs are polled by mtime. The compiled palette and, for single-file
+runs, the rule cache stay in memory between rebuilds, so a rebuild only
+pays for the rules that actually changed.
+"""
+
+import os
+import sys
+import time
+
+from .batch import convert_file, expand_globs
+from .cache import DEFAULT_CACHE_DIR, RuleCache, convert_incremental
+
+DEFAULT_INTERVAL = 0.05
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _try_rebuild(rebuild, changed):
+    """Run rebuild(changed); a failure (e.g. a half-saved file) is reported, not raised"""
+    try:
+        rebuild(changed)
+        return True
+    except Exception as e:
+        print(f"  Rebuild failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return False
+
+
+def watch(discover, rebuild, interval=DEFAULT_INTERVAL, log=print):
+    """
+    Poll the files returned by discover() and call rebuild(changed)
+    whenever some of them change. Runs until interrupted; a failed
+    rebuild is reported and retried on the next save.
+    """
+    mtimes = {path: _mtime(path) for path in discover()}
+    log(f"Watching {len(mtimes)} file(s), Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            current = {path: _mtime(path) for path in discover()}
+            changed = [path for path, mtime in current.items()
+                       if mtime is not None and mtime != mtimes.get(path)]
+            if changed:
+                start = time.perf_counter()
+                if _try_rebuild(rebuild, changed):
+                    elapsed = (time.perf_counter() - start) * 1000
+                    log(f"Rebuilt {len(changed)} file(s) in {elapsed:.1f} ms")
+                # Pick up our own writes so in-place outputs do not retrigger
+                current = {path: _mtime(path) for path in current}
+            mtimes = current
+    except KeyboardInterrupt:
+        log("Stopped watching")
+
+
+def watch_file(input_path, output_path, replacer, prelude='', cache_dir=DEFAULT_CACHE_DIR,
+               interval=DEFAULT_INTERVAL, log=print):
+    """Keep output_path converted from input_path"""
+    cache = RuleCache(input_path, cache_dir)
+
+    def rebuild(changed):
+        result = convert_incremental(input_path, output_path, replacer, prelude,
+                                     cache_dir=cache_dir, cache=cache)
+        log(f"  {output_path}: {result['status']} "
+            f"({result['hits']} cached rules, {result['misses']} converted)")
+
+    _try_rebuild(rebuild, [input_path])
+    watch(lambda: [input_path], rebuild, interval, log)
+
+
+def watch_globs(patterns, replacer, interval=DEFAULT_INTERVAL, log=print):
+    """Keep every file matched by patterns converted in place"""
+    def rebuild(changed):
+        for path in changed:
+            result = convert_file(path, replacer)
+            if result.status != 'unchanged':
+                log(f"  {result.status:<9} {path} ({result.error or sum(result.counts.values())})")
+
+    watch(lambda: expand_globs(patterns), rebuild, interval, log)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The CLIs import csstools from scripts/; the tests do the same
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csstools.palette import DEFAULT_PALETTE, load_palette  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def palette(tmp_path_factory):
+    """The repository palette, compiled into a throwaway cache"""
+    return load_palette(DEFAULT_PALETTE, str(tmp_path_factory.mktemp('palette')))
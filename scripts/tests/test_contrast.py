@@ -0,0 +1,25 @@
+from csstools.contrast import audit, failures
+from csstools.tokenizer import tokenize
+
+THEME = ':root { --color-bg-body: #fff; --color-text-primary: #333; }\n'
+
+
+def test_transparent_background_without_ancestor_is_unresolvable():
+    results, skipped = audit(tokenize(THEME + '.btn-logout { color: #e0e0e0; background-color: transparent; }'))
+    assert not failures(results)
+    assert skipped == 1
+
+
+def test_transparent_background_takes_the_ancestor_background():
+    css = THEME + ('.navbar { color: #fff; background: #2f2f2f; }\n'
+                   '.navbar .btn { color: #e0e0e0; background: rgba(0, 0, 0, 0); }')
+    results, skipped = audit(tokenize(css))
+    button = next(result for result in results if result.selector == '.navbar .btn')
+    assert button.background == '#2f2f2f'
+    assert button.ratio > 4.5
+    assert skipped == 0
+
+
+def test_opaque_background_still_fails():
+    results, _ = audit(tokenize(THEME + '.faint { color: #e0e0e0; background: #fff; }'))
+    assert [result.selector for result in failures(results)] == ['.faint']
@@ -0,0 +1,38 @@
+import pytest
+
+from csstools.minify import minify_css, minify_value
+
+
+@pytest.mark.parametrize('css, expected', [
+    ('a { margin: 0px 0.50em; }', 'a{margin:0 .5em}'),
+    ('a { padding: -0px 00.0rem; }', 'a{padding:0 0}'),
+    ('a { margin: -0.0em 00px 010px .0px; }', 'a{margin:0 0 10px 0}'),
+    ('a { opacity: 0.0; }', 'a{opacity:0}'),
+    # Not lengths: the unit is part of the value
+    ('a { grid-template-columns: 0fr 1fr; }', 'a{grid-template-columns:0fr 1fr}'),
+    ('a { width: 0%; }', 'a{width:0%}'),
+    ('a { transition: color 0s; }', 'a{transition:color 0s}'),
+    ('a { transform: rotate(0deg); }', 'a{transform:rotate(0deg)}'),
+    ('a { width: calc(0px + 1em); }', 'a{width:calc(0px + 1em)}'),
+])
+def test_zero_units(css, expected):
+    assert minify_css(css) == expected
+
+
+@pytest.mark.parametrize('css, expected', [
+    ('a { flex: 1 0px; }', 'a{flex:1 0px}'),
+    ('a { flex: 0px; }', 'a{flex:0px}'),
+    ('a { flex: 1 1 0.0px; }', 'a{flex:1 1 0px}'),
+    ('a { -webkit-flex: 1 0px; }', 'a{-webkit-flex:1 0px}'),
+    ('a { FLEX: 1 0px; }', 'a{FLEX:1 0px}'),
+])
+def test_flex_keeps_zero_units(css, expected):
+    assert minify_css(css) == expected
+
+
+def test_custom_properties_are_left_alone():
+    assert minify_value(' 0px  0.50em ', '--gap') == '0px  0.50em'
+
+
+def test_colors_and_comments():
+    assert minify_css('/* x */ a { color: #ffffff; /* y */ } /*! keep */') == 'a{color:#fff}/*! keep */'
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from csstools.benchmark import generate_css
+from csstools.cache import convert_incremental
+from csstools.convert import convert_css, prelude_length
+from csstools.mapped import convert_mapped
+from csstools.parallel import convert_parallel
+from csstools.stream import convert_stream, open_input, open_output
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONVERTER = os.path.join(SCRIPTS, 'css-variable-converter.py')
+MODES = ['', '--stream', '--mmap', '--parallel', '--incremental']
+
+EDGES = '''
+/* #fff in a comment */
+.quote::before { content: "#333"; color: #333; }
+.icon { background: url("#fff.svg") #FFF; }
+.mixed { border: 1px solid #DDD; box-shadow: 0 0 2px rgba(0,0,0,0.1), inset 0 0 1px #8b6ccf; }
+@media (max-width: 480px) { .mixed { color: #555 /* x */; } }
+.multi { color: #abc123; background: #fafafa; }
+'''
+
+
+@pytest.fixture(scope='module')
+def source(palette):
+    return generate_css(60_000, palette.replacer, seed=3) + EDGES
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_modes_are_byte_identical(palette, source, tmp_path):
+    replacer, prelude = palette.replacer, palette.prelude
+    input_path = str(tmp_path / 'input.css')
+    _write(input_path, source)
+    expected_counts = Counter()
+    expected = prelude + convert_css(source, replacer, expected_counts)
+    assert expected_counts
+
+    outputs = {}
+    counts = {mode: Counter() for mode in ('stream', 'mmap', 'parallel', 'incremental')}
+    for chunk_size in (97, 1 << 16):
+        path = str(tmp_path / f'stream-{chunk_size}.css')
+        counts['stream'].clear()
+        with open_input(input_path) as f, open_output(path) as target:
+            convert_stream(f, target, replacer, prelude, counts['stream'], chunk_size=chunk_size)
+        outputs[f'stream-{chunk_size}'] = _read(path)
+    convert_mapped(input_path, str(tmp_path / 'mmap.css'), replacer, prelude, counts['mmap'])
+    outputs['mmap'] = _read(str(tmp_path / 'mmap.css'))
+    converted, _ = convert_parallel(source, replacer, jobs=2, chunk_size=4096, counts=counts['parallel'])
+    outputs['parallel'] = prelude + converted
+    convert_incremental(input_path, str(tmp_path / 'incremental.css'), replacer, prelude,
+                        counts['incremental'], cache_dir=str(tmp_path / 'cache'))
+    outputs['incremental'] = _read(str(tmp_path / 'incremental.css'))
+
+    for mode, output in outputs.items():
+        assert output == expected, mode
+    for mode, mode_counts in counts.items():
+        assert mode_counts == expected_counts, mode
+
+
+def test_prelude_length(palette):
+    prelude = palette.prelude
+    assert prelude_length(prelude + 'a { color: red }', prelude) == len(prelude)
+    assert prelude_length('a { color: red }', prelude) == 0
+    assert prelude_length(prelude + 'a{}', '') == 0
+    # Theme blocks written from another palette are recognized by their banner
+    stale = prelude.replace('#fafafa', '#fbfbfb')
+    assert prelude_length(stale + '.a { color: red }', prelude) == len(stale)
+    # A hand-written :root block is not a prelude
+    assert prelude_length(':root { --x: 1px; }\n.a {}', prelude) == 0
+    assert prelude_length(prelude[:100], prelude, complete=False) is None
+
+
+def _convert_in_place(path, mode, cache_dir):
+    arguments = [sys.executable, CONVERTER, path, '-o', path, '--cache-dir', cache_dir] + ([mode] if mode else [])
+    subprocess.run(arguments, check=True, capture_output=True, cwd=SCRIPTS)
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_in_place_runs_are_idempotent(palette, source, tmp_path, mode):
+    path = str(tmp_path / 'index.css')
+    cache_dir = str(tmp_path / 'cache')
+    # An earlier palette's theme blocks are replaced as well
+    stale = palette.prelude.replace('#fafafa', '#fbfbfb')
+    _write(path, stale + source)
+    expected = palette.prelude + convert_css(source, palette.replacer)
+    for _ in range(3):
+        _convert_in_place(path, mode, cache_dir)
+        assert _read(path) == expected
+    assert expected.count(':root {') == 1
@@ -0,0 +1,52 @@
+import pytest
+
+from csstools.optimize import optimize_css
+
+
+def test_identical_rules_merge():
+    text, report = optimize_css('.a { color: red; }\n.b { color: red; }\n')
+    assert text == '.a,\n.b { color: red; }\n'
+    assert report.merged == 1
+    assert report.bytes_after < report.bytes_before
+
+
+def test_identical_rules_merge_inside_media():
+    text, report = optimize_css('@media (max-width: 1px) { .a { color: red; } .b { color: red; } }\n')
+    assert text == '@media (max-width: 1px) { .a,\n .b { color: red; } }\n'
+    assert report.merged == 1
+
+
+@pytest.mark.parametrize('css', [
+    # A rule in between sets the same property: merging would reorder the cascade
+    '.a { color: red; }\n.c { color: blue; }\n.b { color: red; }\n',
+    # ...or an overlapping one, through a shorthand
+    '.a { margin: 0; }\n.c { margin-top: 1px; }\n.b { margin: 0; }\n',
+    '.a { gap: 0; }\n.c { row-gap: 1px; }\n.b { gap: 0; }\n',
+    # Rules with comments are kept as they are
+    '.a { color: red; }\n.b { color: red; /* why */ }\n',
+    # Different blocks
+    '.a { color: red; }\n@media print { .b { color: red; } }\n',
+])
+def test_merges_that_would_change_the_cascade_are_skipped(css):
+    text, report = optimize_css(css)
+    assert text == css
+    assert report.merged == 0
+
+
+def test_merge_across_unrelated_rule():
+    text, report = optimize_css('.a { color: red; }\n.c { margin: 0; }\n.b { color: red; }\n')
+    assert text == '.a,\n.b { color: red; }\n.c { margin: 0; }\n'
+    assert report.merged == 1
+
+
+def test_overridden_declarations_are_dropped():
+    text, report = optimize_css('.a { color: red; color: blue; height: 100vh; height: 100dvh; }\n')
+    assert text == '.a { color: blue; height: 100vh; height: 100dvh; }\n'
+    assert report.overridden == 1
+
+
+def test_longhands_collapse():
+    text, report = optimize_css('.a {\n  margin-top: 0;\n  margin-right: 1px;\n  margin-bottom: 0;\n'
+                                '  margin-left: 1px;\n}\n')
+    assert text == '.a {\n  margin: 0 1px;\n}\n'
+    assert report.shorthands == 1
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+from csstools.tokenizer import split_top_level, tokenize
+
+SAMPLE = '''/* banner { not a block } */
+@charset "utf-8";
+@import url("theme.css") screen;
+:root { --color-bg: #fafafa; --empty:; }
+a[href*="}"]::after { content: "a; b } c"; color: #333 !important }
+.icon { background: url(data:image/svg+xml;charset=utf-8,%3Csvg%3E) no-repeat; }
+.escaped\\:hover { color: RGB(255, 0, 0) } /* trailing */
+@media (max-width: 768px) {
+  .card { border: 1px solid #ddd; /* inner */ padding: 0 }
+  @supports (display: grid) { .grid { display: grid; gap: 1rem } }
+}
+@font-face { font-family: "Noto Sans JP"; src: local("Noto Sans JP") }\r\n
+.名前 { color: hsl(270 50% 60% / .5); }
+.last { color: #8b6ccf /* unterminated'''
+
+
+def _texts(source, chunk_size):
+    return [token.text for token in tokenize(source, chunk_size)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 16])
+def test_lossless_across_chunk_sizes(chunk_size):
+    texts = _texts(io.StringIO(SAMPLE), chunk_size)
+    assert ''.join(texts) == SAMPLE
+    assert texts == _texts(SAMPLE, 1 << 16)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 16])
+def test_tokens_match_across_chunk_sizes(chunk_size):
+    whole = list(tokenize(SAMPLE))
+    assert list(tokenize(io.StringIO(SAMPLE), chunk_size)) == whole
+
+
+def test_split_top_level_is_lossless():
+    pieces = list(split_top_level(SAMPLE))
+    assert ''.join(pieces) == SAMPLE
+    # The '}' inside the string and the comment do not end a statement
+    assert pieces[2].strip().startswith(':root')
+    assert pieces[3].strip().endswith('!important }')